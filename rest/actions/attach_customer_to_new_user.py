@@ -1,13 +1,15 @@
-def handler(
+async def handler(
     jwt: dict,
     new_data: dict,
     old_data: dict,
     well_known_urls: dict,
-    method: str = ""
+    method: str = "",
+    outbox_id: str = None
 ):
     if new_data.get('user'): # if customer already have a user don't create new one
         return new_data
-    import requests, string, random
+    import string, random
+    from core.http import zeauth_client
     all_characters = string.ascii_letters + string.digits
     password = "A#2@z" + (''.join(random.choice(all_characters) for _ in range(16)))
 
@@ -27,6 +29,8 @@ def handler(
         "accept": "application/json",
         "Content-Type": "application/json"
     }
-    resp = requests.post(url=create_user_url, json=user_payload, headers=AUTH_HEADERS).json()
+    if outbox_id:  # a repeated delivery of the trigger is recognized by zeauth
+        AUTH_HEADERS["Idempotency-Key"] = outbox_id
+    resp = (await zeauth_client.post(create_user_url, json=user_payload, headers=AUTH_HEADERS)).json()
     new_data['user'] = resp['id']
     return new_data
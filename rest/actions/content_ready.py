@@ -1,13 +1,14 @@
-def handler(
+async def handler(
     jwt: dict,
     new_data: dict,
     old_data: dict,
     well_known_urls: dict,
-    method: str = ""
+    method: str = "",
+    outbox_id: str = None
 ):
     if new_data.get('request_status') != 'success':
         return
-    import requests
+    from core.http import zenotify_client
 
     ZENOTIFY_BASE_URL = f"https://api.zenotify.zekoder.brandboost.l9pro.zekoder.us/"
 
@@ -16,6 +17,8 @@ def handler(
         "accept": "application/json",
         "Content-Type": "application/json"
     }
+    # a repeated delivery of the trigger is recognized by zenotify
+    IDEMPOTENCY_HEADERS = {"Idempotency-Key": outbox_id} if outbox_id else {}
 
     notification_response = cls.create_notification(recipient_email, template_id, params)
     params = {
@@ -32,20 +35,21 @@ def handler(
         "status": "",
         "last_error": ""
     }
-    notification_response = requests.post(f"{ZENOTIFY_BASE_URL}/notifications/", json=json_data)
+    notification_response = await zenotify_client.post(f"{ZENOTIFY_BASE_URL}/notifications/", json=json_data, headers=IDEMPOTENCY_HEADERS)
 
     if not notification_response.json().get('id'):
         raise CreateNotificationError
 
     headers = {
         'Content-Type': 'application/json',
+        **IDEMPOTENCY_HEADERS
     }
     json_data = {"notificationId": notification_response.json()['id']}
     send_email_url = "https://zenotify-service.zekoder.zestudio.zekoder.zekoder.net/send/email"
-    response = requests.post(f"{semd_email_url}", json=json_data, headers=headers)
+    response = await zenotify_client.post(f"{send_email_url}", json=json_data, headers=headers)
 
     if response.status_code != 200:
         raise SendNotificationError
 
     # url = f"{well_known_urls['zenotify']}"
-    # return requests.post(url=url, json=new_data, headers=AUTH_HEADERS).json()
+    # return (await zenotify_client.post(url, json=new_data, headers=AUTH_HEADERS)).json()
@@ -1,14 +1,15 @@
-def handler(
+async def handler(
     jwt: dict,
     new_data: dict,
     old_data: dict,
     well_known_urls: dict,
-    method: str = ""
+    method: str = "",
+    outbox_id: str = None
 ):
-    if old_data.get('user'): # if customer doesn't have a user return
+    if not old_data.get('user'): # if customer doesn't have a user return
         return
-    import requests
     from fastapi import HTTPException
+    from core.http import zeauth_client
 
     delete_user_url = f"{well_known_urls['zeauth']}/users/{old_data.get('user')}"
     AUTH_HEADERS = {
@@ -16,7 +17,9 @@ def handler(
         "accept": "application/json",
         "Content-Type": "application/json"
     }
+    if outbox_id:  # a repeated delivery of the trigger is recognized by zeauth
+        AUTH_HEADERS["Idempotency-Key"] = outbox_id
     try:
-        resp = requests.delete(url=create_user_url, headers=AUTH_HEADERS).json()
+        resp = (await zeauth_client.delete(delete_user_url, headers=AUTH_HEADERS)).json()
     except HTTPException:
         return
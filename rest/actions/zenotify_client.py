@@ -2,6 +2,7 @@ import os
 import httpx
 from typing import List, Union
 from core.logger import log
+from core.http import zenotify_client
 
 ZENOTIFY_BASE_URL = os.environ.get("ZENOTIFY_BASE_URL")
 ZENOTIFY_SERVICE_BASE_URL = os.environ.get("ZENOTIFY_SERVICE_BASE_URL")
@@ -28,15 +29,14 @@ class ZeNotifyClient:
             The response object if the request is successful, else None.
         """
         try:
-            async with httpx.AsyncClient() as client:
-                res = await client.post(url=url, json=payload, headers=self.headers)
-                if res.status_code in [200, 201]:
-                    log.info(success_msg)
-                    return res.json()
-                else:
-                    log.debug(f"Status:{res.status_code}, {await res.json()}")
-                    log.error(f"{failure_msg}, check the debug above!")
-                    return None
+            res = await zenotify_client.post(url, json=payload, headers=self.headers)
+            if res.status_code in [200, 201]:
+                log.info(success_msg)
+                return res.json()
+            else:
+                log.debug(f"Status:{res.status_code}, {res.text}")
+                log.error(f"{failure_msg}, check the debug above!")
+                return None
 
         except httpx.RequestError as err:
             log.debug(err)
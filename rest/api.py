@@ -1,3 +1,6 @@
+import time
+BOOT_STARTED = time.perf_counter()
+import asyncio
 import importlib
 import os
 from dotenv import load_dotenv
@@ -9,10 +12,54 @@ from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from sqlalchemy.orm import configure_mappers
 
 from core.logger import log
+from business import init_engines, dispose_engines
+from core.http import http_clients
+from core.metrics import metrics
+from core.tasks import task_queue
+from core import outbox
+from core.router import CRUDRouter
+from business.deep_analytics_snapshots_model import prune_forever, SNAPSHOT_PRUNE_INTERVAL
+
+# seconds a worker should take to boot, slower boots are logged as warnings
+STARTUP_BUDGET = float(os.environ.get('STARTUP_BUDGET', 1))
 
 app = FastAPI(title='new_verion')
+# boot timings in milliseconds: route modules imports, total import of the app and startup events
+boot_ms = {"routes": {}, "import": None, "startup": None}
+metrics.gauge('startup.import_ms', lambda: boot_ms["import"])
+metrics.gauge('startup.startup_ms', lambda: boot_ms["startup"])
+
+
+@app.on_event('startup')
+async def startup():
+    """Create the database engines, open the outbound connection pools, start the background trigger workers, recover the triggers left by a previous run and start pruning the snapshots"""
+    started = time.perf_counter()
+    init_engines()
+    # map the models now rather than on the first query
+    configure_mappers()
+    await http_clients.start()
+    await task_queue.start()
+    app.state.outbox_sweeper = asyncio.create_task(outbox.sweep_forever())
+    # without a relay the workers prune the deep analytics snapshots, one at a time
+    app.state.snapshot_pruner = None
+    if outbox.OUTBOX_DELIVERY == 'queue' and SNAPSHOT_PRUNE_INTERVAL:
+        app.state.snapshot_pruner = asyncio.create_task(prune_forever())
+    boot_ms["startup"] = round((time.perf_counter() - started) * 1000, 1)
+    log.info(f"worker ready in {(time.perf_counter() - BOOT_STARTED):.3f}s (import {boot_ms['import']}ms, startup {boot_ms['startup']}ms)")
+
+
+@app.on_event('shutdown')
+async def shutdown():
+    """Stop the background trigger workers and the snapshot pruner and release pooled outbound connections"""
+    app.state.outbox_sweeper.cancel()
+    if app.state.snapshot_pruner is not None:
+        app.state.snapshot_pruner.cancel()
+    await task_queue.stop()
+    await http_clients.close()
+    await dispose_engines()
 
 
 @app.get('/')
@@ -20,19 +67,38 @@ async def root():
     """Health check for API, anything except 200 means the API is not ready"""
     return {"message": "new_verion API, generated by ZeKoder"}
 
-# load all routes dynamically
-for module in os.listdir(f"{os.path.dirname(__file__)}/routes"):
+
+@app.get('/metrics')
+async def get_metrics():
+    """Internal counters and gauges of this worker (caches, queues)"""
+    return metrics.snapshot()
+
+# load all routes dynamically, CRUD routers add their routes to the app's route table directly
+for module in sorted(os.listdir(f"{os.path.dirname(__file__)}/routes")):
     if module == '__init__.py' or module[-3:] != '.py':
         continue
     module_name = module[:-3]
     log.debug(f"importing <{module_name}> endpoints")
 
+    started = time.perf_counter()
     try:
         pkg = importlib.import_module(f"routes.{module[:-3]}")
-        app.include_router(pkg.router, prefix=f"/{module_name}")
+        if isinstance(pkg.router, CRUDRouter):
+            pkg.router.register(app.router, prefix=f"/{module_name}")
+        else:
+            app.include_router(pkg.router, prefix=f"/{module_name}")
     except Exception as e:
         log.error(f"failed importing <{module_name}> endpoints")
         log.debug(e)
+    # the first module importing a shared model or schema is charged for it
+    boot_ms["routes"][module_name] = round((time.perf_counter() - started) * 1000, 1)
+    metrics.gauge(f'startup.routes.{module_name}_ms', lambda module_name=module_name: boot_ms["routes"][module_name])
+
+boot_ms["import"] = round((time.perf_counter() - BOOT_STARTED) * 1000, 1)
+slowest = sorted(boot_ms["routes"].items(), key=lambda item: item[1], reverse=True)[:3]
+log.debug(f"route modules import times (ms): {boot_ms['routes']}")
+if boot_ms["import"] > STARTUP_BUDGET * 1000:
+    log.warning(f"app imported in {boot_ms['import']}ms, over the {STARTUP_BUDGET}s budget, slowest route modules (ms): {slowest}")
 
 
 @app.exception_handler(RequestValidationError)
@@ -1,4 +1,6 @@
+import importlib
 import os
+import threading
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
@@ -35,7 +37,59 @@ engine_args = {
     "pool_timeout": DB_POOL_TIMEOUT,
     "pool_recycle": DB_POOL_RECYCLE,
 }
-engine_sync = create_engine(db_sync_url, echo=True, **engine_args)
-db_sync_session: Session = sessionmaker(bind=engine_sync, expire_on_commit=False)
-engine_async = create_async_engine(db_async_url, echo=True, **engine_args)
-db_async_session: AsyncSession = sessionmaker(bind=engine_async, expire_on_commit=False, class_=AsyncSession)
+# create the engines on application startup (or first session) instead of on import
+DB_LAZY_ENGINES = os.environ.get('DB_LAZY_ENGINES', 'true').lower() == 'true'
+
+
+class LazySessionMaker(sessionmaker):
+    """
+    Session factory creating the engines the first time a session is opened, when they are not created yet
+    """
+
+    def __call__(self, **local_kw):
+        if self.kw.get('bind') is None:
+            init_engines()
+        return super().__call__(**local_kw)
+
+
+engine_sync = None
+engine_async = None
+_engines_lock = threading.Lock()
+db_sync_session: Session = LazySessionMaker(expire_on_commit=False)
+db_async_session: AsyncSession = LazySessionMaker(expire_on_commit=False, class_=AsyncSession)
+
+
+def init_engines() -> None:
+    """
+    Create the database engines and bind the session factories to them, does nothing if they exist
+    """
+    global engine_sync, engine_async
+    with _engines_lock:
+        if engine_async is not None:
+            return
+        engine_sync = create_engine(db_sync_url, echo=True, **engine_args)
+        engine_async = create_async_engine(db_async_url, echo=True, **engine_args)
+        db_sync_session.configure(bind=engine_sync)
+        db_async_session.configure(bind=engine_async)
+
+
+async def dispose_engines() -> None:
+    """
+    Close the pooled database connections, called on application shutdown
+    """
+    if engine_async is not None:
+        await engine_async.dispose()
+        engine_sync.dispose()
+
+
+def load_models() -> None:
+    """
+    Import every model so their relationships can be resolved and their tables are in `Base.metadata`
+    """
+    for module in sorted(os.listdir(os.path.dirname(__file__))):
+        if module.endswith('_model.py'):
+            importlib.import_module(f"business.{module[:-3]}")
+
+
+if not DB_LAZY_ENGINES:
+    init_engines()
@@ -9,7 +9,7 @@ import enum
 from sqlalchemy import DATETIME, String, ForeignKey
 from sqlalchemy import String, ForeignKey, Column, DATE, Text
 from sqlalchemy.orm import relationship
-from core.base_model import BaseModel
+from core.base_model import BaseModel, page_index
 from core.manager import Manager
 from fastapi import HTTPException
 from sqlalchemy.dialects.postgresql import UUID
@@ -22,7 +22,11 @@ from sqlalchemy import select
 
 class AdModel(BaseModel):
     __tablename__ = 'ads'
-    __table_args__ = {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    __table_args__ = (
+        page_index('ads'),
+        page_index('ads', 'strategy_plan'),
+        {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    )
 
 
     name = Column(Text, nullable=True, default=None)
@@ -35,7 +39,7 @@ class AdModel(BaseModel):
 
 
     strategy_plan = Column(UUID(as_uuid=True), ForeignKey(os.environ.get('DEFAULT_SCHEMA', 'public') + ".strategy_plans.id"))
-    strategy_plan__details = relationship("Strategy_PlanModel", back_populates='ads', lazy='subquery')
+    strategy_plan__details = relationship("Strategy_PlanModel", back_populates='ads', lazy='noload')
 
     @classmethod
     async def objects(cls, session):
@@ -58,4 +58,5 @@ class UpdateAd(BaseModel):
 class ReadAds(BaseModel):
     data: list[Optional[ReadAd]]
     next_page: Union[str, int]
+    next_cursor: Optional[str]
     page_size: int
\ No newline at end of file
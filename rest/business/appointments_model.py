@@ -9,7 +9,7 @@ import enum
 from sqlalchemy import DATETIME, String, ForeignKey
 from sqlalchemy import String, ForeignKey, Column, DATE, Text
 from sqlalchemy.orm import relationship
-from core.base_model import BaseModel
+from core.base_model import BaseModel, page_index
 from core.manager import Manager
 from fastapi import HTTPException
 from sqlalchemy.dialects.postgresql import UUID
@@ -22,12 +22,16 @@ from sqlalchemy import select
 
 class AppointmentModel(BaseModel):
     __tablename__ = 'appointments'
-    __table_args__ = {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    __table_args__ = (
+        page_index('appointments'),
+        page_index('appointments', 'customer'),
+        {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    )
 
 
 
     customer = Column(UUID(as_uuid=True), ForeignKey(os.environ.get('DEFAULT_SCHEMA', 'public') + ".customers.id"))
-    customer__details = relationship("CustomerModel", back_populates='appointments', lazy='subquery')
+    customer__details = relationship("CustomerModel", back_populates='appointments', lazy='noload')
 
     approval_status = Column(Text, nullable=True, default=None)
 
@@ -58,4 +58,5 @@ class UpdateAppointment(BaseModel):
 class ReadAppointments(BaseModel):
     data: list[Optional[ReadAppointment]]
     next_page: Union[str, int]
+    next_cursor: Optional[str]
     page_size: int
\ No newline at end of file
@@ -9,7 +9,7 @@ import enum
 from sqlalchemy import DATETIME, String, ForeignKey
 from sqlalchemy import ARRAY, String, ForeignKey, Column, Enum, Text
 from sqlalchemy.orm import relationship
-from core.base_model import BaseModel
+from core.base_model import BaseModel, page_index
 from core.manager import Manager
 from fastapi import HTTPException
 from sqlalchemy.dialects.postgresql import UUID
@@ -38,7 +38,11 @@ class TheClassEnum(str, enum.Enum):
 
 class Brief_AudienceModel(BaseModel):
     __tablename__ = 'brief_audiences'
-    __table_args__ = {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    __table_args__ = (
+        page_index('brief_audiences'),
+        page_index('brief_audiences', 'brief'),
+        {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    )
 
 
     interests = Column(Text, nullable=True, default=None)
@@ -59,7 +63,7 @@ class Brief_AudienceModel(BaseModel):
 
 
     brief = Column(UUID(as_uuid=True), ForeignKey(os.environ.get('DEFAULT_SCHEMA', 'public') + ".briefs.id"))
-    brief__details = relationship("BriefModel", back_populates='brief_audiences', lazy='subquery')
+    brief__details = relationship("BriefModel", back_populates='brief_audiences', lazy='noload')
 
     @classmethod
     async def objects(cls, session):
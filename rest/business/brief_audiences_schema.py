@@ -149,4 +149,5 @@ class UpdateBrief_Audience(BaseModel):
 class ReadBrief_Audiences(BaseModel):
     data: list[Optional[ReadBrief_Audience]]
     next_page: Union[str, int]
+    next_cursor: Optional[str]
     page_size: int
\ No newline at end of file
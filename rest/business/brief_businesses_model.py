@@ -9,7 +9,7 @@ import enum
 from sqlalchemy import DATETIME, String, ForeignKey
 from sqlalchemy import String, ForeignKey, Column, Enum, Integer, Text
 from sqlalchemy.orm import relationship
-from core.base_model import BaseModel
+from core.base_model import BaseModel, page_index
 from core.manager import Manager
 from fastapi import HTTPException
 from sqlalchemy.dialects.postgresql import UUID
@@ -26,7 +26,11 @@ class AccordingToEnum(str, enum.Enum):
 
 class Brief_BusinessModel(BaseModel):
     __tablename__ = 'brief_businesses'
-    __table_args__ = {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    __table_args__ = (
+        page_index('brief_businesses'),
+        page_index('brief_businesses', 'brief'),
+        {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    )
 
 
     key = Column(Text, nullable=True, default=None)
@@ -37,7 +41,7 @@ class Brief_BusinessModel(BaseModel):
 
 
     brief = Column(UUID(as_uuid=True), ForeignKey(os.environ.get('DEFAULT_SCHEMA', 'public') + ".briefs.id"))
-    brief__details = relationship("BriefModel", back_populates='brief_businesses', lazy='subquery')
+    brief__details = relationship("BriefModel", back_populates='brief_businesses', lazy='noload')
 
     @classmethod
     async def objects(cls, session):
@@ -75,4 +75,5 @@ class UpdateBrief_Business(BaseModel):
 class ReadBrief_Businesses(BaseModel):
     data: list[Optional[ReadBrief_Business]]
     next_page: Union[str, int]
+    next_cursor: Optional[str]
     page_size: int
\ No newline at end of file
@@ -9,7 +9,7 @@ import enum
 from sqlalchemy import DATETIME, String, ForeignKey
 from sqlalchemy import String, ForeignKey, Column, Text, ARRAY
 from sqlalchemy.orm import relationship
-from core.base_model import BaseModel
+from core.base_model import BaseModel, page_index
 from core.manager import Manager
 from fastapi import HTTPException
 from sqlalchemy.dialects.postgresql import UUID
@@ -30,7 +30,11 @@ class PlatformEnum(str, enum.Enum):
 
 class Brief_CompetitorModel(BaseModel):
     __tablename__ = 'brief_competitors'
-    __table_args__ = {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    __table_args__ = (
+        page_index('brief_competitors'),
+        page_index('brief_competitors', 'brief'),
+        {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    )
 
 
     platform = Column(ARRAY(Text), nullable=True, default=None)
@@ -39,7 +43,7 @@ class Brief_CompetitorModel(BaseModel):
 
 
     brief = Column(UUID(as_uuid=True), ForeignKey(os.environ.get('DEFAULT_SCHEMA', 'public') + ".briefs.id"))
-    brief__details = relationship("BriefModel", back_populates='brief_competitors', lazy='subquery')
+    brief__details = relationship("BriefModel", back_populates='brief_competitors', lazy='noload')
 
     @classmethod
     async def objects(cls, session):
@@ -76,4 +76,5 @@ class UpdateBrief_Competitor(BaseModel):
 class ReadBrief_Competitors(BaseModel):
     data: list[Optional[ReadBrief_Competitor]]
     next_page: Union[str, int]
+    next_cursor: Optional[str]
     page_size: int
\ No newline at end of file
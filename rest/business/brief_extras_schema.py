@@ -49,4 +49,5 @@ class UpdateBrief_Extra(BaseModel):
 class ReadBrief_Extras(BaseModel):
     data: list[Optional[ReadBrief_Extra]]
     next_page: Union[str, int]
+    next_cursor: Optional[str]
     page_size: int
\ No newline at end of file
@@ -9,7 +9,7 @@ import enum
 from sqlalchemy import DATETIME, String, ForeignKey
 from sqlalchemy import ARRAY, String, ForeignKey, Column, Enum, Text
 from sqlalchemy.orm import relationship
-from core.base_model import BaseModel
+from core.base_model import BaseModel, page_index
 from core.manager import Manager
 from fastapi import HTTPException
 from sqlalchemy.dialects.postgresql import UUID
@@ -48,7 +48,11 @@ class SalesChannelEnum(str, enum.Enum):
 
 class Brief_MarketingModel(BaseModel):
     __tablename__ = 'brief_marketings'
-    __table_args__ = {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    __table_args__ = (
+        page_index('brief_marketings'),
+        page_index('brief_marketings', 'brief'),
+        {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    )
 
 
     current_online_activities = Column(Text, nullable=True, default=None)
@@ -69,7 +73,7 @@ class Brief_MarketingModel(BaseModel):
 
 
     brief = Column(UUID(as_uuid=True), ForeignKey(os.environ.get('DEFAULT_SCHEMA', 'public') + ".briefs.id"))
-    brief__details = relationship("BriefModel", back_populates='brief_marketings', lazy='subquery')
+    brief__details = relationship("BriefModel", back_populates='brief_marketings', lazy='noload')
 
     @classmethod
     async def objects(cls, session):
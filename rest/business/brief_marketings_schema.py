@@ -160,4 +160,5 @@ class UpdateBrief_Marketing(BaseModel):
 class ReadBrief_Marketings(BaseModel):
     data: list[Optional[ReadBrief_Marketing]]
     next_page: Union[str, int]
+    next_cursor: Optional[str]
     page_size: int
\ No newline at end of file
@@ -9,7 +9,7 @@ import enum
 from sqlalchemy import DATETIME, String, ForeignKey
 from sqlalchemy import String, ForeignKey, Column, Enum, JSON, Text
 from sqlalchemy.orm import relationship
-from core.base_model import BaseModel
+from core.base_model import BaseModel, page_index
 from core.manager import Manager
 from fastapi import HTTPException
 from sqlalchemy.dialects.postgresql import UUID
@@ -27,7 +27,11 @@ class ObjectivesEnum(str, enum.Enum):
 
 class Brief_ObjectiveModel(BaseModel):
     __tablename__ = 'brief_objectives'
-    __table_args__ = {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    __table_args__ = (
+        page_index('brief_objectives'),
+        page_index('brief_objectives', 'brief'),
+        {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    )
 
 
     name = Column(Text, nullable=True, default=None)
@@ -38,7 +42,7 @@ class Brief_ObjectiveModel(BaseModel):
 
 
     brief = Column(UUID(as_uuid=True), ForeignKey(os.environ.get('DEFAULT_SCHEMA', 'public') + ".briefs.id"))
-    brief__details = relationship("BriefModel", back_populates='brief_objectives', lazy='subquery')
+    brief__details = relationship("BriefModel", back_populates='brief_objectives', lazy='noload')
 
     @classmethod
     async def objects(cls, session):
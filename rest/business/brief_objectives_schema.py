@@ -76,4 +76,5 @@ class UpdateBrief_Objective(BaseModel):
 class ReadBrief_Objectives(BaseModel):
     data: list[Optional[ReadBrief_Objective]]
     next_page: Union[str, int]
+    next_cursor: Optional[str]
     page_size: int
\ No newline at end of file
@@ -9,7 +9,7 @@ import enum
 from sqlalchemy import DATETIME, String, ForeignKey
 from sqlalchemy import String, ForeignKey, Column, Text
 from sqlalchemy.orm import relationship
-from core.base_model import BaseModel
+from core.base_model import BaseModel, page_index
 from core.manager import Manager
 from fastapi import HTTPException
 from sqlalchemy.dialects.postgresql import UUID
@@ -22,7 +22,11 @@ from sqlalchemy import select
 
 class Brief_PersonaModel(BaseModel):
     __tablename__ = 'brief_personas'
-    __table_args__ = {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    __table_args__ = (
+        page_index('brief_personas'),
+        page_index('brief_personas', 'brief'),
+        {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    )
 
 
     voice_tone = Column(Text, nullable=True, default=None)
@@ -35,7 +39,7 @@ class Brief_PersonaModel(BaseModel):
 
 
     brief = Column(UUID(as_uuid=True), ForeignKey(os.environ.get('DEFAULT_SCHEMA', 'public') + ".briefs.id"))
-    brief__details = relationship("BriefModel", back_populates='brief_personas', lazy='subquery')
+    brief__details = relationship("BriefModel", back_populates='brief_personas', lazy='noload')
 
     @classmethod
     async def objects(cls, session):
@@ -58,4 +58,5 @@ class UpdateBrief_Persona(BaseModel):
 class ReadBrief_Personas(BaseModel):
     data: list[Optional[ReadBrief_Persona]]
     next_page: Union[str, int]
+    next_cursor: Optional[str]
     page_size: int
\ No newline at end of file
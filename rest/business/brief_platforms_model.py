@@ -9,7 +9,7 @@ import enum
 from sqlalchemy import DATETIME, String, ForeignKey
 from sqlalchemy import String, ForeignKey, Column, Enum, BOOLEAN, Text
 from sqlalchemy.orm import relationship
-from core.base_model import BaseModel
+from core.base_model import BaseModel, page_index
 from core.manager import Manager
 from fastapi import HTTPException
 from sqlalchemy.dialects.postgresql import UUID
@@ -30,7 +30,11 @@ class PlatformEnum(str, enum.Enum):
 
 class Brief_PlatformModel(BaseModel):
     __tablename__ = 'brief_platforms'
-    __table_args__ = {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    __table_args__ = (
+        page_index('brief_platforms'),
+        page_index('brief_platforms', 'brief'),
+        {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    )
 
 
     platform = Column(Enum(PlatformEnum), nullable=True, default=None)
@@ -41,11 +45,11 @@ class Brief_PlatformModel(BaseModel):
 
     paired = Column(BOOLEAN, nullable=True, default=False)
 
-    deep_analytics = relationship('Deep_AnalysisModel', back_populates='brief_platform__details', lazy='subquery')
+    deep_analytics = relationship('Deep_AnalysisModel', back_populates='brief_platform__details', lazy='noload')
 
 
     brief = Column(UUID(as_uuid=True), ForeignKey(os.environ.get('DEFAULT_SCHEMA', 'public') + ".briefs.id"))
-    brief__details = relationship("BriefModel", back_populates='brief_platforms', lazy='subquery')
+    brief__details = relationship("BriefModel", back_populates='brief_platforms', lazy='noload')
 
     @classmethod
     async def objects(cls, session):
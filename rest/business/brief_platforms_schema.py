@@ -83,4 +83,5 @@ class UpdateBrief_Platform(BaseModel):
 class ReadBrief_Platforms(BaseModel):
     data: list[Optional[ReadBrief_Platform]]
     next_page: Union[str, int]
+    next_cursor: Optional[str]
     page_size: int
\ No newline at end of file
@@ -81,4 +81,5 @@ class UpdateBrief_Product(BaseModel):
 class ReadBrief_Products(BaseModel):
     data: list[Optional[ReadBrief_Product]]
     next_page: Union[str, int]
+    next_cursor: Optional[str]
     page_size: int
\ No newline at end of file
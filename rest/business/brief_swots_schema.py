@@ -82,4 +82,5 @@ class UpdateBrief_Swot(BaseModel):
 class ReadBrief_Swots(BaseModel):
     data: list[Optional[ReadBrief_Swot]]
     next_page: Union[str, int]
+    next_cursor: Optional[str]
     page_size: int
\ No newline at end of file
@@ -9,7 +9,7 @@ import enum
 from sqlalchemy import DATETIME, String, ForeignKey
 from sqlalchemy import Enum, String, ForeignKey, Column, Text
 from sqlalchemy.orm import relationship
-from core.base_model import BaseModel
+from core.base_model import BaseModel, page_index
 from core.manager import Manager
 from fastapi import HTTPException
 from sqlalchemy.dialects.postgresql import UUID
@@ -26,32 +26,36 @@ class StatusEnum(str, enum.Enum):
 
 class BriefModel(BaseModel):
     __tablename__ = 'briefs'
-    __table_args__ = {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    __table_args__ = (
+        page_index('briefs'),
+        page_index('briefs', 'customer'),
+        {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    )
 
 
 
     customer = Column(UUID(as_uuid=True), ForeignKey(os.environ.get('DEFAULT_SCHEMA', 'public') + ".customers.id"))
-    customer__details = relationship("CustomerModel", back_populates='briefs', lazy='subquery')
+    customer__details = relationship("CustomerModel", back_populates='briefs', lazy='noload')
 
-    brief_platforms = relationship('Brief_PlatformModel', back_populates='brief__details', lazy='subquery')
+    brief_platforms = relationship('Brief_PlatformModel', back_populates='brief__details', lazy='noload')
 
-    brief_competitors = relationship('Brief_CompetitorModel', back_populates='brief__details', lazy='subquery')
+    brief_competitors = relationship('Brief_CompetitorModel', back_populates='brief__details', lazy='noload')
 
-    brief_products = relationship('Brief_ProductModel', back_populates='brief__details', lazy='subquery')
+    brief_products = relationship('Brief_ProductModel', back_populates='brief__details', lazy='noload')
 
-    brief_audiences = relationship('Brief_AudienceModel', back_populates='brief__details', lazy='subquery')
+    brief_audiences = relationship('Brief_AudienceModel', back_populates='brief__details', lazy='noload')
 
-    brief_personas = relationship('Brief_PersonaModel', back_populates='brief__details', lazy='subquery')
+    brief_personas = relationship('Brief_PersonaModel', back_populates='brief__details', lazy='noload')
 
-    brief_swots = relationship('Brief_SwotModel', back_populates='brief__details', lazy='subquery')
+    brief_swots = relationship('Brief_SwotModel', back_populates='brief__details', lazy='noload')
 
-    brief_marketings = relationship('Brief_MarketingModel', back_populates='brief__details', lazy='subquery')
+    brief_marketings = relationship('Brief_MarketingModel', back_populates='brief__details', lazy='noload')
 
-    brief_objectives = relationship('Brief_ObjectiveModel', back_populates='brief__details', lazy='subquery')
+    brief_objectives = relationship('Brief_ObjectiveModel', back_populates='brief__details', lazy='noload')
 
-    brief_businesses = relationship('Brief_BusinessModel', back_populates='brief__details', lazy='subquery')
+    brief_businesses = relationship('Brief_BusinessModel', back_populates='brief__details', lazy='noload')
 
-    brief_extras = relationship('Brief_ExtraModel', back_populates='brief__details', lazy='subquery')
+    brief_extras = relationship('Brief_ExtraModel', back_populates='brief__details', lazy='noload')
 
     extra_details = Column(Text, nullable=True, default=None)
 
@@ -82,4 +82,5 @@ class UpdateBrief(BaseModel):
 class ReadBriefs(BaseModel):
     data: list[Optional[ReadBrief]]
     next_page: Union[str, int]
+    next_cursor: Optional[str]
     page_size: int
\ No newline at end of file
@@ -9,7 +9,7 @@ import enum
 from sqlalchemy import DATETIME, String, ForeignKey
 from sqlalchemy import String, ForeignKey, Enum, Column, Text
 from sqlalchemy.orm import relationship
-from core.base_model import BaseModel
+from core.base_model import BaseModel, page_index
 from core.manager import Manager
 from fastapi import HTTPException
 from sqlalchemy.dialects.postgresql import UUID
@@ -25,7 +25,11 @@ class TypeEnum(str, enum.Enum):
 
 class Content_CommentModel(BaseModel):
     __tablename__ = 'content_comments'
-    __table_args__ = {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    __table_args__ = (
+        page_index('content_comments'),
+        page_index('content_comments', 'strategy_content'),
+        {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    )
 
 
     comment = Column(Text, nullable=True, default=None)
@@ -34,7 +38,7 @@ class Content_CommentModel(BaseModel):
 
 
     strategy_content = Column(UUID(as_uuid=True), ForeignKey(os.environ.get('DEFAULT_SCHEMA', 'public') + ".strategy_contents.id"))
-    strategy_content__details = relationship("Strategy_ContentModel", back_populates='content_comments', lazy='subquery')
+    strategy_content__details = relationship("Strategy_ContentModel", back_populates='content_comments', lazy='noload')
 
     @classmethod
     async def objects(cls, session):
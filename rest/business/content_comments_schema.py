@@ -71,4 +71,5 @@ class UpdateContent_Comment(BaseModel):
 class ReadContent_Comments(BaseModel):
     data: list[Optional[ReadContent_Comment]]
     next_page: Union[str, int]
+    next_cursor: Optional[str]
     page_size: int
\ No newline at end of file
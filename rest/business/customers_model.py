@@ -2,18 +2,20 @@ import os
 import importlib
 from core.logger import log
 
-from actions import attach_customer_to_new_user, create_brief_strategy_id, delete_user_after_customer
+from actions import attach_customer_to_new_user, delete_user_after_customer
 
 
 import enum
 from sqlalchemy import DATETIME, String, ForeignKey
 from sqlalchemy import String, ForeignKey, Column, Enum, JSON, Integer, Text
 from sqlalchemy.orm import relationship
-from core.base_model import BaseModel
+from core.base_model import BaseModel, page_index
 from core.manager import Manager
+from core.tasks import run_trigger
 from fastapi import HTTPException
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy import select
+from sqlalchemy import select, or_, any_, bindparam, Index
+from sqlalchemy.dialects.postgresql import ARRAY
 
 class CustomManager(Manager):
     async def pre_save(self, **kwargs) -> dict:
@@ -22,7 +24,8 @@ class CustomManager(Manager):
             new_data = kwargs.get("new_data", {})
             old_data = kwargs.get("old_data", {})
             well_known_urls = kwargs.get("well_known_urls", {})
-            new_data = await attach_customer_to_new_user.handler(jwt=jwt, new_data=new_data, old_data=old_data, well_known_urls=well_known_urls, method="create")
+            outbox_id = kwargs.get("outbox_id")
+            new_data = await run_trigger(attach_customer_to_new_user.handler, jwt=jwt, new_data=new_data, old_data=old_data, well_known_urls=well_known_urls, outbox_id=outbox_id, method="create")
             return new_data
         except Exception as err:
             log.warn("at least one step in pre_create trigger has been skipped")
@@ -30,36 +33,20 @@ class CustomManager(Manager):
             log.error("Error while executing pre_create trigger, check the debug above!")
             return new_data
 
-    async def post_save(self, **kwargs) -> dict:
-        try:
-            jwt = kwargs.get("jwt", {})
-            new_data = kwargs.get("new_data", {})
-            old_data = kwargs.get("old_data", {})
-            well_known_urls = kwargs.get("well_known_urls", {})
-            new_data = await create_brief_strategy_id.handler(jwt=jwt, new_data=new_data, old_data=old_data, well_known_urls=well_known_urls, method="create")
-            return new_data
-        except Exception as err:
-            log.warn("at least one step in post_create trigger has been skipped")
-            log.debug(err)
-            log.error("Error while executing post_create trigger, check the debug above!")
-            return new_data
-
-
-
-
     async def post_delete(self, **kwargs) -> bool:
         try:
             jwt = kwargs.get("jwt", {})
             new_data = kwargs.get("new_data", {})
             old_data = kwargs.get("old_data", {})
             well_known_urls = kwargs.get("well_known_urls", {})
-            new_data = await delete_user_after_customer.handler(jwt=jwt, new_data=new_data, old_data=old_data, well_known_urls=well_known_urls, method="delete")
+            outbox_id = kwargs.get("outbox_id")
+            new_data = await run_trigger(delete_user_after_customer.handler, jwt=jwt, new_data=new_data, old_data=old_data, well_known_urls=well_known_urls, outbox_id=outbox_id, method="delete")
             return new_data
         except Exception as err:
             log.warn("at least one step in post_delete trigger has been skipped")
             log.debug(err)
             log.error("Error while executing post_delete trigger, check the debug above!")
-            return new_data
+            raise
 
 
 # select enums
@@ -76,7 +63,13 @@ class IndicationEnum(str, enum.Enum):
 
 class CustomerModel(BaseModel):
     __tablename__ = 'customers'
-    __table_args__ = {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    __table_args__ = (
+        Index('ix_customers_brand_name', 'brand_name', unique=True),
+        Index('ix_customers_business_number', 'business_number', unique=True),
+        page_index('customers'),
+        page_index('customers', 'user'),
+        {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    )
 
 
     email = Column(Text, nullable=True, default=None)
@@ -115,17 +108,23 @@ class CustomerModel(BaseModel):
 
     indication = Column(Enum(IndicationEnum), nullable=True, default=None)
 
-    briefs = relationship('BriefModel', back_populates='customer__details', lazy='subquery')
+    briefs = relationship('BriefModel', back_populates='customer__details', lazy='noload')
 
-    strategies = relationship('StrategyModel', back_populates='customer__details', lazy='subquery')
+    strategies = relationship('StrategyModel', back_populates='customer__details', lazy='noload')
 
-    appointments = relationship('AppointmentModel', back_populates='customer__details', lazy='subquery')
+    appointments = relationship('AppointmentModel', back_populates='customer__details', lazy='noload')
 
-    file_assets = relationship('File_AssetModel', back_populates='customer__details', lazy='subquery')
+    file_assets = relationship(
+        'File_AssetModel', back_populates='customer__details', lazy='noload',
+        primaryjoin='and_(CustomerModel.id == File_AssetModel.customer, File_AssetModel.deleted.isnot(True))'
+    )
 
-    folders = relationship('FolderModel', back_populates='customer__details', lazy='subquery')
+    folders = relationship(
+        'FolderModel', back_populates='customer__details', lazy='noload',
+        primaryjoin='and_(CustomerModel.id == FolderModel.customer, FolderModel.deleted.isnot(True))'
+    )
 
-    designs = relationship('DesignModel', back_populates='customer__details', lazy='subquery')
+    designs = relationship('DesignModel', back_populates='customer__details', lazy='noload')
 
 
     user = Column(UUID(as_uuid=True), ForeignKey("public.users.id"))
@@ -141,11 +140,11 @@ class CustomerModel(BaseModel):
 
     @classmethod
     async def validate_unique_brand_name(cls, db, brand_name, id=None):
-        query = select(cls).where(cls.brand_name==brand_name)
+        query = select(cls.id).where(cls.brand_name==brand_name).limit(1)
         if id is not None:
             query = query.where(cls.id != id)
         result = await db.execute(query)
-        existing_record = result.scalars().first()
+        existing_record = result.scalar()
         if existing_record:
             raise HTTPException(status_code=422, detail={
                 "field_name": "brand_name",
@@ -153,13 +152,65 @@ class CustomerModel(BaseModel):
             })
     @classmethod
     async def validate_unique_business_number(cls, db, business_number, id=None):
-        query = select(cls).where(cls.business_number==business_number)
+        query = select(cls.id).where(cls.business_number==business_number).limit(1)
         if id is not None:
             query = query.where(cls.id != id)
         result = await db.execute(query)
-        existing_record = result.scalars().first()
+        existing_record = result.scalar()
         if existing_record:
             raise HTTPException(status_code=422, detail={
                 "field_name": "business_number",
                 "message": f"business_number should be unique"
-            })
\ No newline at end of file
+            })
+
+    # columns checked by validate_unique_multiple, in the order their errors are reported
+    UNIQUE_COLUMNS = ('brand_name', 'business_number')
+
+    @classmethod
+    async def validate_unique_multiple(cls, db, items, ids=None) -> list:
+        """
+        Validate the unique columns of a batch of customers with a single query, returning the errors as
+        [{"index": <item index>, "errors": <detail>}]. A value is a conflict when another stored customer holds
+        it, or when an earlier item of the batch holds it. Items are matched to their stored record by `id`,
+        or by the matching entry of `ids` when given (updates).
+        """
+        values = {column: [] for column in cls.UNIQUE_COLUMNS}
+        for item in items:
+            for column in cls.UNIQUE_COLUMNS:
+                if getattr(item, column, None) is not None:
+                    values[column].append(getattr(item, column))
+        if not any(values.values()):
+            return []
+
+        conditions = [
+            getattr(cls, column) == any_(bindparam(f'{column}_values', column_values, type_=ARRAY(cls.__table__.c[column].type)))
+            for column, column_values in values.items() if column_values
+        ]
+        result = await db.execute(select(cls.id, *[getattr(cls, column) for column in cls.UNIQUE_COLUMNS]).where(or_(*conditions)))
+        # owners of every stored value, the batch claims values as it goes
+        owners = {column: {} for column in cls.UNIQUE_COLUMNS}
+        for row in result:
+            for column in cls.UNIQUE_COLUMNS:
+                if row._mapping[column] is not None:
+                    owners[column].setdefault(row._mapping[column], set()).add(str(row.id))
+
+        errors_info = []
+        for index, item in enumerate(items):
+            item_id = ids[index] if ids else getattr(item, 'id', None)
+            item_id = str(item_id) if item_id is not None else None
+            for column in cls.UNIQUE_COLUMNS:
+                value = getattr(item, column, None)
+                if value is None:
+                    continue
+                if owners[column].get(value, set()) - {item_id}:
+                    errors_info.append({"index": index, "errors": {
+                        "field_name": column,
+                        "message": f"{column} should be unique"
+                    }})
+                    break
+            else:
+                for column in cls.UNIQUE_COLUMNS:
+                    if getattr(item, column, None) is not None:
+                        # items without an id are new records, they conflict with any other holder
+                        owners[column].setdefault(getattr(item, column), set()).add(item_id or f'index:{index}')
+        return errors_info
@@ -162,4 +162,5 @@ class UpdateCustomer(BaseModel):
 class ReadCustomers(BaseModel):
     data: list[Optional[ReadCustomer]]
     next_page: Union[str, int]
+    next_cursor: Optional[str]
     page_size: int
\ No newline at end of file
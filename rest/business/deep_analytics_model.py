@@ -1,5 +1,6 @@
 import os
 import importlib
+import uuid
 from core.logger import log
 
 
@@ -7,14 +8,124 @@ from core.logger import log
 
 import enum
 from sqlalchemy import DATETIME, String, ForeignKey
-from sqlalchemy import ARRAY, String, ForeignKey, Column, Enum, Text
+from sqlalchemy import ARRAY, String, ForeignKey, Column, Enum, Text, BigInteger, Numeric
 from sqlalchemy.orm import relationship
-from core.base_model import BaseModel
+from core.base_model import BaseModel, page_index
 from core.manager import Manager
 from fastapi import HTTPException
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy import select
-
+from sqlalchemy import select, delete, insert, func, literal, union_all, cast
+from business.briefs_model import BriefModel
+from business.brief_platforms_model import Brief_PlatformModel
+from business.deep_analytics_rollups_model import Deep_Analytics_RollupModel
+from business.deep_analytics_snapshots_model import Deep_Analytics_SnapshotModel, SNAPSHOT_RESOLUTIONS, bucket_start
+from sqlalchemy.dialects import postgresql
+
+# numeric metrics aggregated by the rollups
+NUMERIC_METRICS = (
+    'website_visits', 'facebook_engagement_rate', 'facebook_followers', 'facebook_likes', 'facebook_comments',
+    'facebook_share', 'facebook_monthly_posts', 'facebook_ads_revenue', 'instagram_followes', 'twitter_followes',
+    'tiktok_followes', 'youtube_followes'
+)
+
+
+async def refresh_rollups(db, briefs: set) -> None:
+    """
+    Recompute the rollups of the given briefs from their deep analytics, in the current transaction. The briefs
+    are locked first (FOR UPDATE): concurrent writers refresh the rollups of a brief one after the other, each reading the
+    deep analytics committed by the previous one.
+    """
+    if not briefs:
+        return
+    briefs = sorted(briefs)
+    await db.execute(select(BriefModel.id).where(BriefModel.id.in_(briefs)).order_by(BriefModel.id).with_for_update())
+    # bigint and numeric metrics are aggregated as numeric, union columns have one type
+    statement = union_all(*[
+        select(
+            Brief_PlatformModel.brief,
+            Deep_AnalysisModel.platform_type,
+            literal(metric, Text).label('metric'),
+            func.count(getattr(Deep_AnalysisModel, metric)).label('samples'),
+            cast(func.sum(getattr(Deep_AnalysisModel, metric)), Numeric).label('total'),
+            cast(func.min(getattr(Deep_AnalysisModel, metric)), Numeric).label('minimum'),
+            cast(func.max(getattr(Deep_AnalysisModel, metric)), Numeric).label('maximum')
+        )
+        .join(Brief_PlatformModel, Deep_AnalysisModel.brief_platform == Brief_PlatformModel.id)
+        .where(Brief_PlatformModel.brief.in_(briefs))
+        .group_by(Brief_PlatformModel.brief, Deep_AnalysisModel.platform_type)
+        for metric in NUMERIC_METRICS
+    ])
+    rollups = [{"id": uuid.uuid4(), **row} for row in (await db.execute(statement)).mappings().all()]
+    await db.execute(delete(Deep_Analytics_RollupModel).where(Deep_Analytics_RollupModel.brief.in_(briefs)))
+    if rollups:
+        await db.execute(insert(Deep_Analytics_RollupModel).values(rollups))
+
+
+async def capture_snapshots(db, obj_ids: list) -> None:
+    """
+    Write the metrics of the given deep analytics to the snapshots of their brief platforms in the buckets
+    of every resolution holding the current time, in the current transaction; a later write in the same
+    bucket replaces its metrics.
+    """
+    if not obj_ids:
+        return
+    statement = select(Deep_AnalysisModel.brief_platform, *[getattr(Deep_AnalysisModel, metric) for metric in NUMERIC_METRICS], func.localtimestamp())\
+                .where(Deep_AnalysisModel.id.in_(obj_ids), Deep_AnalysisModel.brief_platform.isnot(None))\
+                .order_by(Deep_AnalysisModel.updated_on)
+    # ON CONFLICT DO UPDATE can not affect the same snapshot twice in one statement, the latest analysis wins
+    latest = {row[0]: row for row in (await db.execute(statement)).all()}
+    snapshots = [
+        {
+            "id": uuid.uuid4(),
+            "brief_platform": brief_platform,
+            "resolution": resolution,
+            "captured_at": bucket_start(now, resolution),
+            "samples": 1,
+            **dict(zip(NUMERIC_METRICS, values))
+        }
+        for brief_platform, *values, now in latest.values() for resolution in SNAPSHOT_RESOLUTIONS
+    ]
+    if not snapshots:
+        return
+    statement = postgresql.insert(Deep_Analytics_SnapshotModel).values(snapshots)
+    statement = statement.on_conflict_do_update(
+        index_elements=['brief_platform', 'resolution', 'captured_at'],
+        set_={
+            **{metric: statement.excluded[metric] for metric in NUMERIC_METRICS},
+            "samples": Deep_Analytics_SnapshotModel.samples + 1,
+            "updated_on": func.now()
+        }
+    )
+    await db.execute(statement)
+
+
+class CustomManager(Manager):
+    """
+    Refreshes the rollups of the briefs of the deep analytics it writes and records their snapshots,
+    see `refresh_rollups` and `capture_snapshots`
+    """
+
+    def __init__(self, model, database):
+        super().__init__(model, database)
+        self._rollup_briefs = set()  # briefs of the records about to be updated or deleted
+
+    async def before_write(self, obj_ids: list):
+        await super().before_write(obj_ids)
+        self._rollup_briefs |= await self._briefs(obj_ids)
+
+    async def written(self, obj_ids: list):
+        await super().written(obj_ids)
+        briefs, self._rollup_briefs = self._rollup_briefs | await self._briefs(obj_ids), set()
+        await refresh_rollups(self.db, briefs)
+        await capture_snapshots(self.db, obj_ids)
+
+    async def _briefs(self, obj_ids: list) -> set:
+        if not obj_ids:
+            return set()
+        statement = select(Brief_PlatformModel.brief)\
+                    .join(Deep_AnalysisModel, Deep_AnalysisModel.brief_platform == Brief_PlatformModel.id)\
+                    .where(Deep_AnalysisModel.id.in_(obj_ids))
+        return set((await self.db.execute(statement)).scalars().all()) - {None}
 
 
 # select enums
@@ -37,10 +148,14 @@ class PlatformTypeEnum(str, enum.Enum):
 
 class Deep_AnalysisModel(BaseModel):
     __tablename__ = 'deep_analytics'
-    __table_args__ = {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    __table_args__ = (
+        page_index('deep_analytics'),
+        page_index('deep_analytics', 'brief_platform'),
+        {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    )
 
 
-    website_visits = Column(Text, nullable=True, default=None)
+    website_visits = Column(BigInteger, nullable=True, default=None)
 
     website_performance = Column(Text, nullable=True, default=None)
 
@@ -48,17 +163,17 @@ class Deep_AnalysisModel(BaseModel):
 
     website_traffic_sources = Column(Text, nullable=True, default=None)
 
-    facebook_engagement_rate = Column(Text, nullable=True, default=None)
+    facebook_engagement_rate = Column(Numeric(asdecimal=False), nullable=True, default=None)  # percent
 
-    facebook_followers = Column(Text, nullable=True, default=None)
+    facebook_followers = Column(BigInteger, nullable=True, default=None)
 
-    facebook_likes = Column(Text, nullable=True, default=None)
+    facebook_likes = Column(BigInteger, nullable=True, default=None)
 
-    facebook_comments = Column(Text, nullable=True, default=None)
+    facebook_comments = Column(BigInteger, nullable=True, default=None)
 
-    facebook_share = Column(Text, nullable=True, default=None)
+    facebook_share = Column(BigInteger, nullable=True, default=None)
 
-    facebook_monthly_posts = Column(Text, nullable=True, default=None)
+    facebook_monthly_posts = Column(BigInteger, nullable=True, default=None)
 
     facebook_type_of_content = Column(ARRAY(Text), nullable=True, default=None)
 
@@ -80,27 +195,27 @@ class Deep_AnalysisModel(BaseModel):
 
     facebook_best_performing_post = Column(Text, nullable=True, default=None)
 
-    facebook_ads_revenue = Column(Text, nullable=True, default=None)
+    facebook_ads_revenue = Column(Numeric(asdecimal=False), nullable=True, default=None)
 
-    instagram_followes = Column(Text, nullable=True, default=None)
+    instagram_followes = Column(BigInteger, nullable=True, default=None)
 
-    twitter_followes = Column(Text, nullable=True, default=None)
+    twitter_followes = Column(BigInteger, nullable=True, default=None)
 
-    tiktok_followes = Column(Text, nullable=True, default=None)
+    tiktok_followes = Column(BigInteger, nullable=True, default=None)
 
     google_seo = Column(Text, nullable=True, default=None)
 
-    youtube_followes = Column(Text, nullable=True, default=None)
+    youtube_followes = Column(BigInteger, nullable=True, default=None)
 
     platform_type = Column(Enum(PlatformTypeEnum), nullable=False, default=None)
 
 
     brief_platform = Column(UUID(as_uuid=True), ForeignKey(os.environ.get('DEFAULT_SCHEMA', 'public') + ".brief_platforms.id"))
-    brief_platform__details = relationship("Brief_PlatformModel", back_populates='deep_analytics', lazy='subquery')
+    brief_platform__details = relationship("Brief_PlatformModel", back_populates='deep_analytics', lazy='noload')
 
     @classmethod
     async def objects(cls, session):
-        obj = await Manager.async_init(cls, session)
+        obj = await CustomManager.async_init(cls, session)
         return obj
 
 
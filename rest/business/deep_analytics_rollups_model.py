@@ -0,0 +1,49 @@
+import os
+import enum
+
+from sqlalchemy import BigInteger, Column, Enum, ForeignKey, Index, Numeric, Text
+from sqlalchemy.dialects.postgresql import UUID
+from core.base_model import BaseModel
+from core.manager import Manager
+
+
+# select enums
+class PlatformTypeEnum(str, enum.Enum):
+    website = "website"
+    facebook = "facebook"
+    instagram = "instagram"
+    twitter = "twitter"
+    tiktok = "tiktok"
+    google = "google"
+    youtube = "youtube"
+
+
+class Deep_Analytics_RollupModel(BaseModel):
+    """
+    Aggregates of a numeric metric of the deep analytics of a brief and platform type, for dashboards. Rows are
+    recomputed by the deep analytics manager in the transactions writing deep analytics, see `refresh_rollups`.
+    """
+    __tablename__ = 'deep_analytics_rollups'
+    __table_args__ = (
+        Index('ix_deep_analytics_rollups_brief_platform_type_metric', 'brief', 'platform_type', 'metric', unique=True),
+        {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    )
+
+    brief = Column(UUID(as_uuid=True), ForeignKey(os.environ.get('DEFAULT_SCHEMA', 'public') + ".briefs.id"), nullable=False)
+
+    platform_type = Column(Enum(PlatformTypeEnum), nullable=False)
+
+    metric = Column(Text, nullable=False)  # name of the deep analytics column
+
+    samples = Column(BigInteger, nullable=False, default=0)  # deep analytics with a value for the metric
+
+    total = Column(Numeric, nullable=True, default=None)
+
+    minimum = Column(Numeric, nullable=True, default=None)
+
+    maximum = Column(Numeric, nullable=True, default=None)
+
+    @classmethod
+    async def objects(cls, session):
+        obj = await Manager.async_init(cls, session)
+        return obj
@@ -0,0 +1,27 @@
+from typing import Optional
+import uuid
+import datetime
+
+from pydantic import BaseModel, validator, Field
+from business.deep_analytics_schema import PlatformTypeEnum
+
+
+class ReadDeep_Analytics_Rollup(BaseModel):
+    brief: uuid.UUID
+    platform_type: PlatformTypeEnum
+    metric: str
+    samples: int
+    total: Optional[float] = Field(default=None)
+    minimum: Optional[float] = Field(default=None)
+    maximum: Optional[float] = Field(default=None)
+    average: Optional[float] = Field(default=None)
+    updated_on: Optional[datetime.datetime] = Field(default=None)
+
+    @validator('average', always=True)
+    def validate_average(cls, average: Optional[float], values: dict):
+        if values.get('samples') and values.get('total') is not None:
+            return values['total'] / values['samples']
+        return average
+
+    class Config:
+        orm_mode = True
@@ -4,6 +4,7 @@ from typing import Union
 import uuid
 import enum
 import datetime
+import re
 
 from pydantic import BaseModel, validator, EmailStr, Field
 from core.encryptStr import EncryptStr
@@ -28,19 +29,50 @@ class PlatformTypeEnum(str, enum.Enum):
     google = "google"
     youtube = "youtube"
 
+# numbers as people write them: 1200, 1,200, 1.2k, 3M, 4.5%
+METRIC_PATTERN = re.compile(r'^-?[0-9]+(\.[0-9]+)?[kmb]?$')
+METRIC_MULTIPLIERS = {'k': 1_000, 'm': 1_000_000, 'b': 1_000_000_000}
+NUMERIC_METRICS = (
+    'website_visits', 'facebook_engagement_rate', 'facebook_followers', 'facebook_likes', 'facebook_comments',
+    'facebook_share', 'facebook_monthly_posts', 'facebook_ads_revenue', 'instagram_followes', 'twitter_followes',
+    'tiktok_followes', 'youtube_followes'
+)
+FLOAT_METRICS = ('facebook_engagement_rate', 'facebook_ads_revenue')
+
+
+def parse_metric(cls, value, field):
+    """
+    Return the number written in a metric string, migrations/0004_deep_analytics_numeric_metrics.sql parses stored values alike.
+    Only FLOAT_METRICS take fractions, integer metrics reject them instead of letting pydantic truncate them
+    """
+    if isinstance(value, str):
+        text = re.sub(r'[\s,%+]', '', value).lower()
+        if not text:
+            return None
+        if not METRIC_PATTERN.match(text):
+            raise ValueError("should be a number, e.g. 1200, 1.2k or 4.5%")
+        multiplier = METRIC_MULTIPLIERS.get(text[-1], 1)
+        number = float(text.rstrip('kmb')) * multiplier
+        value = round(number, 6) if multiplier > 1 or '.' in text else int(text)
+    if isinstance(value, float) and field.name not in FLOAT_METRICS:
+        if not value.is_integer():
+            raise ValueError("should be a whole number, e.g. 1200 or 1.2k")
+        return int(value)
+    return value
+
 
 class CreateDeep_Analysis(BaseModel):
     id: Optional[uuid.UUID]
-    website_visits: Optional[str] = Field(default=None)
+    website_visits: Optional[int] = Field(default=None)
     website_performance: Optional[str] = Field(default=None)
     website_technical_issues: Optional[str] = Field(default=None)
     website_traffic_sources: Optional[str] = Field(default=None)
-    facebook_engagement_rate: Optional[str] = Field(default=None)
-    facebook_followers: Optional[str] = Field(default=None)
-    facebook_likes: Optional[str] = Field(default=None)
-    facebook_comments: Optional[str] = Field(default=None)
-    facebook_share: Optional[str] = Field(default=None)
-    facebook_monthly_posts: Optional[str] = Field(default=None)
+    facebook_engagement_rate: Optional[float] = Field(default=None)
+    facebook_followers: Optional[int] = Field(default=None)
+    facebook_likes: Optional[int] = Field(default=None)
+    facebook_comments: Optional[int] = Field(default=None)
+    facebook_share: Optional[int] = Field(default=None)
+    facebook_monthly_posts: Optional[int] = Field(default=None)
     facebook_type_of_content: Optional[List[str]]
     facebook_interests: Optional[str] = Field(default=None)
     facebook_achieved_platfrms_in_future: Optional[List[str]]
@@ -51,15 +83,16 @@ class CreateDeep_Analysis(BaseModel):
     facebook_audience_age: Optional[FacebookAudienceAgeEnum]
     facebook_audience_gender: Optional[FacebookAudienceGenderEnum]
     facebook_best_performing_post: Optional[str] = Field(default=None)
-    facebook_ads_revenue: Optional[str] = Field(default=None)
-    instagram_followes: Optional[str] = Field(default=None)
-    twitter_followes: Optional[str] = Field(default=None)
-    tiktok_followes: Optional[str] = Field(default=None)
+    facebook_ads_revenue: Optional[float] = Field(default=None)
+    instagram_followes: Optional[int] = Field(default=None)
+    twitter_followes: Optional[int] = Field(default=None)
+    tiktok_followes: Optional[int] = Field(default=None)
     google_seo: Optional[str] = Field(default=None)
-    youtube_followes: Optional[str] = Field(default=None)
+    youtube_followes: Optional[int] = Field(default=None)
     platform_type: PlatformTypeEnum
     brief_platform: uuid.UUID
 
+    _parse_metrics = validator(*NUMERIC_METRICS, pre=True, allow_reuse=True)(parse_metric)
     @validator('facebook_type_of_content')
     def validate_facebook_type_of_content(cls, facebook_type_of_content: Optional[List[str]]):
         if False or False or False:
@@ -117,16 +150,16 @@ class ReadDeep_Analysis(BaseModel):
     updated_on: datetime.datetime
     created_by: Optional[uuid.UUID] = Field(default=None)
     updated_by: Optional[uuid.UUID] = Field(default=None)
-    website_visits: Optional[str] = Field(default=None)
+    website_visits: Optional[int] = Field(default=None)
     website_performance: Optional[str] = Field(default=None)
     website_technical_issues: Optional[str] = Field(default=None)
     website_traffic_sources: Optional[str] = Field(default=None)
-    facebook_engagement_rate: Optional[str] = Field(default=None)
-    facebook_followers: Optional[str] = Field(default=None)
-    facebook_likes: Optional[str] = Field(default=None)
-    facebook_comments: Optional[str] = Field(default=None)
-    facebook_share: Optional[str] = Field(default=None)
-    facebook_monthly_posts: Optional[str] = Field(default=None)
+    facebook_engagement_rate: Optional[float] = Field(default=None)
+    facebook_followers: Optional[int] = Field(default=None)
+    facebook_likes: Optional[int] = Field(default=None)
+    facebook_comments: Optional[int] = Field(default=None)
+    facebook_share: Optional[int] = Field(default=None)
+    facebook_monthly_posts: Optional[int] = Field(default=None)
     facebook_type_of_content: Optional[List[str]]
     facebook_interests: Optional[str] = Field(default=None)
     facebook_achieved_platfrms_in_future: Optional[List[str]]
@@ -137,12 +170,12 @@ class ReadDeep_Analysis(BaseModel):
     facebook_audience_age: Optional[FacebookAudienceAgeEnum]
     facebook_audience_gender: Optional[FacebookAudienceGenderEnum]
     facebook_best_performing_post: Optional[str] = Field(default=None)
-    facebook_ads_revenue: Optional[str] = Field(default=None)
-    instagram_followes: Optional[str] = Field(default=None)
-    twitter_followes: Optional[str] = Field(default=None)
-    tiktok_followes: Optional[str] = Field(default=None)
+    facebook_ads_revenue: Optional[float] = Field(default=None)
+    instagram_followes: Optional[int] = Field(default=None)
+    twitter_followes: Optional[int] = Field(default=None)
+    tiktok_followes: Optional[int] = Field(default=None)
     google_seo: Optional[str] = Field(default=None)
-    youtube_followes: Optional[str] = Field(default=None)
+    youtube_followes: Optional[int] = Field(default=None)
     platform_type: PlatformTypeEnum
     brief_platform: Optional[uuid.UUID] = Field(default=None)
     brief_platform__details: Optional[object] = Field(default={})
@@ -189,16 +222,16 @@ class ReadDeep_Analysis(BaseModel):
 
 
 class UpdateDeep_Analysis(BaseModel):
-    website_visits: Optional[str] = Field(default=None)
+    website_visits: Optional[int] = Field(default=None)
     website_performance: Optional[str] = Field(default=None)
     website_technical_issues: Optional[str] = Field(default=None)
     website_traffic_sources: Optional[str] = Field(default=None)
-    facebook_engagement_rate: Optional[str] = Field(default=None)
-    facebook_followers: Optional[str] = Field(default=None)
-    facebook_likes: Optional[str] = Field(default=None)
-    facebook_comments: Optional[str] = Field(default=None)
-    facebook_share: Optional[str] = Field(default=None)
-    facebook_monthly_posts: Optional[str] = Field(default=None)
+    facebook_engagement_rate: Optional[float] = Field(default=None)
+    facebook_followers: Optional[int] = Field(default=None)
+    facebook_likes: Optional[int] = Field(default=None)
+    facebook_comments: Optional[int] = Field(default=None)
+    facebook_share: Optional[int] = Field(default=None)
+    facebook_monthly_posts: Optional[int] = Field(default=None)
     facebook_type_of_content: Optional[List[str]]
     facebook_interests: Optional[str] = Field(default=None)
     facebook_achieved_platfrms_in_future: Optional[List[str]]
@@ -209,15 +242,16 @@ class UpdateDeep_Analysis(BaseModel):
     facebook_audience_age: Optional[FacebookAudienceAgeEnum]
     facebook_audience_gender: Optional[FacebookAudienceGenderEnum]
     facebook_best_performing_post: Optional[str] = Field(default=None)
-    facebook_ads_revenue: Optional[str] = Field(default=None)
-    instagram_followes: Optional[str] = Field(default=None)
-    twitter_followes: Optional[str] = Field(default=None)
-    tiktok_followes: Optional[str] = Field(default=None)
+    facebook_ads_revenue: Optional[float] = Field(default=None)
+    instagram_followes: Optional[int] = Field(default=None)
+    twitter_followes: Optional[int] = Field(default=None)
+    tiktok_followes: Optional[int] = Field(default=None)
     google_seo: Optional[str] = Field(default=None)
-    youtube_followes: Optional[str] = Field(default=None)
+    youtube_followes: Optional[int] = Field(default=None)
     platform_type: Optional[PlatformTypeEnum]
     brief_platform: Optional[uuid.UUID] = Field(default=None)
 
+    _parse_metrics = validator(*NUMERIC_METRICS, pre=True, allow_reuse=True)(parse_metric)
 
     @validator('facebook_type_of_content')
     def validate_facebook_type_of_content(cls, facebook_type_of_content: Optional[List[str]]):
@@ -280,4 +314,5 @@ class UpdateDeep_Analysis(BaseModel):
 class ReadDeep_Analytics(BaseModel):
     data: list[Optional[ReadDeep_Analysis]]
     next_page: Union[str, int]
+    next_cursor: Optional[str]
     page_size: int
\ No newline at end of file
@@ -0,0 +1,177 @@
+import os
+import asyncio
+import datetime
+import time
+from typing import Optional
+
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer, Numeric, Text, delete, func, select
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+import business
+from core.base_model import BaseModel
+from core.logger import log
+from core.manager import Manager, is_cockroach
+from core.metrics import metrics
+
+# resolutions of the snapshots, finest first, named as date_trunc fields
+SNAPSHOT_RESOLUTIONS = ('hour', 'day', 'week')
+# days the snapshots of each resolution are kept, 0 keeps them forever
+SNAPSHOT_RETENTION_DAYS = {
+    "hour": int(os.environ.get('SNAPSHOT_HOURLY_RETENTION_DAYS', 14)),
+    "day": int(os.environ.get('SNAPSHOT_DAILY_RETENTION_DAYS', 400)),
+    "week": int(os.environ.get('SNAPSHOT_WEEKLY_RETENTION_DAYS', 0)),
+}
+# most snapshots a range query returns, coarser resolutions are read for longer ranges
+SNAPSHOT_MAX_POINTS = int(os.environ.get('SNAPSHOT_MAX_POINTS', 500))
+SNAPSHOT_PRUNE_BATCH_SIZE = int(os.environ.get('SNAPSHOT_PRUNE_BATCH_SIZE', 5000))
+# seconds between two deletions of the snapshots past their retention, 0 disables them
+SNAPSHOT_PRUNE_INTERVAL = float(os.environ.get('SNAPSHOT_PRUNE_INTERVAL', 3600))
+# key of the advisory lock held while pruning, the API workers and relays prune one at a time
+SNAPSHOT_PRUNE_ADVISORY_LOCK = 5_871_204
+BUCKET_SIZES = {"hour": datetime.timedelta(hours=1), "day": datetime.timedelta(days=1), "week": datetime.timedelta(weeks=1)}
+
+
+class Deep_Analytics_SnapshotModel(BaseModel):
+    """
+    Metrics of the deep analytics of a brief platform at the end of an hour, day or week bucket. Each deep
+    analytics write updates the bucket of every resolution holding the current time, see `capture_snapshots`,
+    and `prune_snapshots` drops the buckets older than the retention of their resolution.
+    """
+    __tablename__ = 'deep_analytics_snapshots'
+    __table_args__ = (
+        Index('ix_deep_analytics_snapshots_series', 'brief_platform', 'resolution', 'captured_at', unique=True),
+        Index('ix_deep_analytics_snapshots_retention', 'resolution', 'captured_at'),
+        {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    )
+
+    brief_platform = Column(UUID(as_uuid=True), ForeignKey(os.environ.get('DEFAULT_SCHEMA', 'public') + ".brief_platforms.id", ondelete='CASCADE'), nullable=False)
+
+    resolution = Column(Text, nullable=False)  # hour, day or week
+
+    captured_at = Column(DateTime, nullable=False)  # start of the bucket
+
+    samples = Column(Integer, nullable=False, default=1)  # deep analytics writes in the bucket, the last one is kept
+
+    website_visits = Column(BigInteger, nullable=True, default=None)
+
+    facebook_engagement_rate = Column(Numeric(asdecimal=False), nullable=True, default=None)
+
+    facebook_followers = Column(BigInteger, nullable=True, default=None)
+
+    facebook_likes = Column(BigInteger, nullable=True, default=None)
+
+    facebook_comments = Column(BigInteger, nullable=True, default=None)
+
+    facebook_share = Column(BigInteger, nullable=True, default=None)
+
+    facebook_monthly_posts = Column(BigInteger, nullable=True, default=None)
+
+    facebook_ads_revenue = Column(Numeric(asdecimal=False), nullable=True, default=None)
+
+    instagram_followes = Column(BigInteger, nullable=True, default=None)
+
+    twitter_followes = Column(BigInteger, nullable=True, default=None)
+
+    tiktok_followes = Column(BigInteger, nullable=True, default=None)
+
+    youtube_followes = Column(BigInteger, nullable=True, default=None)
+
+    @classmethod
+    async def objects(cls, session):
+        obj = await Manager.async_init(cls, session)
+        return obj
+
+
+def bucket_start(moment: datetime.datetime, resolution: str) -> datetime.datetime:
+    """
+    Return the start of the bucket of the given resolution holding `moment`, weeks start on Monday as with date_trunc
+    """
+    moment = moment.replace(minute=0, second=0, microsecond=0)
+    if resolution == 'hour':
+        return moment
+    moment = moment.replace(hour=0)
+    if resolution == 'day':
+        return moment
+    return moment - datetime.timedelta(days=moment.weekday())
+
+
+def retained_since(resolution: str, now: datetime.datetime) -> Optional[datetime.datetime]:
+    """
+    Return the start of the oldest bucket of the resolution that is kept, None if they are all kept
+    """
+    days = SNAPSHOT_RETENTION_DAYS[resolution]
+    return bucket_start(now - datetime.timedelta(days=days), resolution) if days else None
+
+
+def choose_resolution(start: datetime.datetime, end: datetime.datetime, now: datetime.datetime) -> str:
+    """
+    Return the finest resolution still kept at `start` with at most SNAPSHOT_MAX_POINTS buckets between `start` and `end`
+    """
+    for resolution in SNAPSHOT_RESOLUTIONS:
+        since = retained_since(resolution, now)
+        if (since is None or start >= since) and (end - start) / BUCKET_SIZES[resolution] <= SNAPSHOT_MAX_POINTS:
+            return resolution
+    return SNAPSHOT_RESOLUTIONS[-1]
+
+
+async def prune_snapshots(db) -> int:
+    """
+    Delete the snapshots older than the retention of their resolution, in batches committed one by one,
+    and return the number of deleted snapshots
+    """
+    now = (await db.execute(select(func.localtimestamp()))).scalar()
+    deleted = 0
+    for resolution in SNAPSHOT_RESOLUTIONS:
+        since = retained_since(resolution, now)
+        if since is None:
+            continue
+        while True:
+            expired = select(Deep_Analytics_SnapshotModel.id)\
+                      .where(Deep_Analytics_SnapshotModel.resolution == resolution, Deep_Analytics_SnapshotModel.captured_at < since)\
+                      .limit(SNAPSHOT_PRUNE_BATCH_SIZE)
+            result = await db.execute(
+                delete(Deep_Analytics_SnapshotModel).where(Deep_Analytics_SnapshotModel.id.in_(expired)).execution_options(synchronize_session=False)
+            )
+            await db.commit()
+            deleted += result.rowcount
+            if result.rowcount < SNAPSHOT_PRUNE_BATCH_SIZE:
+                break
+    return deleted
+
+
+async def prune_exclusively() -> Optional[int]:
+    """
+    Prune the snapshots holding the SNAPSHOT_PRUNE_ADVISORY_LOCK, return the number of deleted snapshots or None
+    when another process is pruning them. CockroachDB has no advisory locks, every process prunes there.
+    """
+    async with business.engine_async.connect() as connection:
+        # autocommit: the lock is held by the connection across the batches `prune_snapshots` commits
+        connection = await connection.execution_options(isolation_level='AUTOCOMMIT')
+        async with AsyncSession(bind=connection) as session:
+            if await is_cockroach(session):
+                return await prune_snapshots(session)
+            if not (await session.execute(select(func.pg_try_advisory_lock(SNAPSHOT_PRUNE_ADVISORY_LOCK)))).scalar():
+                return None
+            try:
+                return await prune_snapshots(session)
+            finally:
+                await session.execute(select(func.pg_advisory_unlock(SNAPSHOT_PRUNE_ADVISORY_LOCK)))
+
+
+async def prune_forever(interval: float = SNAPSHOT_PRUNE_INTERVAL) -> None:
+    """
+    Prune the snapshots past their retention every `interval` seconds, see `prune_exclusively`
+    """
+    while True:
+        try:
+            started = time.perf_counter()
+            deleted = await prune_exclusively()
+            if deleted is not None:
+                metrics.inc('snapshots.pruned', deleted)
+                log.info(f"pruned {deleted} deep analytics snapshots in {time.perf_counter() - started:.3f}s")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.debug(e)
+            log.error("Can not prune the deep analytics snapshots, check the debug above!")
+        await asyncio.sleep(interval)
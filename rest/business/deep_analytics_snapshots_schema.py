@@ -0,0 +1,41 @@
+from typing import Optional
+import uuid
+import enum
+import datetime
+
+from pydantic import BaseModel, Field
+
+
+# select enums
+class ResolutionEnum(str, enum.Enum):
+    hour = "hour"
+    day = "day"
+    week = "week"
+
+
+class ReadDeep_Analytics_Snapshot(BaseModel):
+    captured_at: datetime.datetime
+    samples: int
+    website_visits: Optional[int] = Field(default=None)
+    facebook_engagement_rate: Optional[float] = Field(default=None)
+    facebook_followers: Optional[int] = Field(default=None)
+    facebook_likes: Optional[int] = Field(default=None)
+    facebook_comments: Optional[int] = Field(default=None)
+    facebook_share: Optional[int] = Field(default=None)
+    facebook_monthly_posts: Optional[int] = Field(default=None)
+    facebook_ads_revenue: Optional[float] = Field(default=None)
+    instagram_followes: Optional[int] = Field(default=None)
+    twitter_followes: Optional[int] = Field(default=None)
+    tiktok_followes: Optional[int] = Field(default=None)
+    youtube_followes: Optional[int] = Field(default=None)
+
+    class Config:
+        orm_mode = True
+
+
+class ReadDeep_Analytics_Snapshots(BaseModel):
+    brief_platform: uuid.UUID
+    resolution: ResolutionEnum
+    start: datetime.datetime
+    end: datetime.datetime
+    data: list[ReadDeep_Analytics_Snapshot]
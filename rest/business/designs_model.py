@@ -9,7 +9,7 @@ import enum
 from sqlalchemy import DATETIME, String, ForeignKey
 from sqlalchemy import String, ForeignKey, Enum, Column, Text
 from sqlalchemy.orm import relationship
-from core.base_model import BaseModel
+from core.base_model import BaseModel, page_index
 from core.manager import Manager
 from fastapi import HTTPException
 from sqlalchemy.dialects.postgresql import UUID
@@ -25,7 +25,12 @@ class TypeEnum(str, enum.Enum):
 
 class DesignModel(BaseModel):
     __tablename__ = 'designs'
-    __table_args__ = {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    __table_args__ = (
+        page_index('designs'),
+        page_index('designs', 'customer'),
+        page_index('designs', 'strategy_content'),
+        {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    )
 
 
     design_link = Column(Text, nullable=True, default=None)
@@ -42,11 +47,11 @@ class DesignModel(BaseModel):
 
 
     customer = Column(UUID(as_uuid=True), ForeignKey(os.environ.get('DEFAULT_SCHEMA', 'public') + ".customers.id"))
-    customer__details = relationship("CustomerModel", back_populates='designs', lazy='subquery')
+    customer__details = relationship("CustomerModel", back_populates='designs', lazy='noload')
 
 
     strategy_content = Column(UUID(as_uuid=True), ForeignKey(os.environ.get('DEFAULT_SCHEMA', 'public') + ".strategy_contents.id"))
-    strategy_content__details = relationship("Strategy_ContentModel", back_populates='designs', lazy='subquery')
+    strategy_content__details = relationship("Strategy_ContentModel", back_populates='designs', lazy='noload')
 
     @classmethod
     async def objects(cls, session):
@@ -92,4 +92,5 @@ class UpdateDesign(BaseModel):
 class ReadDesigns(BaseModel):
     data: list[Optional[ReadDesign]]
     next_page: Union[str, int]
+    next_cursor: Optional[str]
     page_size: int
\ No newline at end of file
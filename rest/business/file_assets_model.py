@@ -9,7 +9,8 @@ import enum
 from sqlalchemy import DATETIME, String, ForeignKey
 from sqlalchemy import String, ForeignKey, Column, DATE, Integer, BOOLEAN, Text
 from sqlalchemy.orm import relationship
-from core.base_model import BaseModel
+from sqlalchemy import text
+from core.base_model import BaseModel, page_index
 from core.manager import Manager
 from fastapi import HTTPException
 from sqlalchemy.dialects.postgresql import UUID
@@ -22,7 +23,13 @@ from sqlalchemy import select
 
 class File_AssetModel(BaseModel):
     __tablename__ = 'file_assets'
-    __table_args__ = {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    __table_args__ = (
+        page_index('file_assets'),
+        # customers and folders list their assets without the soft deleted ones, see their relationships
+        page_index('file_assets', 'customer', postgresql_where=text('deleted IS NOT TRUE')),
+        page_index('file_assets', 'folder', postgresql_where=text('deleted IS NOT TRUE')),
+        {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    )
 
 
     file_name = Column(Text, nullable=False, default=None)
@@ -41,11 +48,11 @@ class File_AssetModel(BaseModel):
 
 
     customer = Column(UUID(as_uuid=True), ForeignKey(os.environ.get('DEFAULT_SCHEMA', 'public') + ".customers.id"))
-    customer__details = relationship("CustomerModel", back_populates='file_assets', lazy='subquery')
+    customer__details = relationship("CustomerModel", back_populates='file_assets', lazy='noload')
 
 
     folder = Column(UUID(as_uuid=True), ForeignKey(os.environ.get('DEFAULT_SCHEMA', 'public') + ".folders.id"))
-    folder__details = relationship("FolderModel", back_populates='file_assets', lazy='subquery')
+    folder__details = relationship("FolderModel", back_populates='file_assets', lazy='noload')
 
     @classmethod
     async def objects(cls, session):
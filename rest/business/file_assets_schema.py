@@ -76,4 +76,5 @@ class UpdateFile_Asset(BaseModel):
 class ReadFile_Assets(BaseModel):
     data: list[Optional[ReadFile_Asset]]
     next_page: Union[str, int]
+    next_cursor: Optional[str]
     page_size: int
\ No newline at end of file
@@ -9,7 +9,8 @@ import enum
 from sqlalchemy import DATETIME, String, ForeignKey
 from sqlalchemy import BOOLEAN, String, ForeignKey, Column, Text
 from sqlalchemy.orm import relationship
-from core.base_model import BaseModel
+from sqlalchemy import text
+from core.base_model import BaseModel, page_index
 from core.manager import Manager
 from fastapi import HTTPException
 from sqlalchemy.dialects.postgresql import UUID
@@ -22,7 +23,12 @@ from sqlalchemy import select
 
 class FolderModel(BaseModel):
     __tablename__ = 'folders'
-    __table_args__ = {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    __table_args__ = (
+        page_index('folders'),
+        # customers list their folders without the soft deleted ones, see CustomerModel.folders
+        page_index('folders', 'customer', postgresql_where=text('deleted IS NOT TRUE')),
+        {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    )
 
 
     folder_name = Column(Text, nullable=False, default=None)
@@ -33,9 +39,12 @@ class FolderModel(BaseModel):
 
 
     customer = Column(UUID(as_uuid=True), ForeignKey(os.environ.get('DEFAULT_SCHEMA', 'public') + ".customers.id"))
-    customer__details = relationship("CustomerModel", back_populates='folders', lazy='subquery')
+    customer__details = relationship("CustomerModel", back_populates='folders', lazy='noload')
 
-    file_assets = relationship('File_AssetModel', back_populates='folder__details', lazy='subquery')
+    file_assets = relationship(
+        'File_AssetModel', back_populates='folder__details', lazy='noload',
+        primaryjoin='and_(FolderModel.id == File_AssetModel.folder, File_AssetModel.deleted.isnot(True))'
+    )
 
     @classmethod
     async def objects(cls, session):
@@ -56,4 +56,5 @@ class UpdateFolder(BaseModel):
 class ReadFolders(BaseModel):
     data: list[Optional[ReadFolder]]
     next_page: Union[str, int]
+    next_cursor: Optional[str]
     page_size: int
\ No newline at end of file
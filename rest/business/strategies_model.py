@@ -9,7 +9,7 @@ import enum
 from sqlalchemy import DATETIME, String, ForeignKey
 from sqlalchemy import String, ForeignKey, Column, Enum, JSON, Text
 from sqlalchemy.orm import relationship
-from core.base_model import BaseModel
+from core.base_model import BaseModel, page_index
 from core.manager import Manager
 from fastapi import HTTPException
 from sqlalchemy.dialects.postgresql import UUID
@@ -28,22 +28,26 @@ class AdsBudgetEnum(str, enum.Enum):
 
 class StrategyModel(BaseModel):
     __tablename__ = 'strategies'
-    __table_args__ = {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    __table_args__ = (
+        page_index('strategies'),
+        page_index('strategies', 'customer'),
+        {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    )
 
 
 
     customer = Column(UUID(as_uuid=True), ForeignKey(os.environ.get('DEFAULT_SCHEMA', 'public') + ".customers.id"))
-    customer__details = relationship("CustomerModel", back_populates='strategies', lazy='subquery')
+    customer__details = relationship("CustomerModel", back_populates='strategies', lazy='noload')
 
     name = Column(Text, nullable=True, default=None)
 
-    strategy_plans = relationship('Strategy_PlanModel', back_populates='strategy__details', lazy='subquery')
+    strategy_plans = relationship('Strategy_PlanModel', back_populates='strategy__details', lazy='noload')
 
-    strategy_personas = relationship('Strategy_PersonaModel', back_populates='strategy__details', lazy='subquery')
+    strategy_personas = relationship('Strategy_PersonaModel', back_populates='strategy__details', lazy='noload')
 
-    strategy_audiences = relationship('Strategy_AudienceModel', back_populates='strategy__details', lazy='subquery')
+    strategy_audiences = relationship('Strategy_AudienceModel', back_populates='strategy__details', lazy='noload')
 
-    strategy_objectives = relationship('Strategy_ObjectiveModel', back_populates='strategy__details', lazy='subquery')
+    strategy_objectives = relationship('Strategy_ObjectiveModel', back_populates='strategy__details', lazy='noload')
 
     ads_budget = Column(Enum(AdsBudgetEnum), nullable=True, default=None)
 
@@ -84,4 +84,5 @@ class UpdateStrategy(BaseModel):
 class ReadStrategies(BaseModel):
     data: list[Optional[ReadStrategy]]
     next_page: Union[str, int]
+    next_cursor: Optional[str]
     page_size: int
\ No newline at end of file
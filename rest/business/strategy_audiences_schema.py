@@ -149,4 +149,5 @@ class UpdateStrategy_Audience(BaseModel):
 class ReadStrategy_Audiences(BaseModel):
     data: list[Optional[ReadStrategy_Audience]]
     next_page: Union[str, int]
+    next_cursor: Optional[str]
     page_size: int
\ No newline at end of file
@@ -9,8 +9,9 @@ import enum
 from sqlalchemy import DATETIME, String, ForeignKey
 from sqlalchemy import String, ForeignKey, Column, DATE, Enum, BOOLEAN, Text
 from sqlalchemy.orm import relationship
-from core.base_model import BaseModel
+from core.base_model import BaseModel, page_index
 from core.manager import Manager
+from core.tasks import run_trigger
 from fastapi import HTTPException
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy import select
@@ -25,13 +26,14 @@ class CustomManager(Manager):
             new_data = kwargs.get("new_data", {})
             old_data = kwargs.get("old_data", {})
             well_known_urls = kwargs.get("well_known_urls", {})
-            new_data = await content_ready.handler(jwt=jwt, new_data=new_data, old_data=old_data, well_known_urls=well_known_urls, method="update")
+            outbox_id = kwargs.get("outbox_id")
+            new_data = await run_trigger(content_ready.handler, jwt=jwt, new_data=new_data, old_data=old_data, well_known_urls=well_known_urls, outbox_id=outbox_id, method="update")
             return new_data
         except Exception as err:
             log.warn("at least one step in post_update trigger has been skipped")
             log.debug(err)
             log.error("Error while executing post_update trigger, check the debug above!")
-            return new_data
+            raise
 
 
 
@@ -45,7 +47,12 @@ class RequestStatusEnum(str, enum.Enum):
 
 class Strategy_ContentModel(BaseModel):
     __tablename__ = 'strategy_contents'
-    __table_args__ = {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    __table_args__ = (
+        page_index('strategy_contents'),
+        page_index('strategy_contents', 'strategy_plan'),
+        page_index('strategy_contents', 'request_status'),
+        {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    )
 
 
     language = Column(Text, nullable=True, default=None)
@@ -76,11 +83,11 @@ class Strategy_ContentModel(BaseModel):
 
 
     strategy_plan = Column(UUID(as_uuid=True), ForeignKey(os.environ.get('DEFAULT_SCHEMA', 'public') + ".strategy_plans.id"))
-    strategy_plan__details = relationship("Strategy_PlanModel", back_populates='strategy_contents', lazy='subquery')
+    strategy_plan__details = relationship("Strategy_PlanModel", back_populates='strategy_contents', lazy='noload')
 
-    designs = relationship('DesignModel', back_populates='strategy_content__details', lazy='subquery')
+    designs = relationship('DesignModel', back_populates='strategy_content__details', lazy='noload')
 
-    content_comments = relationship('Content_CommentModel', back_populates='strategy_content__details', lazy='subquery')
+    content_comments = relationship('Content_CommentModel', back_populates='strategy_content__details', lazy='noload')
 
     @classmethod
     async def objects(cls, session):
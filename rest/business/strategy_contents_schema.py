@@ -107,4 +107,5 @@ class UpdateStrategy_Content(BaseModel):
 class ReadStrategy_Contents(BaseModel):
     data: list[Optional[ReadStrategy_Content]]
     next_page: Union[str, int]
+    next_cursor: Optional[str]
     page_size: int
\ No newline at end of file
@@ -9,7 +9,7 @@ import enum
 from sqlalchemy import DATETIME, String, ForeignKey
 from sqlalchemy import String, ForeignKey, Column, JSON, Enum
 from sqlalchemy.orm import relationship
-from core.base_model import BaseModel
+from core.base_model import BaseModel, page_index
 from core.manager import Manager
 from fastapi import HTTPException
 from sqlalchemy.dialects.postgresql import UUID
@@ -38,7 +38,11 @@ class PercentageEnum(str, enum.Enum):
 
 class Strategy_ObjectiveModel(BaseModel):
     __tablename__ = 'strategy_objectives'
-    __table_args__ = {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    __table_args__ = (
+        page_index('strategy_objectives'),
+        page_index('strategy_objectives', 'strategy'),
+        {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    )
 
 
     objectives = Column(Enum(ObjectivesEnum), nullable=True, default=None)
@@ -49,7 +53,7 @@ class Strategy_ObjectiveModel(BaseModel):
 
 
     strategy = Column(UUID(as_uuid=True), ForeignKey(os.environ.get('DEFAULT_SCHEMA', 'public') + ".strategies.id"))
-    strategy__details = relationship("StrategyModel", back_populates='strategy_objectives', lazy='subquery')
+    strategy__details = relationship("StrategyModel", back_populates='strategy_objectives', lazy='noload')
 
     @classmethod
     async def objects(cls, session):
@@ -103,4 +103,5 @@ class UpdateStrategy_Objective(BaseModel):
 class ReadStrategy_Objectives(BaseModel):
     data: list[Optional[ReadStrategy_Objective]]
     next_page: Union[str, int]
+    next_cursor: Optional[str]
     page_size: int
\ No newline at end of file
@@ -9,7 +9,7 @@ import enum
 from sqlalchemy import DATETIME, String, ForeignKey
 from sqlalchemy import ARRAY, String, ForeignKey, Column, Enum, Text
 from sqlalchemy.orm import relationship
-from core.base_model import BaseModel
+from core.base_model import BaseModel, page_index
 from core.manager import Manager
 from fastapi import HTTPException
 from sqlalchemy.dialects.postgresql import UUID
@@ -58,7 +58,11 @@ class SocialNetworkEnum(str, enum.Enum):
 
 class Strategy_PersonaModel(BaseModel):
     __tablename__ = 'strategy_personas'
-    __table_args__ = {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    __table_args__ = (
+        page_index('strategy_personas'),
+        page_index('strategy_personas', 'strategy'),
+        {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    )
 
 
     residence_location = Column(Text, nullable=False, default=None)
@@ -91,7 +95,7 @@ class Strategy_PersonaModel(BaseModel):
 
 
     strategy = Column(UUID(as_uuid=True), ForeignKey(os.environ.get('DEFAULT_SCHEMA', 'public') + ".strategies.id"))
-    strategy__details = relationship("StrategyModel", back_populates='strategy_personas', lazy='subquery')
+    strategy__details = relationship("StrategyModel", back_populates='strategy_personas', lazy='noload')
 
     @classmethod
     async def objects(cls, session):
@@ -204,4 +204,5 @@ class UpdateStrategy_Persona(BaseModel):
 class ReadStrategy_Personas(BaseModel):
     data: list[Optional[ReadStrategy_Persona]]
     next_page: Union[str, int]
+    next_cursor: Optional[str]
     page_size: int
\ No newline at end of file
@@ -9,7 +9,7 @@ import enum
 from sqlalchemy import DATETIME, String, ForeignKey
 from sqlalchemy import String, ForeignKey, Column, Enum, Integer, BOOLEAN, Text
 from sqlalchemy.orm import relationship
-from core.base_model import BaseModel
+from core.base_model import BaseModel, page_index
 from core.manager import Manager
 from fastapi import HTTPException
 from sqlalchemy.dialects.postgresql import UUID
@@ -43,7 +43,11 @@ class ContentTypeEnum(str, enum.Enum):
 
 class Strategy_PlanModel(BaseModel):
     __tablename__ = 'strategy_plans'
-    __table_args__ = {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    __table_args__ = (
+        page_index('strategy_plans'),
+        page_index('strategy_plans', 'strategy'),
+        {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    )
 
 
     platform = Column(Enum(PlatformEnum), nullable=False, default=None)
@@ -64,11 +68,11 @@ class Strategy_PlanModel(BaseModel):
 
 
     strategy = Column(UUID(as_uuid=True), ForeignKey(os.environ.get('DEFAULT_SCHEMA', 'public') + ".strategies.id"))
-    strategy__details = relationship("StrategyModel", back_populates='strategy_plans', lazy='subquery')
+    strategy__details = relationship("StrategyModel", back_populates='strategy_plans', lazy='noload')
 
-    strategy_contents = relationship('Strategy_ContentModel', back_populates='strategy_plan__details', lazy='subquery')
+    strategy_contents = relationship('Strategy_ContentModel', back_populates='strategy_plan__details', lazy='noload')
 
-    ads = relationship('AdModel', back_populates='strategy_plan__details', lazy='subquery')
+    ads = relationship('AdModel', back_populates='strategy_plan__details', lazy='noload')
 
     @classmethod
     async def objects(cls, session):
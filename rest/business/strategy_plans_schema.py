@@ -141,4 +141,5 @@ class UpdateStrategy_Plan(BaseModel):
 class ReadStrategy_Plans(BaseModel):
     data: list[Optional[ReadStrategy_Plan]]
     next_page: Union[str, int]
+    next_cursor: Optional[str]
     page_size: int
\ No newline at end of file
@@ -3,9 +3,24 @@ from datetime import datetime
 
 from business import Base
 from core.depends import current_user_uuid
-from sqlalchemy import Column, String, DateTime, func
+from sqlalchemy import Column, String, DateTime, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 
+# order of the pages returned by `Manager.all`, page indexes end with it
+PAGE_ORDER = ('created_on', 'id')
+
+
+def page_index(table: str, *columns: str, **kwargs) -> Index:
+    """
+    Return the index of `table` on `columns` followed by the page order, serving filters on
+    `columns` and the pages of their results. It is named ix_<table>_<columns>,
+    or ix_<table>_created_on_id without columns. Extra arguments are passed to `Index`,
+    e.g. postgresql_where for partial indexes.
+    """
+    name = '_'.join(columns or PAGE_ORDER)
+    return Index(f'ix_{table}_{name}', *columns, *PAGE_ORDER, **kwargs)
+
+
 class BaseModel(Base):
     """
     Default fileds for any table 
@@ -0,0 +1,313 @@
+import hashlib
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from core.depends import current_user_uuid, current_user_roles
+from core.http import http_clients
+from core.load_plan import embedded_relationships
+from core.logger import log
+from core.metrics import metrics
+from core.tasks import task_queue
+
+# tables whose records are cached by `Manager.read`, comma separated, '*' for every table, empty to disable the cache
+ENTITY_CACHE_MODELS = os.environ.get('ENTITY_CACHE_MODELS', 'briefs,strategies,customers')
+ENTITY_CACHE_SIZE = int(os.environ.get('ENTITY_CACHE_SIZE', 10000))
+ENTITY_CACHE_TTL = float(os.environ.get('ENTITY_CACHE_TTL', 60))  # seconds
+# seconds a worker keeps entries in process when a shared store is used, it bounds how long
+# a write made by another worker can be missed
+ENTITY_CACHE_LOCAL_TTL = float(os.environ.get('ENTITY_CACHE_LOCAL_TTL', 5))
+# user: entries are cached per user and roles, shared: by record only, when the database does not filter rows by user
+ENTITY_CACHE_SCOPE = os.environ.get('ENTITY_CACHE_SCOPE', 'user')
+if ENTITY_CACHE_SCOPE not in ('user', 'shared'):
+    raise ValueError(f"ENTITY_CACHE_SCOPE should be 'user' or 'shared', got <{ENTITY_CACHE_SCOPE}>")
+# name of the dapr state store shared by the workers, the cache is in process only when not set
+ENTITY_CACHE_STORE = os.environ.get('ENTITY_CACHE_STORE')
+DAPR_HTTP_PORT = os.environ.get('DAPR_HTTP_PORT', '3500')
+# key of the records written in the current transaction, kept in the session info
+CACHE_INVALIDATIONS_KEY = 'entity_cache_invalidations'
+
+
+class MemoryStore:
+    """
+    In-process LRU store with per-key expiry.
+
+    Cache entries are evicted least recently used first once `max_size` is reached. Versions are kept
+    apart and only expire, an evicted version would make entries read before a write look current.
+    """
+
+    def __init__(self, max_size: int = 10000) -> None:
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self._versions: dict[str, tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_many(self, keys: list) -> list:
+        """
+        Return the values of the given entry or version keys, None for missing or expired keys
+        """
+        now = time.monotonic()
+        values = []
+        with self._lock:
+            for key in keys:
+                store = self._versions if key.startswith('version:') else self._entries
+                item = store.get(key)
+                if item is None or item[0] <= now:
+                    values.append(None)
+                    continue
+                if store is self._entries:
+                    self._entries.move_to_end(key)
+                values.append(item[1])
+        return values
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                metrics.inc('entity_cache.evictions')
+
+    def set_versions(self, versions: dict, ttl: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if len(self._versions) > self.max_size:
+                self._versions = {key: item for key, item in self._versions.items() if item[0] > now}
+            for key, version in versions.items():
+                self._versions[key] = (now + ttl, version)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+
+class DaprStore:
+    """
+    Cache store shared by the workers, kept in a dapr state store through the sidecar HTTP API.
+    Any dapr state component works (redis, in-memory for local runs, ...).
+    """
+
+    def __init__(self, store: str) -> None:
+        self.url = f"http://localhost:{DAPR_HTTP_PORT}/v1.0/state/{store}"
+        self.client = http_clients.register('dapr')
+
+    async def get_many(self, keys: list) -> list:
+        response = await self.client.post(f'{self.url}/bulk', json={"keys": keys})
+        response.raise_for_status()
+        values = {item["key"]: item.get("data") for item in response.json()}
+        return [values.get(key) for key in keys]
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        await self.set_many({key: value}, ttl)
+
+    async def set_versions(self, versions: dict, ttl: float) -> None:
+        await self.set_many(versions, ttl)
+
+    async def set_many(self, values: dict, ttl: float) -> None:
+        response = await self.client.post(self.url, json=[
+            {"key": key, "value": value, "metadata": {"ttlInSeconds": str(int(ttl) + 1)}} for key, value in values.items()
+        ])
+        response.raise_for_status()
+
+
+@lru_cache(maxsize=None)
+def related_tables(model, schema) -> tuple:
+    """
+    Return the tables of the related records embedded by `schema` in `model` records, see `core.load_plan`
+    """
+    relationships = inspect(model).relationships
+    return tuple(sorted({relationships[name].mapper.class_.__tablename__ for name in embedded_relationships(model, schema)}))
+
+
+def canonical_id(obj_id) -> Optional[str]:
+    """
+    Return the canonical text of a record id, None if it is not a UUID
+    """
+    try:
+        return str(obj_id if isinstance(obj_id, uuid.UUID) else uuid.UUID(str(obj_id)))
+    except ValueError:
+        return None
+
+
+def scope_key(user: bool = True) -> str:
+    """
+    Return a digest of the current user's roles, and identity unless `user` is False, to key what they may see
+    """
+    scope = ','.join(sorted(current_user_roles()))
+    if user:
+        scope = f"{current_user_uuid()}:{scope}"
+    return hashlib.sha256(scope.encode()).hexdigest()[:32]
+
+
+class EntityCache:
+    """
+    Read-through cache of serialized records, in process with an optional store shared by the workers.
+
+    Entries are keyed by table, response schema, record id and (with the user scope) the user's identity
+    and roles. Each entry holds the versions of its record and of the tables of the related records it
+    embeds, read before the record is loaded; a committed write gives the written records and their
+    table a new version, so entries loaded before the write are never served after it. Entries expire
+    after ENTITY_CACHE_TTL seconds, or ENTITY_CACHE_LOCAL_TTL in process when a shared store is used.
+    """
+
+    def __init__(
+        self,
+        local: MemoryStore,
+        shared: Optional[DaprStore] = None,
+        tables: str = ENTITY_CACHE_MODELS,
+        ttl: float = ENTITY_CACHE_TTL,
+        local_ttl: float = ENTITY_CACHE_LOCAL_TTL,
+        scope: str = ENTITY_CACHE_SCOPE
+    ) -> None:
+        self.local = local
+        self.shared = shared
+        self.tables = {table.strip() for table in tables.split(',') if table.strip()}
+        self.ttl = ttl
+        self.local_ttl = min(ttl, local_ttl) if shared else ttl
+        self.scope = scope
+        # lookups served from process, from the shared store, loaded, and total age in seconds of the served entries
+        self.stats = {"hits": 0, "shared_hits": 0, "misses": 0, "served_age": 0.0}
+        metrics.gauge('entity_cache.size', lambda: len(self.local))
+        metrics.gauge('entity_cache.hit_ratio', self.hit_ratio)
+        metrics.gauge('entity_cache.hit_age_seconds', self.hit_age)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.tables)
+
+    def caches(self, model) -> bool:
+        return '*' in self.tables or model.__tablename__ in self.tables
+
+    def hit_ratio(self) -> Optional[float]:
+        hits = self.stats["hits"] + self.stats["shared_hits"]
+        total = hits + self.stats["misses"]
+        return hits / total if total else None
+
+    def hit_age(self) -> Optional[float]:
+        """
+        Mean age in seconds of the entries served, how old served records can be when another worker wrote them
+        """
+        hits = self.stats["hits"] + self.stats["shared_hits"]
+        return self.stats["served_age"] / hits if hits else None
+
+    def _scope_key(self) -> str:
+        return '*' if self.scope == 'shared' else scope_key()
+
+    def _keys(self, model, schema, obj_id: str) -> list:
+        """
+        Return the key of the entry followed by the keys of the versions it depends on
+        """
+        table = model.__tablename__
+        return [
+            f"entity:{table}:{schema.__name__}:{obj_id}:{self._scope_key()}",
+            f"version:{table}:{obj_id}",
+            *[f"version:{related}" for related in related_tables(model, schema)]
+        ]
+
+    def _count(self, name: str) -> None:
+        self.stats[name] += 1
+        metrics.inc(f'entity_cache.{name}')
+
+    def _served(self, entry: dict, name: str) -> Any:
+        self._count(name)
+        self.stats["served_age"] += max(time.time() - entry["cached_on"], 0)
+        return entry["payload"]
+
+    async def get_or_load(self, model, schema, obj_id, load: Callable[[], Awaitable[Optional[dict]]]) -> Optional[dict]:
+        """
+        Return the cached payload of a record or load it with `load` and cache it, missing records are not cached
+        """
+        obj_id = canonical_id(obj_id)
+        if obj_id is None:
+            return await load()
+        keys = self._keys(model, schema, obj_id)
+
+        entry, *local_versions = self.local.get_many(keys)
+        if entry is not None and entry["versions"] == local_versions:
+            return self._served(entry, 'hits')
+
+        shared_versions = None
+        if self.shared:
+            try:
+                entry, *shared_versions = await self.shared.get_many(keys)
+                if entry is not None and entry["versions"] == shared_versions:
+                    self.local.set(keys[0], {**entry, "versions": local_versions}, self.local_ttl)
+                    return self._served(entry, 'shared_hits')
+            except Exception as e:
+                log.debug(e)
+                metrics.inc('entity_cache.errors')
+                shared_versions = None
+
+        self._count('misses')
+        payload = await load()
+        if payload is None:
+            return None
+        cached_on = time.time()
+        self.local.set(keys[0], {"payload": payload, "versions": local_versions, "cached_on": cached_on}, self.local_ttl)
+        if shared_versions is not None:
+            try:
+                await self.shared.set(keys[0], {"payload": payload, "versions": shared_versions, "cached_on": cached_on}, self.ttl)
+            except Exception as e:
+                log.debug(e)
+                metrics.inc('entity_cache.errors')
+        return payload
+
+    def invalidate(self, session: AsyncSession, model, obj_ids) -> None:
+        """
+        Record the records of `model` written in the current transaction of the session,
+        their entries are invalidated once it commits
+        """
+        if not self.enabled:
+            return
+        session.sync_session.info.setdefault(CACHE_INVALIDATIONS_KEY, []).append(
+            (model.__tablename__, [canonical_id(obj_id) for obj_id in obj_ids])
+        )
+
+    def _versions(self, written: list) -> dict:
+        versions = {}
+        for table, obj_ids in written:
+            version = uuid.uuid4().hex
+            versions[f"version:{table}"] = version
+            versions.update({f"version:{table}:{obj_id}": version for obj_id in obj_ids if obj_id is not None})
+        return versions
+
+    def committed(self, written: list) -> None:
+        """
+        Give new versions to the records and tables written by a committed transaction
+        """
+        versions = self._versions(written)
+        self.local.set_versions(versions, self.ttl)
+        metrics.inc('entity_cache.invalidations', len(versions))
+        if self.shared and not task_queue.submit(self.shared.set_versions, versions, self.ttl):
+            metrics.inc('entity_cache.errors')
+            log.warning("can not queue the invalidation of shared cache entries, they expire on their own")
+
+    def clear(self) -> None:
+        self.local.clear()
+
+
+entity_cache = EntityCache(MemoryStore(ENTITY_CACHE_SIZE), DaprStore(ENTITY_CACHE_STORE) if ENTITY_CACHE_STORE else None)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_committed(session: Session) -> None:
+    written = session.info.pop(CACHE_INVALIDATIONS_KEY, [])
+    if written:
+        entity_cache.committed(written)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_rolled_back(session: Session) -> None:
+    session.info.pop(CACHE_INVALIDATIONS_KEY, None)
@@ -3,13 +3,20 @@ import uuid
 from contextvars import ContextVar
 from typing import Optional, List, Union, Any
 
-import requests as prequest
+import httpx
+import jwt
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPBearer
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from business import db_async_session, db_sync_session
 from core.logger import log
+from core.http import zeauth_client
+from core.jwks import JWKSCache
+from core.token_cache import TokenCache
 
 auth_schema = HTTPBearer()
 
@@ -17,19 +24,64 @@ zeauth_url = os.environ.get('ZEAUTH_URI')
 if zeauth_url is None:
     raise ValueError("ZEAUTH_URI environment variable is not set. Please set it before running the application.")
 
+# remote: every token is verified by ZeAuth, local: tokens are verified against ZeAuth signing keys
+ZEAUTH_VERIFY_MODE = os.environ.get('ZEAUTH_VERIFY_MODE', 'remote')
+ZEAUTH_JWKS_URI = os.environ.get('ZEAUTH_JWKS_URI', f'{zeauth_url}/.well-known/jwks.json')
+ZEAUTH_JWKS_TTL = float(os.environ.get('ZEAUTH_JWKS_TTL', 3600))  # seconds
+ZEAUTH_JWT_ALGORITHMS = os.environ.get('ZEAUTH_JWT_ALGORITHMS', 'RS256,ES256').split(',')
+ZEAUTH_JWT_AUDIENCE = os.environ.get('ZEAUTH_JWT_AUDIENCE')
+# tokens carrying this claim with a truthy value are always verified by ZeAuth, so revocation is honoured
+ZEAUTH_REVOCATION_CLAIM = os.environ.get('ZEAUTH_REVOCATION_CLAIM', 'rvk')
+if ZEAUTH_VERIFY_MODE not in ('remote', 'local'):
+    raise ValueError("ZEAUTH_VERIFY_MODE environment variable should be one of <remote, local>.")
+TOKEN_CACHE_TTL = float(os.environ.get('TOKEN_CACHE_TTL', 60))  # seconds
+TOKEN_CACHE_SIZE = int(os.environ.get('TOKEN_CACHE_SIZE', 10000))
+
+token_cache = TokenCache(max_size=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL)
+
 user_session: ContextVar[str] = ContextVar('user_session', default=None)
 user_roles: ContextVar[list] = ContextVar('user_roles', default=[])
 
+# apply both session variables in one round trip, values are bound parameters
+SET_SESSION_VARS = text("SELECT set_config('zekoder.id', :id, false), set_config('zekoder.roles', :roles, false)")
+# key of the (id, roles) pair last applied to a pooled connection, kept in the connection record info
+SESSION_VARS_KEY = 'zekoder_session_vars'
+
+
+@event.listens_for(Engine, 'rollback')
+def _forget_session_vars(conn: Connection) -> None:
+    """
+    Session variables set in a rolled back transaction are reverted, so they have to be applied again
+    """
+    conn.info.pop(SESSION_VARS_KEY, None)
+
+
+def apply_session_vars(connection: Connection) -> None:
+    """
+    Set zekoder.id and zekoder.roles of the current user on the connection,
+    skipped when the pooled connection already carries the same values
+    """
+    session_vars = (str(current_user_uuid()), ','.join(current_user_roles()))
+    if connection.info.get(SESSION_VARS_KEY) == session_vars:
+        return
+    connection.execute(SET_SESSION_VARS, {"id": session_vars[0], "roles": session_vars[1]})
+    connection.info[SESSION_VARS_KEY] = session_vars
+
+
+async def set_session_vars(db: AsyncSession) -> None:
+    """
+    Apply the current user session variables to the connection of the async session, see `apply_session_vars`
+    """
+    await db.run_sync(lambda session: apply_session_vars(session.connection()))
+
+
 async def get_async_db():
     """
-    Return async engine to interact with datbase
+    Return async engine to interact with datbase, session variables are applied by `Protect.auth`
+    once the current user is authenticated
     """
     async with db_async_session() as db:
         try:
-            # set session variables
-            await db.execute(f"SET zekoder.id = '{current_user_uuid()}'")
-            await db.execute(f"SET zekoder.roles = '{','.join(current_user_roles())}'")
-
             yield db
         finally:
             await db.close()
@@ -41,63 +93,140 @@ def get_sync_db():
     db = db_sync_session()
     try:
         # set session variables
-        db.execute(f"SET zekoder.id = '{current_user_uuid()}'")
-        db.execute(f"SET zekoder.roles = '{','.join(current_user_roles())}'")
+        apply_session_vars(db.connection())
         yield db
     finally:
         db.close()
 
 
+async def fetch_jwks() -> dict:
+    """
+    Fetch the JWK set ZeAuth signs tokens with
+    """
+    response = await zeauth_client.get(ZEAUTH_JWKS_URI)
+    response.raise_for_status()
+    return response.json()
+
+
+jwks_cache = JWKSCache(fetch=fetch_jwks, ttl=ZEAUTH_JWKS_TTL)
+
+
+async def verify_token_remotely(token: str) -> dict:
+    """
+    Verify the token against ZeAuth and return the current user payload
+
+    Raises:
+    - HTTPException: Raises HTTPException with a 403 status code if ZeAuth rejects the token.
+    """
+    try:
+        response = await zeauth_client.post(f"{zeauth_url}/verify", params={"token": token})
+    except httpx.HTTPError as e:
+        log.debug(e)
+        log.error("Can not connect to ZeAuth verify endpoint, check the debug above!")
+        raise HTTPException(403, "invalid token")
+    if response.status_code != 200:
+        raise HTTPException(403, "invalid token")
+    return response.json()
+
+
+async def verify_token_locally(token: str) -> dict:
+    """
+    Verify the token signature and expiry against the cached ZeAuth signing keys and return the current user
+    payload from its claims. Tokens signed with an unknown key id or opting into revocation checks are
+    verified by ZeAuth instead.
+
+    Raises:
+    - HTTPException: Raises HTTPException with a 403 status code if the token is invalid or expired.
+    """
+    try:
+        header = jwt.get_unverified_header(token)
+    except jwt.InvalidTokenError as e:
+        log.debug(e)
+        raise HTTPException(403, "invalid token")
+
+    key = await jwks_cache.get_key(header.get('kid'))
+    if key is None:
+        log.debug(f"unknown signing key <{header.get('kid')}>, verifying token remotely")
+        return await verify_token_remotely(token)
+
+    try:
+        claims = jwt.decode(
+            token,
+            key.key,
+            algorithms=ZEAUTH_JWT_ALGORITHMS,
+            audience=ZEAUTH_JWT_AUDIENCE,
+            options={"verify_aud": ZEAUTH_JWT_AUDIENCE is not None}
+        )
+    except jwt.InvalidTokenError as e:
+        log.debug(e)
+        raise HTTPException(403, "invalid token")
+
+    if claims.get(ZEAUTH_REVOCATION_CLAIM):
+        return await verify_token_remotely(token)
+    return {**claims, "id": claims.get("id", claims.get("sub")), "roles": claims.get("roles", [])}
+
+
+async def verify_token(token: str) -> dict:
+    """
+    Verify the token with the configured ZEAUTH_VERIFY_MODE and return the current user payload
+    """
+    if ZEAUTH_VERIFY_MODE == 'local':
+        return await verify_token_locally(token)
+    return await verify_token_remotely(token)
+
+
 class CommonDependencies:
-    def __init__(self, page: Optional[str] = 1, size: Optional[int] = 20):
+    def __init__(self, page: Optional[str] = 1, size: Optional[int] = 20, cursor: Optional[str] = None):
         self.page = page
         self.size = size
         self.offset = (int(page)-1) * int(size)
+        self.cursor = cursor
 
 
 class Protect:
-    def __init__(self, token: str = Depends(auth_schema), db: Session = Depends(get_sync_db)) -> None:
+    def __init__(self, token: str = Depends(auth_schema), db: AsyncSession = Depends(get_async_db)) -> None:
         self.credentials = token.credentials
+        # the database session of the request, FastAPI gives the route the same one
         self.db = db
 
-    def auth(self, method_required_roles: List[str])-> Union[None, dict]:
+    async def auth(self, method_required_roles: List[str])-> Union[None, dict]:
         """
         Authenticates the user based on the provided token and checks if the user has the required roles.
+        Verification results are cached per token, see `token_cache`. The session variables of the user are
+        applied to the database session of the request, so every query of the route runs with them.
 
         Parameters:
         - method_required_roles (List[str]): A list of roles required to perform the action.
 
         Returns:
-        - Union[None, dict]: The response from the authentication request.
+        - Union[None, dict]: The current user payload returned by ZeAuth.
 
         Raises:
         - HTTPException: Raises HTTPException with a 403 status code and an error message if authentication fails
                         or if the user is not authorized.
         """
-        response = prequest.request("POST", f"{zeauth_url}/verify?token={self.credentials}", data={})
-        if response.status_code != 200:
-            raise HTTPException(403, "invalid token")
-        
-        request_roles = response.json().get('roles', [])
+        current_user = await token_cache.get_or_verify(self.credentials, verify_token)
+
+        request_roles = current_user.get('roles', [])
         if not any(role in request_roles for role in method_required_roles):
             raise HTTPException(403, "User not authorized to perform this action")
         
-        self.set_current_user_uuid_in_contextvar(response=response)
-        return response
+        self.set_current_user_uuid_in_contextvar(current_user=current_user)
+        await set_session_vars(self.db)
+        return current_user
 
-    def set_current_user_uuid_in_contextvar(self, response: Any) -> None:
+    def set_current_user_uuid_in_contextvar(self, current_user: Any) -> None:
         """
-        Extracts the current user information from the authentication response and sets it in context variables.
+        Extracts the current user information from the authentication payload and sets it in context variables.
 
         Parameters:
-        - response (Any): The response from the authentication request.
+        - current_user (Any): The current user payload returned by ZeAuth.
 
         Raises:
         - HTTPException: Raises HTTPException with a 403 status code and an error message if the user information
                          cannot be extracted or if there's an issue setting context variables.
         """
         try:
-            current_user = response.json()
             log.debug(f"current user: {current_user}")
             current_user_id = current_user.get("id")
             current_user_roles_ = current_user.get("roles", [])
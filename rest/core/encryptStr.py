@@ -1,13 +1,24 @@
+import asyncio
 from typing import Dict, Any
+from fastapi import HTTPException
 from pydantic.utils import update_not_none
 from core.logger import log
-import requests
+from core.http import encrypt_client
 import os
 
 ZEAUTH_ENCRYPT_URI = os.environ.get('ZEAUTH_ENCRYPT_URI', 'https://zeauth.zekoder.zestudio.zekoder.zekoder.net/encrypt_str')
+# optional endpoint encrypting a list of strings in one call: POST {"strs_for_enc": [...]} -> {"encrypt_decrypt_strs": [...]}
+ZEAUTH_ENCRYPT_BATCH_URI = os.environ.get('ZEAUTH_ENCRYPT_BATCH_URI')
 
 
-class EncryptStr:
+class EncryptStr(str):
+    """
+    A string stored encrypted by ZeAuth.
+
+    Validation only marks the value, the marked values of a request are encrypted together by `encrypt_values`
+    when the manager writes them.
+    """
+
     @classmethod
     def __modify_schema__(cls, field_schema: Dict[str, Any]) -> None:
         update_not_none(
@@ -19,20 +30,51 @@ class EncryptStr:
     def __get_validators__(cls):
         yield cls.validate
 
-    @classmethod
-    def encryptStr(cls, value):
-        try:
-            params = {
-                'str_for_enc': f'{value}',
-            }
-            response = requests.post(f'{ZEAUTH_ENCRYPT_URI}', params=params)
-            result = response.json()
-            return result['encrypt_decrypt_str']
-        except Exception as e:
-            log.debug(e)
-            log.error("Can not connect to encryption endpoint or something went wrong")
-            exit(1)
-
     @classmethod
     def validate(cls, value: Any):
-        return cls.encryptStr(value)
+        return value if isinstance(value, cls) else cls(f'{value}')
+
+
+async def encrypt_str(value: str) -> str:
+    response = await encrypt_client.post(f'{ZEAUTH_ENCRYPT_URI}', params={'str_for_enc': value})
+    response.raise_for_status()
+    return response.json()['encrypt_decrypt_str']
+
+
+async def encrypt_strs(values: list) -> list:
+    """
+    Encrypt the given strings, with a single call when ZEAUTH_ENCRYPT_BATCH_URI is set,
+    else with concurrent calls bounded by the encrypt client
+    """
+    if ZEAUTH_ENCRYPT_BATCH_URI:
+        response = await encrypt_client.post(f'{ZEAUTH_ENCRYPT_BATCH_URI}', json={'strs_for_enc': values})
+        response.raise_for_status()
+        encrypted = response.json()['encrypt_decrypt_strs']
+        if len(encrypted) != len(values):
+            raise ValueError(f"encryption endpoint returned {len(encrypted)} values for {len(values)}")
+        return encrypted
+    return await asyncio.gather(*(encrypt_str(value) for value in values))
+
+
+async def encrypt_values(*records: dict) -> None:
+    """
+    Encrypt in place the EncryptStr values of the given records, each distinct value is encrypted once
+
+    Raises:
+    - HTTPException: Raises HTTPException with a 502 status code if the values can not be encrypted.
+    """
+    pending = [(record, key) for record in records for key, value in record.items() if isinstance(value, EncryptStr)]
+    if not pending:
+        return
+    values = list(dict.fromkeys(str(record[key]) for record, key in pending))
+    try:
+        encrypted = dict(zip(values, await encrypt_strs(values)))
+    except Exception as e:
+        log.debug(e)
+        log.error("Can not connect to encryption endpoint or something went wrong, check the debug above!")
+        raise HTTPException(status_code=502, detail={
+            "field_name": pending[0][1],
+            "message": f"{pending[0][1]} can not be encrypted"
+        })
+    for record, key in pending:
+        record[key] = encrypted[str(record[key])]
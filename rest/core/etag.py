@@ -0,0 +1,111 @@
+import hashlib
+import json
+import os
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from core.cache import MemoryStore, scope_key
+from core.metrics import metrics
+
+# answer list, get and query requests with an ETag, and with 304 Not Modified when the client has it
+RESPONSE_ETAGS = os.environ.get('RESPONSE_ETAGS', 'true').lower() == 'true'
+# number of response bodies kept by ETag in process, 0 disables the cache
+RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE', 0))
+RESPONSE_CACHE_TTL = float(os.environ.get('RESPONSE_CACHE_TTL', 60))  # seconds
+# user: ETags and cached bodies are per user and roles, roles: per roles, when the database does not filter rows by user
+RESPONSE_CACHE_SCOPE = os.environ.get('RESPONSE_CACHE_SCOPE', 'user')
+if RESPONSE_CACHE_SCOPE not in ('user', 'roles'):
+    raise ValueError(f"RESPONSE_CACHE_SCOPE should be 'user' or 'roles', got <{RESPONSE_CACHE_SCOPE}>")
+
+response_cache = MemoryStore(RESPONSE_CACHE_SIZE) if RESPONSE_CACHE_SIZE else None
+if response_cache is not None:
+    metrics.gauge('response_cache.size', lambda: len(response_cache))
+
+
+def wants_etag(request: Request) -> bool:
+    """
+    Return True if the ETag of a request should be computed before its response: the client may have
+    the response or it may be cached
+    """
+    return RESPONSE_ETAGS and ('if-none-match' in request.headers or response_cache is not None)
+
+
+def compute_etag(request: Request, *versions) -> str:
+    """
+    Return the weak ETag of the response of a request from the versions of the data it returns: the
+    (relationship, id, updated_on) of its records, watermarks or cursors
+    """
+    versions = [
+        sorted(json.dumps(item) for item in version) if isinstance(version, list) else version
+        for version in jsonable_encoder(versions)
+    ]
+    digest = hashlib.sha256(json.dumps([
+        scope_key(RESPONSE_CACHE_SCOPE == 'user'),
+        request.method,
+        request.url.path,
+        sorted(request.query_params.multi_items()),
+        versions
+    ], default=str).encode()).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+
+def payload_versions(payload: dict, relationships: tuple) -> list:
+    """
+    Return the versions of a serialized record and of the related records it embeds, as `Manager.record_versions`
+    """
+    versions = [('', payload.get('id'), payload.get('updated_on'))]
+    for name in relationships:
+        related = payload.get(name)
+        for item in related if isinstance(related, list) else [related]:
+            if isinstance(item, dict) and item.get('id') is not None:
+                versions.append((name, item['id'], item.get('updated_on')))
+    return versions
+
+
+def not_modified(request: Request, etag: str) -> bool:
+    """
+    Return True if the If-None-Match header of the request holds the given ETag (weak comparison)
+    """
+    header = request.headers.get('if-none-match')
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    return etag.removeprefix('W/') in {tag.strip().removeprefix('W/') for tag in header.split(',')}
+
+
+def etag_headers(etag: Optional[str]) -> dict:
+    # responses depend on the caller's token, shared caches must not store them
+    return {"ETag": etag, "Cache-Control": "private, no-cache"} if etag else {}
+
+
+async def respond(
+    request: Request,
+    etag: Optional[str],
+    render: Callable[[], Awaitable[tuple[Any, Optional[str]]]]
+) -> Response:
+    """
+    Answer a read request: with 304 Not Modified when the client has `etag`, with the cached body of `etag`
+    when there is one, else with the content returned by `render` with its ETag. `render` returns the
+    jsonable content and, when it can be derived from the content, its ETag which is used instead of `etag`.
+    """
+    if etag is not None:
+        if not_modified(request, etag):
+            metrics.inc('response_cache.not_modified')
+            return Response(status_code=304, headers=etag_headers(etag))
+        if response_cache is not None:
+            body = response_cache.get_many([etag])[0]
+            if body is not None:
+                metrics.inc('response_cache.hits')
+                return Response(body, media_type='application/json', headers=etag_headers(etag))
+            metrics.inc('response_cache.misses')
+
+    content, content_etag = await render()
+    etag = (content_etag or etag) if RESPONSE_ETAGS else None
+    response = JSONResponse(content, headers=etag_headers(etag))
+    if etag is not None and response_cache is not None:
+        response_cache.set(etag, response.body, RESPONSE_CACHE_TTL)
+    return response
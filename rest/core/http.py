@@ -0,0 +1,205 @@
+import asyncio
+import importlib.util
+import os
+import threading
+import time
+from typing import Optional
+
+import httpx
+
+from core.logger import log
+from core.metrics import metrics
+
+# HTTP/2 is negotiated when the optional h2 package is installed (httpx[http2])
+HTTP2 = importlib.util.find_spec('h2') is not None
+
+
+class CircuitOpenError(httpx.TransportError):
+    """
+    Raised instead of calling an upstream whose circuit breaker is open
+    """
+
+
+class CircuitBreaker:
+    """
+    Stop calling an upstream after `failure_threshold` consecutive failures.
+
+    While open every call fails fast; after `reset_timeout` seconds a single trial call is let through
+    (half open), its success closes the circuit and its failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._trial = False
+
+
+class ServiceClient:
+    """
+    Outbound HTTP client of one upstream service: a keep-alive connection pool (HTTP/2 when available),
+    a bound on concurrent requests, default timeouts and a circuit breaker.
+
+    Transport errors, 5xx responses and calls that are cancelled or raise count as failures of the upstream. The pools are created on first use,
+    or when the application starts, and closed when it stops.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        timeout: float = 10,
+        max_connections: int = 100,
+        max_concurrency: int = 100,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30
+    ) -> None:
+        self.name = name
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        metrics.gauge(f'http.{name}.circuit_open', lambda: int(self.breaker.state == 'open'))
+
+    def _client_args(self) -> dict:
+        return {
+            "timeout": self.timeout,
+            "limits": httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+            "http2": HTTP2
+        }
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(**self._client_args())
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    def _check_circuit(self, method: str, url: str) -> None:
+        if not self.breaker.allow():
+            metrics.inc(f'http.{self.name}.short_circuited')
+            raise CircuitOpenError(f"circuit of <{self.name}> is open, not calling {method} {url}")
+
+    def _record(self, response: Optional[httpx.Response]) -> None:
+        metrics.inc(f'http.{self.name}.requests')
+        if response is None or response.status_code >= 500:
+            metrics.inc(f'http.{self.name}.failures')
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        self._check_circuit(method, url)
+        client = self.client
+        # every allowed call records its outcome, a half open trial that is cancelled or raises
+        # anything must not keep the circuit waiting for its result
+        response = None
+        try:
+            async with self._semaphore:
+                response = await client.request(method, url, **kwargs)
+        finally:
+            self._record(response)
+        return response
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request('POST', url, **kwargs)
+
+    async def put(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request('PUT', url, **kwargs)
+
+    async def delete(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request('DELETE', url, **kwargs)
+
+    def start(self) -> None:
+        self.client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class HTTPClients:
+    """
+    Registry of the outbound clients, one per upstream service.
+
+    The settings of an upstream are read from the environment, prefixed with its upper-cased name:
+    <NAME>_TIMEOUT, <NAME>_MAX_CONNECTIONS, <NAME>_MAX_CONCURRENCY, <NAME>_BREAKER_THRESHOLD
+    and <NAME>_BREAKER_RESET (seconds).
+    """
+
+    def __init__(self) -> None:
+        self._clients: dict[str, ServiceClient] = {}
+
+    def register(self, name: str) -> ServiceClient:
+        prefix = name.upper()
+        self._clients[name] = ServiceClient(
+            name,
+            timeout=float(os.environ.get(f'{prefix}_TIMEOUT', 10)),
+            max_connections=int(os.environ.get(f'{prefix}_MAX_CONNECTIONS', 100)),
+            max_concurrency=int(os.environ.get(f'{prefix}_MAX_CONCURRENCY', 100)),
+            failure_threshold=int(os.environ.get(f'{prefix}_BREAKER_THRESHOLD', 5)),
+            reset_timeout=float(os.environ.get(f'{prefix}_BREAKER_RESET', 30))
+        )
+        return self._clients[name]
+
+    def get(self, name: str) -> ServiceClient:
+        return self._clients[name]
+
+    async def start(self) -> None:
+        """
+        Create the connection pools, called on application startup
+        """
+        for client in self._clients.values():
+            client.start()
+        log.debug(f"outbound http clients ready, http2: {HTTP2}")
+
+    async def close(self) -> None:
+        """
+        Close the connection pools, called on application shutdown
+        """
+        for client in self._clients.values():
+            await client.close()
+
+
+http_clients = HTTPClients()
+zeauth_client = http_clients.register('zeauth')
+zenotify_client = http_clients.register('zenotify')
+encrypt_client = http_clients.register('encrypt')
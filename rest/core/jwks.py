@@ -0,0 +1,76 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional
+
+import jwt
+
+from core.logger import log
+
+
+class JWKSCache:
+    """
+    Cache of the token signing keys published by ZeAuth as a JWK set.
+
+    Keys are fetched once and kept by their `kid`. The whole set is re-fetched after `ttl` seconds
+    or when a token references an unknown `kid` (key rotation), but never more often than
+    `min_refresh_interval` seconds so garbage key ids can not be used to hammer ZeAuth.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], Awaitable[dict]],
+        ttl: float = 3600,
+        min_refresh_interval: float = 30
+    ) -> None:
+        self.fetch = fetch
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self._keys: dict[str, jwt.PyJWK] = {}
+        self._fetched_at: float = 0
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_stale(self) -> bool:
+        return time.time() - self._fetched_at >= self.ttl
+
+    def load(self, jwks: dict) -> None:
+        """
+        Replace the cached keys with the keys of the given JWK set, keys that can not be used are skipped
+        """
+        keys = {}
+        for jwk in jwks.get('keys', []):
+            try:
+                key = jwt.PyJWK(jwk)
+            except jwt.PyJWKError as e:
+                log.debug(e)
+                log.warning(f"skipping unusable signing key <{jwk.get('kid')}>")
+                continue
+            keys[key.key_id] = key
+        self._keys = keys
+        self._fetched_at = time.time()
+
+    async def refresh(self, force: bool = False) -> None:
+        """
+        Re-fetch the JWK set if it is stale, or if `force` is set and the last fetch is old enough
+        """
+        async with self._lock:
+            since_last_fetch = time.time() - self._fetched_at
+            if not self.is_stale and not (force and since_last_fetch >= self.min_refresh_interval):
+                return
+            try:
+                self.load(await self.fetch())
+            except Exception as e:
+                log.debug(e)
+                log.error("Can not fetch ZeAuth signing keys, check the debug above!")
+                # keep serving the previous keys, retry after the minimal interval
+                self._fetched_at = time.time() - self.ttl + self.min_refresh_interval
+
+    async def get_key(self, kid: Optional[str]) -> Optional[jwt.PyJWK]:
+        """
+        Return the signing key with the given id, None if ZeAuth does not publish it
+        """
+        if self.is_stale:
+            await self.refresh()
+        if kid not in self._keys:
+            await self.refresh(force=True)
+        return self._keys.get(kid)
@@ -0,0 +1,32 @@
+from functools import lru_cache
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+
+
+@lru_cache(maxsize=None)
+def embedded_relationships(model, schema) -> tuple:
+    """
+    Return the names of the relationships of `model` exposed by the given response schema
+    """
+    relationships = inspect(model).relationships
+    return tuple(field_name for field_name in schema.__fields__ if field_name in relationships)
+
+
+@lru_cache(maxsize=None)
+def load_plan(model, schema) -> tuple:
+    """
+    Return the loader options needed to serialize `model` records with the given response schema.
+
+    Relationships are declared with lazy='noload', so only the relationships the schema exposes are
+    loaded: collections with one SELECT ... IN query each, many-to-one relations joined into the main
+    query. Loaded related records do not load their own relationships, and any other relationship of
+    `model` raises on access instead of silently emitting a query.
+    """
+    relationships = inspect(model).relationships
+    options = []
+    for field_name in embedded_relationships(model, schema):
+        attribute = getattr(model, field_name)
+        options.append(selectinload(attribute) if relationships[field_name].uselist else joinedload(attribute))
+    options.append(raiseload('*'))
+    return tuple(options)
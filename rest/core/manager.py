@@ -1,8 +1,40 @@
 import json
+import os
+import uuid
+from typing import Optional
 from core.logger import log
 from sqlalchemy.ext.asyncio import AsyncSession 
-from sqlalchemy import select, delete, update, insert
-from core.depends import current_user_roles, current_user_uuid, get_async_db
+from sqlalchemy import select, delete, update, insert, tuple_, func, literal, literal_column, union_all, cast, String, Boolean
+from sqlalchemy.dialects import postgresql
+from fastapi.encoders import jsonable_encoder
+from core.depends import current_user_roles, current_user_uuid, get_async_db, set_session_vars
+from core.pagination import encode_cursor, decode_cursor
+from core.load_plan import load_plan, embedded_relationships
+from core.encryptStr import encrypt_values
+from core import outbox
+from core.cache import entity_cache
+
+# maximum number of rows written by one multi-row statement
+BULK_CHUNK_SIZE = int(os.environ.get('BULK_CHUNK_SIZE', 500))
+# columns an upsert never overwrites on an existing record
+UPSERT_PRESERVED_COLUMNS = ('id', 'created_by', 'created_on')
+# returned by an upsert for each record: true when it was inserted, false when an existing record was updated
+UPSERT_INSERTED = literal_column('xmax = 0', Boolean).label('inserted')
+# whether the server of each database is CockroachDB, keyed by url, see `is_cockroach`
+_cockroach_servers = {}
+
+
+async def is_cockroach(db: AsyncSession) -> bool:
+    """
+    Return True if the session is connected to CockroachDB, which has no xmax system column
+    """
+    connection = await db.connection()
+    url = str(connection.engine.url)
+    if url not in _cockroach_servers:
+        version = (await connection.exec_driver_sql('SELECT version()')).scalar()
+        _cockroach_servers[url] = 'cockroachdb' in version.lower()
+    return _cockroach_servers[url]
+
 
 class Manager:
     """
@@ -15,6 +47,10 @@ class Manager:
         self.db = database
         self.Model = model
         self._query = {}  # Instantiate a query, update it on get/filter call
+        self.next_cursor = None  # cursor of the page following the last `all` call, None on the last page
+        self.inserted_ids = set()  # ids of the records inserted by the last `upsert_multiple` call
+        self._options = ()  # loader options applied on fetch, see `load`
+        self._schema = None  # response schema given to `load`
 
     @classmethod
     async def async_init(cls, model, database: AsyncSession):
@@ -27,10 +63,9 @@ class Manager:
     
     async def set_session_vars(self):
         """
-        Set session variables for the instance
+        Set session variables for the instance, skipped when the connection already carries them
         """
-        await self.db.execute(f"SET zekoder.id = '{current_user_uuid()}'")
-        await self.db.execute(f"SET zekoder.roles = '{','.join(current_user_roles())}'")
+        await set_session_vars(self.db)
 
     def __str__(self):
         """
@@ -60,6 +95,14 @@ class Manager:
         """
         return list(self)[item]
 
+    def load(self, schema):
+        """
+        Load the relationships exposed by the given response schema on the next fetches, see `core.load_plan`.
+        """
+        self._options = load_plan(self.Model, schema)
+        self._schema = schema
+        return self
+
     def update_query(self, query):
         """
         Update the query for the instance.
@@ -70,7 +113,7 @@ class Manager:
         """
         Asynchronously fetch records from the database based on the current query.
         """
-        return await self.db.execute(select(self.Model).filter_by(**self._query))
+        return await self.db.execute(select(self.Model).filter_by(**self._query).options(*self._options))
     
     async def get(self, **query):
         """
@@ -80,11 +123,25 @@ class Manager:
         data = await self.__fetch()
         return data.scalars().first()
     
-    def get_multiple(self, obj_ids):
+    async def read(self, obj_id):
+        """
+        Get the record with the given id serialized with the response schema given to `load`, None if it does not exist.
+        Records of the tables cached by `core.cache.entity_cache` are read through it.
+        """
+        if self._schema is None or not entity_cache.caches(self.Model):
+            return await self.get(id=obj_id)
+
+        async def load():
+            obj = await self.get(id=obj_id)
+            return jsonable_encoder(self._schema.from_orm(obj)) if obj is not None else None
+        return await entity_cache.get_or_load(self.Model, self._schema, obj_id, load)
+
+    async def get_multiple(self, obj_ids):
         """
         Get a multi records from the database based on the provided IDs.
         """
-        return self.__fetch().filter(self.Model.id.in_(obj_ids)).all()
+        data = await self.db.execute(select(self.Model).filter(self.Model.id.in_(obj_ids)).options(*self._options))
+        return data.scalars().all()
 
     def filter(self, **query):
         """
@@ -93,50 +150,194 @@ class Manager:
         self.update_query(query)
         return self
 
-    async def create(self, only_add: bool = False, **kwargs):
+    async def create(self, only_add: bool = False, commit: bool = True, **kwargs):
         """
-        Create a new record in the database and executing pre and post triggers if exist
+        Create a new record in the database and executing pre and post triggers if exist.
+        With `commit=False` the record is only flushed, the caller commits the transaction, see `commit`.
         """
         model_data = kwargs.get("model_data", {})
+        await encrypt_values(model_data)
         if kwargs.get("signal_data"):
             new_data = await self.pre_save(**kwargs["signal_data"])
             model_data.update(new_data)
 
         obj = self.Model(**model_data)
-        await self.save(obj)
-        
+        self.db.add(obj)
+        await self.db.flush()
+        await self.db.refresh(obj)
+        await self.written([obj.id])
         if kwargs.get("signal_data"):
             kwargs.get("signal_data")["new_data"] = obj.__dict__
-            await self.post_save(**kwargs["signal_data"])
+            await self.dispatch("post_save", kwargs["signal_data"])
+        if commit:
+            await self.commit(obj)
 
         return obj
 
+    async def create_multiple(
+        self,
+        items: list,
+        signal_data: Optional[dict] = None,
+        chunk_size: int = BULK_CHUNK_SIZE,
+        commit: bool = True
+    ):
+        """
+        Create several records in one transaction with multi-row INSERT ... RETURNING statements of at most
+        `chunk_size` rows, executing pre and post triggers if exist with the whole batch.
+        Records are returned in the order of `items`. With `commit=False` the caller commits the transaction.
+        """
+        await encrypt_values(*items)
+        if signal_data:
+            items = await self.pre_save_multiple(items, **signal_data)
+        rows = [self._insert_values(item) for item in items]
+
+        objs = {}
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            # a multi-row VALUES clause needs the same columns on every row
+            groups = {}
+            for row in chunk:
+                groups.setdefault(tuple(sorted(row)), []).append(row)
+            for group in groups.values():
+                statement = insert(self.Model).values(group).returning(*self.Model.__table__.columns)
+                statement = select(self.Model).from_statement(statement).execution_options(populate_existing=True)
+                for obj in (await self.db.execute(statement)).scalars().all():
+                    objs[obj.id] = obj
+        created = [objs[row["id"]] for row in rows]
+        await self.written(list(objs))
+        if signal_data:
+            await self.dispatch("post_save", *[{**signal_data, "new_data": obj.__dict__, "old_data": {}} for obj in created])
+        if commit:
+            await self.commit(*created)
+        return created
+
+    async def upsert_multiple(
+        self,
+        items: list,
+        signal_data: Optional[dict] = None,
+        chunk_size: int = BULK_CHUNK_SIZE,
+        commit: bool = True
+    ):
+        """
+        Insert new records and update existing ones in one transaction with INSERT ... ON CONFLICT (id) DO UPDATE
+        statements of at most `chunk_size` rows. Existing records are selected up front, so the pre save triggers run
+        for new records and the pre update triggers, with their old data, for existing ones. Which records were
+        inserted is returned by the upsert itself (xmax = 0 on PostgreSQL, where a record can be inserted by another
+        transaction after the select; CockroachDB serializes the select and the upsert instead), the post triggers and
+        `inserted_ids` follow it. When an id is repeated in `items` its last occurrence wins. Records are returned in
+        the order of `items`. With `commit=False` the caller commits the transaction.
+        """
+        await encrypt_values(*items)
+        rows = [self._insert_values(item) for item in items]
+        existing = {}
+        ids = list({row["id"] for row in rows})
+        await self.before_write(ids)
+        for start in range(0, len(ids), chunk_size):
+            statement = select(self.Model).filter(self.Model.id.in_(ids[start:start + chunk_size]))
+            for obj in (await self.db.execute(statement)).scalars().all():
+                existing[obj.id] = dict(obj.__dict__)
+
+        unique_rows = {}
+        for row in rows:
+            obj_id = row["id"]
+            if signal_data:
+                if obj_id in existing:
+                    new_data = await self.pre_update(**{**signal_data, "new_data": row, "old_data": existing[obj_id]})
+                else:
+                    new_data = await self.pre_save(**{**signal_data, "new_data": row, "old_data": {}})
+                row = self._insert_values({**row, **new_data, "id": obj_id})
+            # ON CONFLICT DO UPDATE can not affect the same record twice in one statement
+            unique_rows[obj_id] = row
+
+        objs, inserted_ids = {}, set()
+        returned = [UPSERT_INSERTED] if unique_rows and not await is_cockroach(self.db) else []
+        unique_rows = list(unique_rows.values())
+        for start in range(0, len(unique_rows), chunk_size):
+            groups = {}
+            for row in unique_rows[start:start + chunk_size]:
+                groups.setdefault(tuple(sorted(row)), []).append(row)
+            for columns, group in groups.items():
+                statement = postgresql.insert(self.Model).values(group)
+                updated_values = {
+                    column: statement.excluded[column] for column in columns if column not in UPSERT_PRESERVED_COLUMNS
+                }
+                if "updated_on" in self.Model.__table__.columns:
+                    updated_values["updated_on"] = func.now()
+                if "updated_by" in self.Model.__table__.columns and current_user_uuid():
+                    updated_values["updated_by"] = uuid.UUID(str(current_user_uuid()))
+                statement = statement.on_conflict_do_update(index_elements=["id"], set_=updated_values)\
+                                     .returning(*self.Model.__table__.columns, *returned)
+                statement = select(self.Model, *returned).from_statement(statement).execution_options(populate_existing=True)
+                for obj, *inserted in (await self.db.execute(statement)).all():
+                    objs[obj.id] = obj
+                    if (inserted[0] if inserted else obj.id not in existing):
+                        inserted_ids.add(obj.id)
+        await self.written(list(objs))
+        if signal_data:
+            await self.dispatch("post_update", *[
+                {**signal_data, "new_data": row, "old_data": existing.get(row["id"], {})}
+                for row in unique_rows if row["id"] not in inserted_ids
+            ])
+            await self.dispatch("post_save", *[
+                {**signal_data, "new_data": objs[row["id"]].__dict__, "old_data": {}}
+                for row in unique_rows if row["id"] in inserted_ids
+            ])
+        self.inserted_ids = inserted_ids
+        if commit:
+            await self.commit(*objs.values())
+        return [objs[row["id"]] for row in rows]
+
+    def _insert_values(self, item: dict) -> dict:
+        """
+        Return the column values of a new record, with its id generated when missing
+        """
+        columns = self.Model.__table__.columns.keys()
+        row = {key: value for key, value in item.items() if key in columns}
+        if row.get("id") is None:
+            row["id"] = uuid.uuid4()
+        elif not isinstance(row["id"], uuid.UUID):
+            row["id"] = uuid.UUID(str(row["id"]))
+        return row
+
     async def save(self, obj):
         """
         Save changes to the database after adding a new record.
         """
         self.db.add(obj)
-        await self.db.commit()
+        await self.db.flush()
         await self.db.refresh(obj)
+        await self.written([obj.id])
+        await self.commit(obj)
+
+    async def commit(self, *objs):
+        """
+        Commit the current transaction, then load the relationships of the response schema of the given records, see `load`
+        """
+        await self.db.commit()
+        if self._options and objs:
+            statement = select(self.Model).filter(self.Model.id.in_([obj.id for obj in objs])).options(*self._options)
+            await self.db.execute(statement.execution_options(populate_existing=True))
 
     async def update(self, obj_id, **kwargs):
         """
         Update an existing record in the database.
         """
         model_data = kwargs.get("model_data", {})
+        await encrypt_values(model_data)
         if kwargs.get("signal_data"):
             model_data.update(await self.pre_update(**kwargs["signal_data"]))
+        await self.before_write([obj_id])
         statement = update(self.Model)\
                     .filter(self.Model.id == obj_id)\
                     .values(model_data)\
                     .returning(self.Model.__table__)
         
         updated_row = await self.db.execute(statement)
-        await self.db.commit()
-
+        await self.written([obj_id])
         if kwargs.get("signal_data"):
             kwargs.get("signal_data")["new_data"] = model_data
-            await self.post_update(**kwargs["signal_data"])
+            await self.dispatch("post_update", kwargs["signal_data"])
+        await self.db.commit()
         return updated_row
 
     async def delete(self, obj_id, **kwargs):
@@ -149,12 +350,13 @@ class Manager:
         if not is_delete:
             return
         
+        await self.before_write([obj_id])
         await self.db.execute(delete(self.Model).filter(self.Model.id == obj_id))
-        await self.db.commit()
-        
+        await self.written([obj_id])
         if kwargs.get("signal_data"):
             kwargs.get("signal_data")["new_data"] = is_delete
-            await self.post_delete(**kwargs["signal_data"])
+            await self.dispatch("post_delete", kwargs["signal_data"])
+        await self.db.commit()
 
     async def delete_multiple(self, obj_ids: list, **kwargs):
         """
@@ -169,15 +371,29 @@ class Manager:
         if not is_delete:
             return
   
+        await self.before_write(obj_ids)
         await self.db.execute(delete(self.Model).filter(self.Model.id.in_(obj_ids)))
+        await self.written(obj_ids)
+        if kwargs.get("signal_data"):
+            await self.dispatch("post_delete", *[
+                {**kwargs["signal_data"], "new_data": is_delete, "old_data": dict(obj.__dict__) if obj else {}}
+                for obj in all_old_data
+            ])
         await self.db.commit()
 
-        if kwargs.get("signal_data"):
-            kwargs.get("signal_data")["new_data"] = is_delete
-            for obj in all_old_data:
-                kwargs["signal_data"]["old_data"] = dict(obj.__dict__) if obj else {}
-                await self.post_delete(**kwargs["signal_data"])
 
+    async def before_write(self, obj_ids: list):
+        """
+        Called in the transaction before existing records are updated or deleted, see `written`.
+        """
+        pass
+
+    async def written(self, obj_ids: list):
+        """
+        Called in the transaction once records are created, updated or deleted, before it commits: data derived
+        from the records is maintained here so it commits, or not, with them. Their cached entries are invalidated.
+        """
+        entity_cache.invalidate(self.db, self.Model, obj_ids)
 
     async def pre_save(self, **kwargs):
         """
@@ -191,6 +407,34 @@ class Manager:
         """
         pass
 
+    async def pre_save_multiple(self, items: list, **kwargs) -> list:
+        """
+        Perform pre-save operations on a batch of new records and return their model data,
+        runs `pre_save` for every record unless overridden.
+        """
+        result = []
+        for item in items:
+            model_data = dict(item)
+            model_data.update(await self.pre_save(**{**kwargs, "new_data": item, "old_data": {}}))
+            result.append(model_data)
+        return result
+
+    def has_trigger(self, hook: str) -> bool:
+        """
+        Return True if the manager overrides the given trigger
+        """
+        return getattr(type(self), hook) is not getattr(Manager, hook)
+
+    async def dispatch(self, hook: str, *signals: dict):
+        """
+        Schedule a post-commit trigger once for every given signal data. The triggers are written to the outbox
+        in the current transaction, so they are delivered, in the background, if and only if it commits;
+        see `core.outbox`. Nothing is dispatched for triggers the manager does not override.
+        """
+        if not signals or not self.has_trigger(hook):
+            return
+        outbox.dispatch(self.db, [outbox.outbox_record(self.Model, hook, signal) for signal in signals])
+
     async def pre_update(self, **kwargs):
         """
         Perform pre-update operations and return additional model data.
@@ -215,11 +459,67 @@ class Manager:
         """
         pass
 
-    async def all(self, offset: int = 0, limit: int = 10, **query):
+    async def all(self, offset: int = 0, limit: int = 10, cursor: Optional[str] = None, **query):
         """
-        Retrieve all records from the database based on the current query, with optional offset and limit.
+        Retrieve a page of records from the database based on the current query, ordered by (created_on, id).
+        Pages are selected with `offset` or, when given, with the keyset `cursor` of a previous call which
+        stays constant-time on deep pages. The cursor of the next page is kept in `next_cursor`.
         """
         self.update_query(query)
-        data = await self.__fetch()
+        data = await self.db.execute(self._page(select(self.Model).options(*self._options), offset, limit, cursor))
         data = data.scalars().all()
-        return data[offset*limit:(offset+1)*limit]
+        self.next_cursor = encode_cursor(data[limit - 1]) if len(data) > limit else None
+        return data[:limit]
+
+    def _page(self, statement, offset: int, limit: int, cursor: Optional[str]):
+        """
+        Return `statement` filtered by the current query and restricted to a page, see `all`
+        """
+        statement = statement.filter_by(**self._query).order_by(self.Model.created_on, self.Model.id)
+        if cursor:
+            created_on, obj_id = decode_cursor(cursor)
+            statement = statement.where(tuple_(self.Model.created_on, self.Model.id) > tuple_(created_on, obj_id))
+        else:
+            statement = statement.offset(offset)
+        # fetch one extra row to know whether there is a next page
+        return statement.limit(limit + 1)
+
+    async def page_versions(self, offset: int = 0, limit: int = 10, cursor: Optional[str] = None, **query):
+        """
+        Return the versions of the page `all` would return, see `versions`, and the cursor of the next page,
+        without loading or serializing the records
+        """
+        self.update_query(query)
+        statement = self._page(select(self.Model.id, self.Model.created_on, self.Model.updated_on), offset, limit, cursor)
+        rows = (await self.db.execute(statement)).all()
+        next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+        rows = rows[:limit]
+        return [('', row.id, row.updated_on) for row in rows] + await self.related_versions([row.id for row in rows]), next_cursor
+
+    async def record_versions(self, obj_id):
+        """
+        Return the versions of the record with the given id, see `versions`, None if it does not exist
+        """
+        statement = select(self.Model.id, self.Model.updated_on).filter(self.Model.id == obj_id)
+        row = (await self.db.execute(statement)).first()
+        if row is None:
+            return None
+        return [('', row.id, row.updated_on)] + await self.related_versions([row.id])
+
+    async def related_versions(self, obj_ids: list) -> list:
+        """
+        Return the (relationship, id, updated_on) versions of the related records the response schema given to
+        `load` embeds in the given records, in one query
+        """
+        relations = embedded_relationships(self.Model, self._schema) if self._schema else ()
+        if not obj_ids or not relations:
+            return []
+        statements = []
+        for name in relations:
+            related = getattr(self.Model, name).property.mapper.class_
+            statements.append(
+                select(cast(literal(name), String).label('relationship'), related.id, related.updated_on)
+                .select_from(self.Model).join(getattr(self.Model, name)).where(self.Model.id.in_(obj_ids))
+            )
+        rows = (await self.db.execute(union_all(*statements))).all()
+        return [tuple(row) for row in rows]
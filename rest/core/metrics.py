@@ -0,0 +1,46 @@
+import threading
+from collections import defaultdict
+from typing import Callable
+
+
+class Metrics:
+    """
+    Process-wide counters and gauges, exposed by the /metrics endpoint.
+
+    Counters are incremented by the code paths they measure; gauges are callables evaluated on read,
+    so values that are expensive or already tracked elsewhere cost nothing until they are scraped.
+    """
+
+    def __init__(self) -> None:
+        self._counters: dict[str, float] = defaultdict(float)
+        self._gauges: dict[str, Callable[[], float]] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1) -> None:
+        """
+        Increment the counter with the given name
+        """
+        with self._lock:
+            self._counters[name] += value
+
+    def gauge(self, name: str, func: Callable[[], float]) -> None:
+        """
+        Register a gauge, `func` is called every time the metrics are read
+        """
+        self._gauges[name] = func
+
+    def snapshot(self) -> dict:
+        """
+        Return the current value of every counter and gauge
+        """
+        with self._lock:
+            values = dict(self._counters)
+        for name, func in self._gauges.items():
+            try:
+                values[name] = func()
+            except Exception:
+                values[name] = None
+        return dict(sorted(values.items()))
+
+
+metrics = Metrics()
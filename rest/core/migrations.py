@@ -0,0 +1,430 @@
+import hashlib
+import os
+import re
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Optional
+
+from sqlalchemy import Column, DateTime, Enum, Integer, JSON, MetaData, Table, Text, func, inspect
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql.base import CreateEnumType
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from core.logger import log
+
+# plain SQL migrations, applied in the order of their file names: 0001_<name>.sql, 0002_<name>.sql, ...
+MIGRATIONS_DIR = os.environ.get('MIGRATIONS_DIR', os.path.join(os.path.dirname(os.path.dirname(__file__)), 'migrations'))
+MIGRATIONS_SCHEMA = os.environ.get('DEFAULT_SCHEMA', 'public')
+# tables of the models that other services own, left out of the generated migrations
+MIGRATIONS_EXCLUDED_TABLES = os.environ.get('MIGRATIONS_EXCLUDED_TABLES', 'public.users,public.files')
+# longest wait for a lock before a step gives up and is retried, live queries would queue behind a waiting step
+MIGRATION_LOCK_TIMEOUT = os.environ.get('MIGRATION_LOCK_TIMEOUT', '3s')
+MIGRATION_LOCK_RETRIES = int(os.environ.get('MIGRATION_LOCK_RETRIES', 5))
+MIGRATION_RETRY_DELAY = float(os.environ.get('MIGRATION_RETRY_DELAY', 2))  # seconds, doubled after each retry
+# steps holding a lock that blocks reads or writes longer than this are reported as warnings
+MIGRATION_LOCK_WARNING_MS = float(os.environ.get('MIGRATION_LOCK_WARNING_MS', 1000))
+# key of the advisory lock held by the runner, migrations are applied by one runner at a time
+MIGRATION_ADVISORY_LOCK = 5_871_203
+# files with this line run each statement in its own transaction
+NO_TRANSACTION_MARKER = '-- migrate: no-transaction'
+# lock timeout and serialization failure, the step is retried
+RETRYABLE_ERRORS = ('55P03', '40001')
+
+migrations_table = Table(
+    'schema_migrations', MetaData(),
+    Column('name', Text, primary_key=True),
+    Column('checksum', Text, nullable=False),
+    Column('applied_on', DateTime, server_default=func.now()),
+    Column('duration_ms', Integer),
+    Column('report', JSON),
+    schema=MIGRATIONS_SCHEMA
+)
+
+# (statement, lock taken on its table, what the lock blocks) the first matching rule applies, see
+# https://www.postgresql.org/docs/current/explicit-locking.html
+LOCK_RULES = tuple((re.compile(pattern, re.I | re.S), lock, blocks) for pattern, lock, blocks in (
+    (r'^(CREATE\s+(UNIQUE\s+)?INDEX|DROP\s+INDEX|REINDEX\s+\w+)\s+CONCURRENTLY', 'SHARE UPDATE EXCLUSIVE', 'nothing'),
+    (r'^CREATE\s+(UNIQUE\s+)?INDEX', 'SHARE', 'writes'),
+    (r'^CREATE\s', None, 'nothing'),
+    (r'^ALTER\s+TABLE\s.*\sVALIDATE\s+CONSTRAINT', 'SHARE UPDATE EXCLUSIVE', 'nothing'),
+    (r'^ALTER\s+TABLE\s.*\sALTER\s+COLUMN\s.*\sTYPE\s', 'ACCESS EXCLUSIVE', 'reads and writes, rewrites the table'),
+    (r'^ALTER\s+TABLE\s.*\sSET\s+NOT\s+NULL', 'ACCESS EXCLUSIVE', 'reads and writes, scans the table'),
+    (r'^ALTER\s+TABLE\s', 'ACCESS EXCLUSIVE', 'reads and writes'),
+    (r'^(DROP|TRUNCATE)\s+TABLE', 'ACCESS EXCLUSIVE', 'reads and writes'),
+    (r'^(INSERT|UPDATE|DELETE)\s', 'ROW EXCLUSIVE', 'nothing, writes of the same rows wait'),
+    (r'^ALTER\s+TYPE\s', None, 'nothing'),
+))
+# statements PostgreSQL does not run in a transaction block
+NON_TRANSACTIONAL = re.compile(r'^(\w+\s+)*?(INDEX|REINDEX\s+\w+)\s+CONCURRENTLY|^ALTER\s+TYPE\s.*\sADD\s+VALUE|^VACUUM\s', re.I | re.S)
+CONCURRENT_INDEX_NAME = re.compile(r'^CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+(?:IF\s+NOT\s+EXISTS\s+)?("[^"]+"|\w+)', re.I)
+TABLE_NAME = re.compile(
+    r'\b(?:TABLE(?:\s+IF\s+(?:NOT\s+)?EXISTS)?|ON(?:\s+ONLY)?|INTO|UPDATE|FROM)\s+((?:"[^"]+"|\w+)(?:\.(?:"[^"]+"|\w+))?)',
+    re.I
+)
+
+
+@dataclass
+class Step:
+    """
+    A statement of a migration with the lock it takes on its table
+    """
+    sql: str
+    table: Optional[str]
+    lock: Optional[str]
+    blocks: str
+    transactional: bool
+
+    @classmethod
+    def parse(cls, sql: str) -> "Step":
+        lock, blocks = None, 'nothing'
+        for pattern, rule_lock, rule_blocks in LOCK_RULES:
+            if pattern.match(sql):
+                lock, blocks = rule_lock, rule_blocks
+                break
+        table = TABLE_NAME.search(sql)
+        return cls(sql, table.group(1) if table else None, lock, blocks, not NON_TRANSACTIONAL.match(sql))
+
+    @property
+    def blocking(self) -> bool:
+        return self.blocks.startswith(('reads', 'writes'))
+
+    @property
+    def summary(self) -> str:
+        return ' '.join(self.sql.split())[:80]
+
+
+def split_statements(sql: str) -> list:
+    """
+    Split a SQL script on semicolons, leaving out comments and semicolons in quotes or dollar-quoted bodies
+    """
+    statements, current, i = [], [], 0
+    while i < len(sql):
+        char = sql[i]
+        if sql.startswith('--', i):
+            end = sql.find('\n', i)
+            i = len(sql) if end == -1 else end
+            continue
+        if char == "'":
+            end = i + 1
+            while True:
+                end = sql.find("'", end)
+                if end == -1 or not sql.startswith("''", end):
+                    break
+                end += 2
+            end = len(sql) if end == -1 else end + 1
+        elif char == '$' and (tag := re.match(r'\$\w*\$', sql[i:])):
+            end = sql.find(tag.group(0), i + len(tag.group(0)))
+            end = len(sql) if end == -1 else end + len(tag.group(0))
+        elif char == ';':
+            statements.append(''.join(current).strip())
+            current, i = [], i + 1
+            continue
+        else:
+            end = i + 1
+        current.append(sql[i:end])
+        i = end
+    statements.append(''.join(current).strip())
+    return [statement for statement in statements if statement]
+
+
+@dataclass
+class Migration:
+    name: str
+    sql: str
+
+    @classmethod
+    def load(cls, path: str) -> "Migration":
+        with open(path) as file:
+            return cls(os.path.basename(path)[:-len('.sql')], file.read())
+
+    @property
+    def checksum(self) -> str:
+        return hashlib.sha256(self.sql.encode()).hexdigest()
+
+    @property
+    def steps(self) -> list:
+        return [Step.parse(statement) for statement in split_statements(self.sql)]
+
+    @property
+    def transactional(self) -> bool:
+        """
+        False if a statement can not run in a transaction block, each statement then commits on its own and
+        the statements of the file must be idempotent (IF NOT EXISTS, ...) so a failed file can be run again
+        """
+        return NO_TRANSACTION_MARKER not in self.sql and all(step.transactional for step in self.steps)
+
+
+def load_migrations(directory: str = MIGRATIONS_DIR) -> list:
+    return [
+        Migration.load(os.path.join(directory, name))
+        for name in sorted(os.listdir(directory)) if re.match(r'^\d+_.*\.sql$', name)
+    ]
+
+
+def is_retryable(error: Exception) -> bool:
+    return isinstance(error, DBAPIError) and getattr(error.orig, 'pgcode', None) in RETRYABLE_ERRORS
+
+
+class MigrationRunner:
+    """
+    Apply the pending SQL migrations and record them in the schema_migrations table.
+
+    A migration runs in one transaction unless one of its statements can not, e.g. CREATE INDEX CONCURRENTLY,
+    then each statement commits on its own. On CockroachDB schema changes are online and each statement
+    always runs on its own, as advised for schema changes there. Lock waits are bounded by
+    MIGRATION_LOCK_TIMEOUT and the timed out step (or transaction) is retried, live queries never queue
+    long behind a migration. Each step is reported with the lock it takes, what the lock blocks, how long
+    it ran and how long its table stayed locked: until the end of the step, or of the transaction.
+    """
+
+    def __init__(self, engine: Engine, directory: str = MIGRATIONS_DIR) -> None:
+        self.engine = engine
+        self.directory = directory
+        self._cockroach = None
+
+    def cockroach(self, conn: Connection) -> bool:
+        if self._cockroach is None:
+            self._cockroach = 'cockroachdb' in conn.exec_driver_sql('SELECT version()').scalar().lower()
+        return self._cockroach
+
+    def applied(self, conn: Connection) -> dict:
+        """
+        Return the checksums of the applied migrations by name
+        """
+        migrations_table.create(conn, checkfirst=True)
+        return {row.name: row.checksum for row in conn.execute(migrations_table.select())}
+
+    def pending(self, conn: Connection) -> list:
+        applied, pending = self.applied(conn), []
+        for migration in load_migrations(self.directory):
+            if migration.name not in applied:
+                pending.append(migration)
+            elif applied[migration.name] != migration.checksum:
+                log.warning(f"migration <{migration.name}> was changed after it was applied, write a new migration instead")
+        return pending
+
+    def upgrade(self, target: Optional[str] = None, baseline: bool = False) -> list:
+        """
+        Apply the pending migrations up to `target` (included), or record them as applied without running
+        them with `baseline`, for databases whose schema already matches them. Return the reports of the
+        applied migrations.
+        """
+        reports = []
+        with self.engine.connect() as conn:
+            conn = conn.execution_options(isolation_level='AUTOCOMMIT')
+            self._lock(conn)
+            try:
+                for migration in self.pending(conn):
+                    report = [] if baseline else self.apply(conn, migration)
+                    duration_ms = sum(step['duration_ms'] for step in report)
+                    conn.execute(migrations_table.insert().values(
+                        name=migration.name, checksum=migration.checksum, duration_ms=round(duration_ms), report=report
+                    ))
+                    log.info(f"migration <{migration.name}> {'recorded' if baseline else 'applied'} in {duration_ms:.0f} ms")
+                    reports.append((migration.name, report))
+                    if migration.name == target:
+                        break
+            finally:
+                self._unlock(conn)
+        return reports
+
+    def apply(self, conn: Connection, migration: Migration) -> list:
+        if migration.transactional and not self.cockroach(conn):
+            return self._retry(migration.name, lambda: self._run_transaction(migration.steps))
+        return [
+            row for step in migration.steps
+            for row in self._retry(migration.name, lambda: self._run_transaction([step], conn))
+        ]
+
+    def _retry(self, name: str, run: Callable[[], list]) -> list:
+        delay = MIGRATION_RETRY_DELAY
+        for attempt in range(MIGRATION_LOCK_RETRIES + 1):
+            try:
+                return run()
+            except DBAPIError as e:
+                if not is_retryable(e) or attempt == MIGRATION_LOCK_RETRIES:
+                    raise
+                log.warning(f"migration <{name}> timed out waiting for a lock, retrying in {delay:.0f}s")
+                time.sleep(delay)
+                delay *= 2
+
+    def _run_transaction(self, steps: list, autocommit: Optional[Connection] = None) -> list:
+        """
+        Run steps in one transaction, or the single step of `steps` on the `autocommit` connection,
+        and return their report
+        """
+        rows, locked_since = [], {}
+        with (self.engine.begin() if autocommit is None else nullcontext(autocommit)) as conn:
+            self._set_lock_timeout(conn, local=autocommit is None)
+            for step in steps:
+                if autocommit is not None:
+                    self._drop_invalid_index(conn, step)
+                started = time.perf_counter()
+                conn.exec_driver_sql(step.sql)
+                rows.append((step, started, time.perf_counter()))
+                if step.lock and step.table:
+                    locked_since.setdefault(step.table, started)
+        committed = time.perf_counter()
+        return [self._report_row(step, started, ended, committed - locked_since.get(step.table, started))
+                for step, started, ended in rows]
+
+    def _report_row(self, step: Step, started: float, ended: float, held: float) -> dict:
+        row = {
+            "statement": step.summary,
+            "table": step.table,
+            "lock": step.lock,
+            "blocks": step.blocks,
+            "duration_ms": round((ended - started) * 1000, 1),
+            "lock_held_ms": round(held * 1000, 1) if step.lock else 0
+        }
+        if step.blocking and row["lock_held_ms"] > MIGRATION_LOCK_WARNING_MS:
+            log.warning(f"{step.table} was locked against {step.blocks} for {row['lock_held_ms']:.0f} ms by <{step.summary}>")
+        return row
+
+    def _drop_invalid_index(self, conn: Connection, step: Step) -> None:
+        """
+        Drop the index of a concurrent index build left invalid by a failed run, IF NOT EXISTS would keep it
+        """
+        name = CONCURRENT_INDEX_NAME.match(step.sql)
+        if name is None or self.cockroach(conn):
+            return
+        invalid = conn.exec_driver_sql(
+            "SELECT c.oid::regclass::text FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE NOT i.indisvalid AND c.relname = %(name)s", {"name": name.group(1).strip('"')}
+        ).scalars().all()
+        for index in invalid:
+            log.warning(f"dropping the invalid index <{index}> left by a failed concurrent build")
+            conn.exec_driver_sql(f'DROP INDEX CONCURRENTLY IF EXISTS {index}')
+
+    def _set_lock_timeout(self, conn: Connection, local: bool) -> None:
+        try:
+            conn.exec_driver_sql(f"SET {'LOCAL ' if local else ''}lock_timeout = '{MIGRATION_LOCK_TIMEOUT}'")
+        except DBAPIError as e:
+            log.debug(e)
+
+    def _lock(self, conn: Connection) -> None:
+        if not self.cockroach(conn):
+            conn.exec_driver_sql(f'SELECT pg_advisory_lock({MIGRATION_ADVISORY_LOCK})')
+
+    def _unlock(self, conn: Connection) -> None:
+        if not self.cockroach(conn):
+            conn.exec_driver_sql(f'SELECT pg_advisory_unlock({MIGRATION_ADVISORY_LOCK})')
+
+
+def format_report(reports: list) -> str:
+    """
+    Return the reports of `MigrationRunner.upgrade` as a text table
+    """
+    lines = [f"{'migration':<32} {'table':<32} {'lock':<24} {'held ms':>9} {'ran ms':>9}  blocks / statement"]
+    for name, report in reports:
+        for row in report:
+            lines.append(
+                f"{name:<32} {row['table'] or '-':<32} {row['lock'] or '-':<24} {row['lock_held_ms']:>9.1f} "
+                f"{row['duration_ms']:>9.1f}  {row['blocks']} / {row['statement']}"
+            )
+    return '\n'.join(lines)
+
+
+def excluded(table: Table) -> bool:
+    names = {name.strip() for name in MIGRATIONS_EXCLUDED_TABLES.split(',')}
+    return table.fullname in names or table.name in names
+
+
+def autogenerate(metadata: MetaData, conn: Connection) -> list:
+    """
+    Return the statements, and comments to review, bringing the database schema to the models of `metadata`:
+    missing enum types and values, tables, columns and indexes. Indexes of existing tables are built
+    concurrently; columns are added nullable when they have no default, they are set NOT NULL once backfilled;
+    type changes rewrite the table under an ACCESS EXCLUSIVE lock and are flagged. Columns and indexes
+    missing from the models are only reported, they are dropped by hand once no code uses them.
+    """
+    dialect = postgresql.dialect()
+    preparer = dialect.identifier_preparer
+    inspector = inspect(conn)
+    statements = []
+
+    enums = {enum['name']: enum['labels'] for enum in inspector.get_enums('*')}
+    for table in metadata.sorted_tables:
+        for column in table.columns:
+            if excluded(table) or not isinstance(column.type, Enum) or not column.type.native_enum:
+                continue
+            if column.type.name not in enums:
+                statements.append(str(CreateEnumType(column.type).compile(dialect=dialect)) + ';')
+                enums[column.type.name] = list(column.type.enums)
+            for label in column.type.enums:
+                if label not in enums[column.type.name]:
+                    statements.append(f"ALTER TYPE {preparer.format_type(column.type)} ADD VALUE IF NOT EXISTS '{label}';")
+
+    for table in metadata.sorted_tables:
+        if excluded(table):
+            continue
+        name = preparer.format_table(table)
+        if not inspector.has_table(table.name, schema=table.schema):
+            statements.append(str(CreateTable(table, if_not_exists=True).compile(dialect=dialect)).strip() + ';')
+            statements += [
+                str(CreateIndex(index, if_not_exists=True).compile(dialect=dialect)) + ';'
+                for index in sorted(table.indexes, key=lambda index: index.name)
+            ]
+            continue
+
+        reflected = {column['name']: column for column in inspector.get_columns(table.name, schema=table.schema)}
+        for column in table.columns:
+            if column.name not in reflected:
+                default = dialect.ddl_compiler(dialect, None).get_column_default_string(column)
+                statements.append(
+                    f"ALTER TABLE {name} ADD COLUMN IF NOT EXISTS {preparer.format_column(column)} "
+                    f"{column.type.compile(dialect=dialect)}{f' DEFAULT {default}' if default else ''}"
+                    f"{' NOT NULL' if default and not column.nullable else ''};"
+                )
+                if not default and not column.nullable:
+                    statements.append(
+                        f"-- backfill {table.name}.{column.name}, then: "
+                        f"ALTER TABLE {name} ALTER COLUMN {preparer.format_column(column)} SET NOT NULL;"
+                    )
+                continue
+            try:
+                model_type = column.type.compile(dialect=dialect)
+                database_type = reflected[column.name]['type'].compile(dialect=dialect)
+            except Exception as e:
+                log.debug(e)
+                continue
+            if model_type.upper() != database_type.upper():
+                statements += [
+                    f"-- {table.name}.{column.name} is {database_type} in the database: the type change rewrites the table"
+                    f" and blocks it, on large tables add a column, backfill it in batches and swap them instead",
+                    f"ALTER TABLE {name} ALTER COLUMN {preparer.format_column(column)} TYPE {model_type}"
+                    f" USING {preparer.format_column(column)}::{model_type};"
+                ]
+        columns = {column.name for column in table.columns}
+        statements += [f"-- column {table.name}.{column} is not in the models" for column in reflected if column not in columns]
+
+        indexes = {index['name'] for index in inspector.get_indexes(table.name, schema=table.schema)}
+        indexes |= {constraint['name'] for constraint in inspector.get_unique_constraints(table.name, schema=table.schema)}
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            if index.name not in indexes:
+                statements.append(re.sub(
+                    r'^CREATE (UNIQUE )?INDEX', r'CREATE \1INDEX CONCURRENTLY',
+                    str(CreateIndex(index, if_not_exists=True).compile(dialect=dialect))
+                ) + ';')
+        statements += [
+            f"-- index {index} of {table.name} is not in the models"
+            for index in sorted(indexes - {index.name for index in table.indexes} - {None}) if not index.endswith('_pkey')
+        ]
+    return statements
+
+
+def write_migration(name: str, statements: list, directory: str = MIGRATIONS_DIR) -> str:
+    """
+    Write `statements` to the next migration file of `directory` and return its path
+    """
+    numbers = [int(migration.name.split('_', 1)[0]) for migration in load_migrations(directory)]
+    slug = re.sub(r'\W+', '_', name.lower()).strip('_')
+    path = os.path.join(directory, f"{max(numbers, default=0) + 1:04d}_{slug}.sql")
+    with open(path, 'w') as file:
+        file.write(f"-- Generated from the models on {datetime.now():%Y-%m-%d}, review before applying.\n\n")
+        file.write('\n'.join(statements) + '\n')
+    return path
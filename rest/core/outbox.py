@@ -0,0 +1,291 @@
+import asyncio
+import datetime
+import importlib
+import os
+import uuid
+from typing import Optional
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event, select, update, delete, func, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from business import db_async_session
+from core.depends import user_session, user_roles, current_user_uuid, current_user_roles
+from core.logger import log
+from core.metrics import metrics
+from core.outbox_model import OutboxModel
+from core.tasks import task_queue, TASK_MAX_ATTEMPTS
+
+# 'queue': API workers deliver the records they write on their task queue,
+# 'relay': API workers only write records, the relay process (relay.py) delivers them
+OUTBOX_DELIVERY = os.environ.get('OUTBOX_DELIVERY', 'queue')
+if OUTBOX_DELIVERY not in ('queue', 'relay'):
+    raise ValueError(f"OUTBOX_DELIVERY should be 'queue' or 'relay', got <{OUTBOX_DELIVERY}>")
+# seconds a worker owns a record it is delivering, after that another worker may take it over
+OUTBOX_LEASE = int(os.environ.get('OUTBOX_LEASE', 300))
+# seconds between two scans for pending records that are not queued (restarts, full queue)
+OUTBOX_SWEEP_INTERVAL = float(os.environ.get('OUTBOX_SWEEP_INTERVAL', 60))
+OUTBOX_SWEEP_BATCH = int(os.environ.get('OUTBOX_SWEEP_BATCH', 500))
+# days delivered and failed records are kept, 0 keeps them forever
+OUTBOX_RETENTION_DAYS = float(os.environ.get('OUTBOX_RETENTION_DAYS', 7))
+OUTBOX_PURGE_BATCH = int(os.environ.get('OUTBOX_PURGE_BATCH', 1000))
+# service credential issued by zeauth to this API, triggers run from the outbox call the other services with it
+# since the JWT of the caller is not stored (it may expire before the record is delivered)
+ZEAUTH_SERVICE_TOKEN = os.environ.get('ZEAUTH_SERVICE_TOKEN')
+if not ZEAUTH_SERVICE_TOKEN:
+    raise ValueError("ZEAUTH_SERVICE_TOKEN environment variable is not set. Please set it before running the application.")
+# key of the ids of the records written in the current transaction, kept in the session info
+OUTBOX_IDS_KEY = 'outbox_ids'
+
+# backlog of the outbox as of the last `measure` call
+stats = {"pending": None, "lag_seconds": None}
+metrics.gauge('outbox.pending', lambda: stats["pending"])
+metrics.gauge('outbox.lag_seconds', lambda: stats["lag_seconds"])
+
+
+def model_path(model) -> str:
+    return f"{model.__module__}:{model.__qualname__}"
+
+
+def import_model(path: str):
+    module_name, name = path.split(':')
+    return getattr(importlib.import_module(module_name), name)
+
+
+def serialize_signal(signal_data: dict) -> dict:
+    """
+    Return the JSON representation of the signal data of a trigger, ORM state and loaded relationships are dropped from records
+    """
+    def is_orm(value) -> bool:
+        if isinstance(value, (list, tuple, set)):
+            return any(is_orm(item) for item in value)
+        return hasattr(value, '_sa_instance_state')
+
+    def plain(value):
+        if isinstance(value, dict):
+            return {key: item for key, item in value.items() if not key.startswith('_sa_') and not is_orm(item)}
+        return value
+    return jsonable_encoder({key: plain(value) for key, value in signal_data.items()})
+
+
+def outbox_record(model, hook: str, signal_data: dict) -> OutboxModel:
+    """
+    Return a new outbox record delivering `hook` of the manager of `model` with the given signal data.
+
+    The identity of the current user is stored with it and restored when the trigger runs. The caller's JWT
+    is left out of the signal data, the trigger runs with ZEAUTH_SERVICE_TOKEN instead.
+    """
+    return OutboxModel(
+        id=uuid.uuid4(),
+        model=model_path(model),
+        hook=hook,
+        payload={
+            "signal_data": serialize_signal({key: value for key, value in signal_data.items() if key != 'jwt'}),
+            "user": str(current_user_uuid()) if current_user_uuid() else None,
+            "roles": current_user_roles()
+        }
+    )
+
+
+def dispatch(session: AsyncSession, records: list) -> None:
+    """
+    Add the given outbox records to the current transaction of the session, they are queued once it commits
+    """
+    session.add_all(records)
+    session.sync_session.info.setdefault(OUTBOX_IDS_KEY, []).extend(record.id for record in records)
+
+
+@event.listens_for(Session, 'after_commit')
+def _submit_committed(session: Session) -> None:
+    outbox_ids = session.info.pop(OUTBOX_IDS_KEY, [])
+    if OUTBOX_DELIVERY == 'queue':
+        for outbox_id in outbox_ids:
+            submit(outbox_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_rolled_back(session: Session) -> None:
+    session.info.pop(OUTBOX_IDS_KEY, None)
+
+
+def submit(outbox_id: uuid.UUID) -> None:
+    if not task_queue.submit(deliver, outbox_id):
+        # picked up by the next sweep
+        log.debug(f"outbox record <{outbox_id}> left pending")
+
+
+async def claim(session: AsyncSession, outbox_id: uuid.UUID) -> Optional[OutboxModel]:
+    """
+    Take the lease of a pending outbox record, None if it is delivered or leased by another worker
+    """
+    statement = update(OutboxModel)\
+        .where(OutboxModel.id == outbox_id)\
+        .where(OutboxModel.status == 'pending')\
+        .where(or_(OutboxModel.locked_until.is_(None), OutboxModel.locked_until < func.now()))\
+        .values(
+            attempts=OutboxModel.attempts + 1,
+            locked_until=func.now() + datetime.timedelta(seconds=OUTBOX_LEASE)
+        )\
+        .returning(OutboxModel.id, OutboxModel.model, OutboxModel.hook, OutboxModel.payload, OutboxModel.attempts)
+    row = (await session.execute(statement)).first()
+    await session.commit()
+    return row
+
+
+async def claim_batch(session: AsyncSession, limit: int) -> list:
+    """
+    Take the lease of up to `limit` pending outbox records, oldest first. Records locked by another relay are
+    skipped (FOR UPDATE SKIP LOCKED) instead of waited for, so several relays can drain the outbox together.
+    """
+    statement = select(OutboxModel.id)\
+        .where(OutboxModel.status == 'pending')\
+        .where(or_(OutboxModel.locked_until.is_(None), OutboxModel.locked_until < func.now()))\
+        .order_by(OutboxModel.created_on)\
+        .limit(limit)\
+        .with_for_update(skip_locked=True)
+    outbox_ids = (await session.execute(statement)).scalars().all()
+    if not outbox_ids:
+        await session.commit()
+        return []
+    statement = update(OutboxModel)\
+        .where(OutboxModel.id.in_(outbox_ids))\
+        .values(
+            attempts=OutboxModel.attempts + 1,
+            locked_until=func.now() + datetime.timedelta(seconds=OUTBOX_LEASE)
+        )\
+        .returning(OutboxModel.id, OutboxModel.model, OutboxModel.hook, OutboxModel.payload, OutboxModel.attempts)
+    rows = (await session.execute(statement)).all()
+    await session.commit()
+    return rows
+
+
+async def run(record) -> None:
+    """
+    Run the trigger of an outbox record as the user that caused it, authenticated with ZEAUTH_SERVICE_TOKEN.
+
+    Delivery is at least once: a trigger can run again if its worker dies before recording the delivery.
+    Triggers receive the id of the record as `outbox_id` and pass it to their actions, which send it to the other
+    services as the Idempotency-Key header so a repeated delivery does not repeat its side effects.
+    """
+    user_token = user_session.set(record.payload.get("user"))
+    roles_token = user_roles.set(record.payload.get("roles") or [])
+    try:
+        async with db_async_session() as session:
+            manager = await import_model(record.model).objects(session)
+            signal_data = {**record.payload["signal_data"], "jwt": ZEAUTH_SERVICE_TOKEN}
+            await getattr(manager, record.hook)(**signal_data, outbox_id=str(record.id))
+    finally:
+        user_session.reset(user_token)
+        user_roles.reset(roles_token)
+
+
+async def deliver(outbox_id: uuid.UUID) -> None:
+    """
+    Deliver an outbox record from the task queue, errors are raised again so the queue retries it
+    """
+    async with db_async_session() as session:
+        record = await claim(session, outbox_id)
+        if record is not None:
+            await process(session, record)
+
+
+async def process(session: AsyncSession, record, retry_delay: float = 0) -> None:
+    """
+    Run the trigger of a leased outbox record and record the outcome, errors are recorded and raised again.
+    A failed record stays leased for `retry_delay` seconds, it is marked failed once it used TASK_MAX_ATTEMPTS attempts.
+    """
+    try:
+        await run(record)
+    except Exception as e:
+        failed = record.attempts >= TASK_MAX_ATTEMPTS
+        await session.execute(
+            update(OutboxModel).where(OutboxModel.id == record.id).values(
+                status='failed' if failed else 'pending',
+                last_error=repr(e),
+                locked_until=func.now() + datetime.timedelta(seconds=retry_delay) if retry_delay and not failed else None,
+                processed_on=func.now() if failed else None
+            )
+        )
+        await session.commit()
+        metrics.inc('outbox.failed' if failed else 'outbox.retried')
+        raise
+    await session.execute(
+        update(OutboxModel).where(OutboxModel.id == record.id).values(
+            status='done', locked_until=None, processed_on=func.now()
+        )
+    )
+    await session.commit()
+    metrics.inc('outbox.delivered')
+
+
+async def measure() -> dict:
+    """
+    Update and return the outbox backlog: number of pending records and age in seconds of the oldest one
+    """
+    async with db_async_session() as session:
+        statement = select(func.count(), func.extract('epoch', func.now() - func.min(OutboxModel.created_on)))\
+            .where(OutboxModel.status == 'pending')
+        pending, lag = (await session.execute(statement)).one()
+    stats["pending"] = pending
+    stats["lag_seconds"] = float(lag or 0)
+    return dict(stats)
+
+
+async def sweep() -> int:
+    """
+    Queue the pending outbox records nobody is delivering, return their number
+    """
+    async with db_async_session() as session:
+        statement = select(OutboxModel.id)\
+            .where(OutboxModel.status == 'pending')\
+            .where(or_(OutboxModel.locked_until.is_(None), OutboxModel.locked_until < func.now()))\
+            .order_by(OutboxModel.created_on)\
+            .limit(OUTBOX_SWEEP_BATCH)
+        outbox_ids = (await session.execute(statement)).scalars().all()
+    for outbox_id in outbox_ids:
+        submit(outbox_id)
+    return len(outbox_ids)
+
+
+async def purge() -> int:
+    """
+    Delete up to OUTBOX_PURGE_BATCH delivered or failed records processed more than OUTBOX_RETENTION_DAYS
+    days ago, return their number
+    """
+    if not OUTBOX_RETENTION_DAYS:
+        return 0
+    async with db_async_session() as session:
+        expired = select(OutboxModel.id)\
+            .where(OutboxModel.status != 'pending')\
+            .where(OutboxModel.processed_on < func.now() - datetime.timedelta(days=OUTBOX_RETENTION_DAYS))\
+            .limit(OUTBOX_PURGE_BATCH)
+        result = await session.execute(
+            delete(OutboxModel).where(OutboxModel.id.in_(expired)).execution_options(synchronize_session=False)
+        )
+        await session.commit()
+    metrics.inc('outbox.purged', result.rowcount)
+    return result.rowcount
+
+
+async def sweep_forever(interval: float = OUTBOX_SWEEP_INTERVAL) -> None:
+    """
+    Sweep the outbox every `interval` seconds, the first sweep recovers the records of a previous run.
+    When a relay delivers the records they are only measured. Each sweep also purges a batch of processed records.
+    """
+    while True:
+        try:
+            if OUTBOX_DELIVERY == 'queue':
+                swept = await sweep()
+                if swept:
+                    log.info(f"queued {swept} pending outbox records")
+            purged = await purge()
+            if purged:
+                log.info(f"purged {purged} processed outbox records")
+            await measure()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.debug(e)
+            log.error("Can not sweep the outbox, check the debug above!")
+        await asyncio.sleep(interval)
@@ -0,0 +1,28 @@
+import os
+import uuid
+
+from sqlalchemy import Column, DateTime, Index, Integer, JSON, Text, func, text
+from business import Base
+from sqlalchemy.dialects.postgresql import UUID
+
+class OutboxModel(Base):
+    """
+    Post-commit triggers waiting for delivery, see `core.outbox`
+    """
+    __tablename__ = 'outbox'
+    __table_args__ = (
+        Index('ix_outbox_pending', 'created_on', postgresql_where=text("status = 'pending'")),
+        Index('ix_outbox_processed', 'processed_on', postgresql_where=text("status <> 'pending'")),
+        {'schema': os.environ.get('DEFAULT_SCHEMA', 'public')}
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    model = Column(Text, nullable=False)  # import path of the model whose manager runs the trigger
+    hook = Column(Text, nullable=False)  # name of the manager method
+    payload = Column(JSON, nullable=False)
+    status = Column(Text, nullable=False, default='pending')  # pending, done or failed
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text)
+    locked_until = Column(DateTime)  # lease of the worker delivering the record
+    created_on = Column(DateTime, server_default=func.now())
+    processed_on = Column(DateTime)
@@ -0,0 +1,36 @@
+import base64
+import datetime
+import json
+import uuid
+from typing import Any
+
+from fastapi import HTTPException, status
+
+from core.logger import log
+
+
+def encode_cursor(obj: Any) -> str:
+    """
+    Return an opaque cursor pointing right after the given record in (created_on, id) order
+    """
+    payload = json.dumps([obj.created_on.isoformat(), str(obj.id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple[datetime.datetime, uuid.UUID]:
+    """
+    Return the (created_on, id) position encoded in the given cursor
+
+    Raises:
+    - HTTPException: Raises HTTPException with a 422 status code if the cursor is malformed.
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_on, obj_id = json.loads(payload)
+        return datetime.datetime.fromisoformat(created_on), uuid.UUID(obj_id)
+    except Exception as e:
+        log.debug(e)
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail={
+            "field_name": "cursor",
+            "message": "cursor is not valid"
+        })
@@ -1,13 +1,21 @@
 import datetime
+import os
 from typing import Optional, Union, List, Any
 
 from fastapi import HTTPException, status
 from mongosql import MongoQuery, InvalidColumnError, MongoQuerySettingsDict
 from mongosql.handlers import MongoFilter
 from pydantic import BaseModel, Field
+from sqlalchemy import func, text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from .depends import set_session_vars
 from .logger import log
+from .query_cache import QueryPlanCache
+
+QUERY_PLAN_CACHE_SIZE = int(os.environ.get('QUERY_PLAN_CACHE_SIZE', 512))
+query_plan_cache = QueryPlanCache(max_size=QUERY_PLAN_CACHE_SIZE)
 
 # add custom $contains filter handler in py-mongosql
 MongoFilter.add_scalar_operator(
@@ -59,7 +67,7 @@ class QuerySchema(BaseModel):
     join: Optional[Union[list, dict]]
     aggregate: Optional[dict]
     group: Optional[List[str]]
-    count: Optional[int] = 1
+    count: Optional[int] = Field(1, title="0: do not count, 1: exact count, 2: estimated count")
 
     class Config:
         json_schema_extra = {
@@ -99,6 +107,12 @@ class BooleanOperatorFilters(BaseModel):
     or_: Optional[List[dict[str, Union[QueryOperator, str]]]] = Field(None, title="any is true", alias="$or")
 
 
+# QuerySchema.count modes
+COUNT_NONE = 0  # do not count
+COUNT_EXACT = 1  # exact count, computed in the same statement as the page with count(*) OVER ()
+COUNT_ESTIMATE = 2  # planner row estimate of the table when there is no filter, exact count otherwise
+
+
 class JSONQ:
     def __init__(self, session: Session, model) -> None:
         self.model = model
@@ -109,38 +123,36 @@ class JSONQ:
             result, aggregates, data, count = None, None, None, None
             # for aggregate actions.
             if req.aggregate:
+                # plain dict filter, operators are given by their aliases
+                filter_ = req.dict(by_alias=True, exclude_none=True).get("filter")
+                # data for aggregate actions
+                data = self._aggregate_query(req.aggregate, filter_, req.group, allowed_aggregates).all()
+
                 # let's get last element of the dict, we need that for success count
                 # We assume that last element should be count action and most usage for
                 # sql language it should be the last element in the query before FROM :)!
                 last_element_key, last_element_val = list(req.aggregate.items())[-1]
-                last_element = {last_element_key: last_element_val}
-                # Calculating COUNT in reg.aggregate
-                count = MongoQuery(self.model, MongoQuerySettingsDict(
-                    aggregate_columns=allowed_aggregates,
-                    aggregate_labels=True
-                )).with_session(self.session).query(
-                    filter=req.filter,
-                    aggregate=last_element,
-                ).end().first()[0]
-
-                # data for aggregate actions
-                data = MongoQuery(self.model, MongoQuerySettingsDict(
-                    aggregate_columns=allowed_aggregates,
-                    aggregate_labels=True,
-                )).with_session(self.session).query(
-                    filter=req.filter,
-                    aggregate=req.aggregate,
-                    group=req.group
-                ).end().all()
+                if req.count == COUNT_NONE:
+                    count = None
+                elif not req.group:
+                    # without groups the single data row already holds the count
+                    count = data[0]._mapping[last_element_key] if data else 0
+                else:
+                    # Calculating COUNT in reg.aggregate
+                    last_element = {last_element_key: last_element_val}
+                    count = self._aggregate_query(last_element, filter_, None, allowed_aggregates).first()[0]
 
             # for none aggregate actions
             if not req.aggregate:
-                # if not aggregate then this is what we are going to do when getting cumulative count
-                count_query = req.dict(by_alias=True, exclude_none=True)
-                count = MongoQuery(self.model).with_session(self.session).query(**count_query).end().first()[0]
                 # we should move count if we want to get all rows
                 query = req.dict(by_alias=True, exclude={"count"}, exclude_none=True)
-                data = MongoQuery(self.model).with_session(self.session).query(**query).end().all()
+                data_query = self._mongoquery(query)
+                if req.count == COUNT_NONE:
+                    data = data_query.all()
+                elif req.count == COUNT_ESTIMATE and not req.filter and (count := self._estimated_count()) is not None:
+                    data = data_query.all()
+                else:
+                    data, count = self._page_with_count(data_query, req)
 
         except InvalidColumnError as e:
             log.debug(e)
@@ -151,4 +163,97 @@ class JSONQ:
         except Exception as e:
             log.debug(e)
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Something went wrong")
+        if req.count == COUNT_NONE:
+            return {"data": data, "count": None}
         return {"data": data, "count": count if count else 0}
+
+    def watermark(self, req: QuerySchema) -> tuple:
+        """
+        Return the number of records matching the filter of the request, their latest update and the sum of
+        their update times. Any write to a matching record changes one of them, see `core.etag`.
+        """
+        filter_ = req.dict(by_alias=True, exclude_none=True).get("filter")
+        updated_on = self.model.updated_on
+        try:
+            query = self._mongoquery({"filter": filter_} if filter_ else {}).order_by(None)
+        except InvalidColumnError as e:
+            log.debug(e)
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail={
+                "field_name": e.where,
+                "message": e.__str__()
+            })
+        return tuple(query.with_entities(
+            func.count(), func.max(updated_on), func.sum(func.extract('epoch', updated_on))
+        ).one())
+
+    def _aggregate_query(self, aggregate: dict, filter: Optional[dict], group: Optional[List[str]], allowed_aggregates: list[str]):
+        """
+        Return the MongoQuery query of the given aggregate
+        """
+        return self._mongoquery(
+            {"filter": filter, "aggregate": aggregate, "group": group},
+            settings={"aggregate_columns": allowed_aggregates, "aggregate_labels": True}
+        )
+
+    def _mongoquery(self, query: dict, settings: Optional[dict] = None):
+        """
+        Return the MongoQuery query of the given request, compiled once per query shape, see `core.query_cache`
+        """
+        def build(request: dict):
+            mongoquery = MongoQuery(self.model, MongoQuerySettingsDict(**settings) if settings else None)
+            return mongoquery.with_session(self.session).query(**request).end()
+
+        return query_plan_cache.query(self.session, self.model, query, build, settings=settings)
+
+    def _page_with_count(self, data_query, req: QuerySchema) -> tuple[list, int]:
+        """
+        Fetch the page and the total number of matching rows in a single statement
+        """
+        rows = data_query.add_columns(func.count().over().label('total_count')).all()
+        if rows:
+            return [row[0] for row in rows], rows[0][-1]
+        if not req.skip:
+            return [], 0
+        # the page is past the last row, so the window has nothing to report
+        count_query = req.dict(by_alias=True, exclude_none=True)
+        count_query['count'] = COUNT_EXACT
+        return [], self._mongoquery(count_query).first()[0]
+
+    def _estimated_count(self) -> Optional[int]:
+        """
+        Return the planner row estimate of the whole table, None if the table has no statistics yet
+        """
+        try:
+            # a failed lookup should not abort the transaction of the data query
+            with self.session.begin_nested():
+                estimate = self.session.execute(
+                    text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table_name AS regclass)"),
+                    {"table_name": self.model.__table__.fullname}
+                ).scalar()
+        except Exception as e:
+            log.debug(e)
+            return None
+        return estimate if estimate is not None and estimate >= 0 else None
+
+
+class AsyncJSONQ:
+    """
+    JSONQ running on an AsyncSession.
+
+    The MongoQuery is compiled and executed by `JSONQ` on the sync facade of the async session, so the
+    filter/sort/project/join/aggregate semantics and the result shape are the same, while every SQL
+    round trip is awaited on the async driver instead of blocking the event loop.
+    """
+    def __init__(self, session: AsyncSession, model) -> None:
+        self.model = model
+        self.session = session
+
+    async def watermark(self, req: QuerySchema) -> tuple:
+        await set_session_vars(self.session)
+        return await self.session.run_sync(lambda session: JSONQ(session, self.model).watermark(req))
+
+    async def query(self, req: QuerySchema, allowed_aggregates: list[str]):
+        await set_session_vars(self.session)
+        return await self.session.run_sync(
+            lambda session: JSONQ(session, self.model).query(req, allowed_aggregates)
+        )
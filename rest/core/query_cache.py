@@ -0,0 +1,180 @@
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql import visitors
+from sqlalchemy.sql.elements import BindParameter
+
+from core.logger import log
+from core.metrics import metrics
+
+# filter operators whose value changes the generated SQL, they stay part of the query shape
+STRUCTURAL_OPERATORS = frozenset(('$exists', '$exist', '$size'))
+BOOLEAN_OPERATORS = frozenset(('$and', '$or', '$nor'))
+PLACEHOLDER_PREFIX = '\x00mq:'
+
+
+class QueryShape:
+    """
+    A MongoQuery request with its literal filter values stripped.
+
+    `template` is the request with every filter value replaced by a unique placeholder, `values`
+    holds the stripped values in the same order and `key` identifies the shape. None and boolean
+    values, and the values of STRUCTURAL_OPERATORS, change the generated SQL so they are kept.
+    """
+
+    def __init__(self, model, query: dict, settings: Optional[dict] = None) -> None:
+        self.values: list[Any] = []
+        self.placeholders: list[str] = []
+        self.template = dict(query)
+        if query.get('filter'):
+            self.template['filter'] = self._strip(query['filter'])
+        self.key = json.dumps(
+            [f"{model.__module__}.{model.__qualname__}", settings, self.template],
+            sort_keys=True,
+            default=str
+        )
+
+    def _placeholder(self, value: Any) -> Any:
+        placeholder = f"{PLACEHOLDER_PREFIX}{len(self.placeholders)}"
+        self.placeholders.append(placeholder)
+        self.values.append(value)
+        # list values compile to a single expanding IN parameter
+        return [placeholder] if isinstance(value, (list, tuple)) else placeholder
+
+    def _strip(self, criteria: Any) -> Any:
+        if isinstance(criteria, dict):
+            stripped = {}
+            for key, value in criteria.items():
+                if key in STRUCTURAL_OPERATORS:
+                    stripped[key] = value
+                elif key in BOOLEAN_OPERATORS and isinstance(value, (list, tuple)):
+                    stripped[key] = [self._strip(item) for item in value]
+                else:
+                    stripped[key] = self._strip(value)
+            return stripped
+        if criteria is None or isinstance(criteria, bool):
+            return criteria
+        return self._placeholder(criteria)
+
+
+class QueryPlan:
+    """
+    A MongoQuery query compiled for a QueryShape, with the keys of the bind parameters holding its placeholders
+    """
+
+    def __init__(self, query: Query, bind_keys: list[str]) -> None:
+        # do not keep the session of the request that compiled the plan alive
+        self.query = query.with_session(None)
+        self.bind_keys = bind_keys
+
+    @classmethod
+    def compile(cls, query: Query, shape: QueryShape) -> Optional['QueryPlan']:
+        """
+        Return the plan of the query built from `shape.template`, None if a placeholder does not end up
+        in exactly one bind parameter of the statement (e.g. a value consumed by a nested loader query)
+        """
+        found: dict[str, list[str]] = {}
+        for element in visitors.iterate(query.statement):
+            if not isinstance(element, BindParameter):
+                continue
+            value = element.value
+            if isinstance(value, (list, tuple)) and len(value) == 1:
+                value = value[0]
+            if isinstance(value, str) and value.startswith(PLACEHOLDER_PREFIX):
+                found.setdefault(value, []).append(element.key)
+        if any(len(found.get(placeholder, [])) != 1 for placeholder in shape.placeholders):
+            return None
+        return cls(query, [found[placeholder][0] for placeholder in shape.placeholders])
+
+    def bind(self, session: Session, values: list[Any]) -> Query:
+        """
+        Return the compiled query bound to the session and the given values
+        """
+        query = self.query.with_session(session)
+        if self.bind_keys:
+            query = query.params(dict(zip(self.bind_keys, values)))
+        return query
+
+
+# cached for shapes that can not be compiled to a plan, so they are not retried on every request
+UNCACHEABLE = object()
+
+
+class QueryPlanCache:
+    """
+    LRU cache of compiled MongoQuery queries keyed by query shape.
+
+    Requests of the same shape reuse the parsed and validated query and only bind their own filter
+    values, skip and limit. The cache holds at most `max_size` plans; hits, misses and shapes that
+    can not be cached are counted in `core.metrics`.
+    """
+
+    def __init__(self, max_size: int = 512) -> None:
+        self.max_size = max_size
+        self._plans: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        metrics.gauge('query_plan_cache.size', lambda: len(self._plans))
+
+    def __len__(self) -> int:
+        return len(self._plans)
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+            return plan
+
+    def set(self, key: str, plan: Any) -> None:
+        with self._lock:
+            self._plans[key] = plan
+            self._plans.move_to_end(key)
+            while len(self._plans) > self.max_size:
+                self._plans.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._plans.clear()
+
+    def query(
+        self,
+        session: Session,
+        model,
+        query: dict,
+        build: Callable[[dict], Query],
+        settings: Optional[dict] = None
+    ) -> Query:
+        """
+        Return the query of the given MongoQuery request, `build` is called with a request to build its
+        query when the shape is not cached yet or can not be cached. Skip and limit are not part of the
+        shape, they are applied to the bound query unless it counts or aggregates
+        """
+        query = dict(query)
+        skip, limit = query.pop('skip', None), query.pop('limit', None)
+        # count and aggregate queries are not paged, mongosql leaves skip and limit out of them as well
+        paged = not query.get('count') and not query.get('aggregate')
+        shape = QueryShape(model, query, settings)
+
+        plan = self.get(shape.key)
+        if plan is None:
+            metrics.inc('query_plan_cache.misses')
+            plan = QueryPlan.compile(build(shape.template), shape) or UNCACHEABLE
+            if plan is UNCACHEABLE:
+                log.debug(f"query shape can not be cached: {shape.key}")
+            self.set(shape.key, plan)
+        elif plan is not UNCACHEABLE:
+            metrics.inc('query_plan_cache.hits')
+
+        if plan is UNCACHEABLE:
+            metrics.inc('query_plan_cache.uncacheable')
+            result = build(query)
+        else:
+            result = plan.bind(session, shape.values)
+        if paged and skip:
+            result = result.offset(skip)
+        if paged and limit:
+            result = result.limit(limit)
+        return result
@@ -0,0 +1,367 @@
+import functools
+import inspect
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Union
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Query as QueryParam
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from starlette.status import HTTP_204_NO_CONTENT, HTTP_200_OK, HTTP_201_CREATED
+
+from core.depends import CommonDependencies, get_async_db, Protect, zeauth_url
+from core.etag import wants_etag, compute_etag, payload_versions, respond
+from core.load_plan import embedded_relationships
+from core.logger import log
+from core.query import AsyncJSONQ, QuerySchema, UnkownOperator, ColumnNotFound
+
+ROLE_PREFIX = 'zekoder-new_verion'
+
+
+@dataclass(frozen=True)
+class CRUDSchemas:
+    """
+    Pydantic schemas of an entity: create and upsert payloads, update payload, record and page of records
+    """
+    create: Any
+    update: Any
+    read: Any
+    read_list: Any
+
+
+def crud_roles(name: str) -> dict:
+    """
+    Return the roles allowed to call each kind of endpoint of the entity with the given (plural) name
+    """
+    return {
+        "read": [f'{ROLE_PREFIX}-{name}-list', f'{ROLE_PREFIX}-{name}-get'],
+        "create": [f'{ROLE_PREFIX}-{name}-create'],
+        "update": [f'{ROLE_PREFIX}-{name}-update'],
+        "delete": [f'{ROLE_PREFIX}-{name}-delete'],
+    }
+
+
+class CRUDHooks:
+    """
+    Entity specific behaviour of a CRUDRouter, the defaults validate nothing and write through the model manager
+    """
+
+    async def validate(self, db: AsyncSession, items: list, ids: Optional[list] = None) -> list:
+        """
+        Validate payloads before they are written, return their errors as [{"index": <index>, "errors": <detail>}].
+        `ids` are the ids of the updated records, when they are not part of the payloads.
+        """
+        return []
+
+    async def create(self, db: AsyncSession, model, schema, **kwargs):
+        obj = await model.objects(db)
+        return await obj.load(schema).create(**kwargs)
+
+    async def create_multiple(self, db: AsyncSession, model, schema, items: list, signal_data: dict) -> list:
+        obj = await model.objects(db)
+        return await obj.load(schema).create_multiple(items, signal_data=signal_data)
+
+    async def upsert_multiple(self, db: AsyncSession, model, schema, items: list, signal_data: dict) -> list:
+        obj = await model.objects(db)
+        return await obj.load(schema).upsert_multiple(items, signal_data=signal_data)
+
+
+def with_parameter_names(func: Callable, **names: str) -> Callable:
+    """
+    Return `func` with some of its parameters renamed as FastAPI sees them, e.g. the `obj_id` query parameter
+    of every entity is exposed with the entity's name (`ad_id`, `customer_id`, ...)
+    """
+    signature = inspect.signature(func)
+    renamed = {new: old for old, new in names.items()}
+
+    @functools.wraps(func)
+    async def endpoint(**kwargs):
+        return await func(**{renamed.get(key, key): value for key, value in kwargs.items()})
+
+    endpoint.__signature__ = signature.replace(parameters=[
+        parameter.replace(name=names.get(parameter.name, parameter.name)) for parameter in signature.parameters.values()
+    ])
+    return endpoint
+
+
+class CRUDRouter:
+    """
+    Router exposing the CRUD endpoints of a model:
+
+    - GET / (list), GET /<single>_id (get) and POST /q (query)
+    - POST / (create), POST /add-<name> (create multiple) and POST /upsert-multiple-<name>
+    - PUT /<single>_id (update), DELETE /<single>_id (delete) and DELETE /delete-<name> (delete multiple)
+
+    `name` is the plural name of the entity, used for its paths, tag and roles, `single` its singular name.
+    """
+
+    def __init__(
+        self,
+        model,
+        schemas: CRUDSchemas,
+        name: str,
+        single: str,
+        roles: Optional[dict] = None,
+        hooks: Optional[CRUDHooks] = None
+    ) -> None:
+        self.model = model
+        self.schemas = schemas
+        self.name = name
+        self.single = single
+        self.roles = roles or crud_roles(name)
+        self.hooks = hooks or CRUDHooks()
+
+    def register(self, router: APIRouter, prefix: str = '') -> None:
+        """
+        Add the endpoints to `router` under `prefix`. Registering on the application's router builds each
+        route once, `include_router` would build every route of an intermediate router a second time.
+        """
+        self._register(router, prefix)
+
+    @functools.cached_property
+    def router(self) -> APIRouter:
+        """
+        Standalone router with the endpoints, for `include_router`, built on first access
+        """
+        router = APIRouter()
+        self._register(router, '')
+        return router
+
+    def _signal_data(self, request: Request, token: Protect, **data) -> dict:
+        return {
+            "jwt": token.credentials,
+            **data,
+            "well_known_urls": {"zeauth": zeauth_url, "self": str(request.base_url)}
+        }
+
+    def _register(self, router: APIRouter, prefix: str) -> None:
+        model, schemas, hooks, roles = self.model, self.schemas, self.hooks, self.roles
+        name, single = self.name, self.single
+        # names used in error messages
+        name_title, single_title = name.replace('_', ' '), single.replace('_', ' ')
+        CreateSchema, UpdateSchema, ReadSchema = schemas.create, schemas.update, schemas.read
+
+        async def list(request: Request, token: Protect = Depends(Protect), db: AsyncSession = Depends(get_async_db), commons: CommonDependencies = Depends(CommonDependencies)):
+            await token.auth(roles["read"])
+            try:
+                obj = (await model.objects(db)).load(ReadSchema)
+                page = {"offset": commons.offset, "limit": commons.size, "cursor": commons.cursor}
+                etag = compute_etag(request, *await obj.page_versions(**page)) if wants_etag(request) else None
+
+                async def render():
+                    result = await obj.all(**page)
+                    content = jsonable_encoder(schemas.read_list(
+                        data=result,
+                        page_size=commons.size,
+                        next_page=int(commons.page) + 1,
+                        next_cursor=obj.next_cursor
+                    ))
+                    versions = [version for item in content['data'] if item for version in payload_versions(item, embedded_relationships(model, ReadSchema))]
+                    return content, compute_etag(request, versions, content['next_cursor'])
+                return await respond(request, etag, render)
+            except HTTPException as e:
+                raise e
+            except Exception as e:
+                log.debug(e)
+                raise HTTPException(500, f"could not fetch list of {single}")
+
+        list.__doc__ = f" List {name}"
+        router.add_api_route(f'{prefix}/', list, methods=['GET'], tags=[name], status_code=HTTP_200_OK, summary=f"List {name}", response_model=schemas.read_list)
+
+        async def get(request: Request, obj_id: str, db: AsyncSession = Depends(get_async_db), token: Protect = Depends(Protect)):
+            await token.auth(roles["read"])
+            try:
+                obj = (await model.objects(db)).load(ReadSchema)
+                etag = None
+                if wants_etag(request):
+                    versions = await obj.record_versions(obj_id)
+                    if versions is None:
+                        raise FileNotFoundError
+                    etag = compute_etag(request, versions)
+
+                async def render():
+                    result = await obj.read(obj_id)
+                    if not result:
+                        raise FileNotFoundError
+                    content = result if isinstance(result, dict) else jsonable_encoder(ReadSchema.from_orm(result))
+                    return content, compute_etag(request, payload_versions(content, embedded_relationships(model, ReadSchema)))
+                return await respond(request, etag, render)
+            except FileNotFoundError:
+                raise HTTPException(status_code=404, detail={
+                    "field_name": f"{{{single}_id}}",
+                    "message": f"<{obj_id}> record not found in  {name}"
+                })
+            except Exception as e:
+                log.debug(e)
+                raise HTTPException(500, f"could not fetch record <{{{single}_id}}>")
+
+        get.__doc__ = f" Get a specific {single} by its id"
+        router.add_api_route(f'{prefix}/{single}_id', with_parameter_names(get, obj_id=f'{single}_id'), methods=['GET'], tags=[name], status_code=HTTP_200_OK, summary=f"Get {single} with ID", response_model=ReadSchema)
+
+        # query records
+        async def query(request: Request, q: QuerySchema, db: AsyncSession = Depends(get_async_db), token: Protect = Depends(Protect)):
+            await token.auth(roles["read"])
+            try:
+                size = q.limit if q.limit else 20
+                page = int(q.skip)/size if q.skip else 1
+                jq = AsyncJSONQ(db, model)
+                log.debug(q)
+                allowed_aggregates = q.group
+                etag = None
+                # the watermark scans the matching records, it is only computed when the client revalidates or the
+                # body may be cached; joined records are not covered by the watermark of the queried table
+                if wants_etag(request) and not q.join:
+                    etag = compute_etag(request, q.dict(by_alias=True), await jq.watermark(q))
+
+                async def render():
+                    result = await jq.query(q, allowed_aggregates)
+                    return jsonable_encoder({
+                        'data': result.get("data", []),
+                        'aggregates': result.get("aggregates", []),
+                        'count': result.get("count", []),
+                        'page_size': size,
+                        'next_page': int(page) + 1
+                    }), None
+                return await respond(request, etag, render)
+            except UnkownOperator as e:
+                log.debug(e)
+                raise HTTPException(400, str(e))
+            except ColumnNotFound as e:
+                log.debug(e)
+                raise HTTPException(400, str(e))
+            except HTTPException as e:
+                raise e
+            except Exception as e:
+                log.debug(e)
+                raise HTTPException(500, "could not fetch list of sessions due to unknown error")
+
+        router.add_api_route(f'{prefix}/q', query, methods=['POST'], tags=[name], status_code=HTTP_200_OK, summary=f"Query {name}: Projection, Limit/skips, Sorting, Filters, Joins, Aggregates, Count, Group")
+
+        async def create(request: Request, item: CreateSchema, db: AsyncSession = Depends(get_async_db), token: Protect = Depends(Protect)):
+            await token.auth(roles["create"])
+            try:
+                errors_info = await hooks.validate(db, [item])
+                if errors_info:
+                    raise HTTPException(status_code=422, detail=errors_info[0]["errors"])
+                new_data = item.dict()
+                kwargs = {
+                    "model_data": new_data,
+                    "signal_data": self._signal_data(request, token, new_data=new_data, old_data={})
+                }
+                return await hooks.create(db, model, ReadSchema, **kwargs)
+            except HTTPException as e:
+                raise e
+            except IntegrityError as e:
+                raise HTTPException(422, e.orig.args[-1])
+            except Exception as e:
+                log.debug(e)
+                raise HTTPException(500, f"creation of new {single_title} failed")
+
+        create.__doc__ = f" Create a new {single}"
+        router.add_api_route(f'{prefix}/', with_parameter_names(create, item=single), methods=['POST'], tags=[name], status_code=HTTP_201_CREATED, summary=f"Create new {single}", response_model=ReadSchema)
+
+        async def create_multiple(request: Request, items: List[CreateSchema], db: AsyncSession = Depends(get_async_db), token: Protect = Depends(Protect)):
+            await token.auth(roles["create"])
+            try:
+                errors_info = await hooks.validate(db, items)
+                if errors_info:
+                    return JSONResponse(errors_info, 422)
+                new_data = [item.dict() for item in items]
+                signal_data = self._signal_data(request, token, old_data={})
+                return await hooks.create_multiple(db, model, ReadSchema, new_data, signal_data)
+            except HTTPException as e:
+                raise e
+            except IntegrityError as e:
+                raise HTTPException(422, e.orig.args[-1])
+            except Exception as e:
+                log.debug(e)
+                raise HTTPException(500, f"creation of new {name_title} failed")
+
+        create_multiple.__doc__ = f" Create multiple new {name}"
+        router.add_api_route(f'{prefix}/add-{name}', with_parameter_names(create_multiple, items=name), methods=['POST'], tags=[name], status_code=HTTP_201_CREATED, summary=f"Create multiple {name}", response_model=List[ReadSchema], name=f'create_multiple_{name}')
+
+        async def upsert_multiple(request: Request, items: List[CreateSchema], db: AsyncSession = Depends(get_async_db), token: Protect = Depends(Protect)):
+            await token.auth(roles["create"])
+            try:
+                errors_info = await hooks.validate(db, items)
+                if errors_info:
+                    return JSONResponse(errors_info, 422)
+                new_data = [item.dict() for item in items]
+                signal_data = self._signal_data(request, token)
+                return await hooks.upsert_multiple(db, model, ReadSchema, new_data, signal_data)
+            except HTTPException as e:
+                raise e
+            except IntegrityError as e:
+                raise HTTPException(422, e.orig.args[-1])
+            except Exception as e:
+                log.debug(e)
+                raise HTTPException(500, f"upsert multiple {name_title} failed")
+
+        upsert_multiple.__doc__ = f" upsert multiple {name}"
+        router.add_api_route(f'{prefix}/upsert-multiple-{name}', with_parameter_names(upsert_multiple, items=name), methods=['POST'], tags=[name], status_code=HTTP_201_CREATED, summary=f"Upsert multiple {name}", response_model=List[ReadSchema], name=f'upsert_multiple_{name}')
+
+        async def update(request: Request, obj_id: Union[str, int], item: UpdateSchema, db: AsyncSession = Depends(get_async_db), token: Protect = Depends(Protect)):
+            await token.auth(roles["update"])
+            try:
+                errors_info = await hooks.validate(db, [item], ids=[obj_id])
+                if errors_info:
+                    raise HTTPException(status_code=422, detail=errors_info[0]["errors"])
+                obj = await model.objects(db)
+                old_data = await obj.get(id=obj_id)
+                new_data = item.dict(exclude_unset=True)
+                kwargs = {
+                    "model_data": new_data,
+                    "signal_data": self._signal_data(request, token, new_data=new_data, old_data=dict(old_data.__dict__) if old_data else {})
+                }
+                obj = await model.objects(db)
+                return await obj.update(obj_id=obj_id, **kwargs)
+            except HTTPException as e:
+                raise e
+            except IntegrityError as e:
+                raise HTTPException(422, e.orig.args[-1])
+            except Exception as e:
+                log.debug(e)
+                raise HTTPException(500, "failed updating session with id <{session_id}>")
+
+        update.__doc__ = f" Update a {single} by its id and payload"
+        router.add_api_route(f'{prefix}/{single}_id', with_parameter_names(update, obj_id=f'{single}_id', item=single), methods=['PUT'], tags=[name], status_code=HTTP_201_CREATED, summary=f"Update {single} with ID")
+
+        async def delete(request: Request, obj_id: Union[str, int], db: AsyncSession = Depends(get_async_db), token: Protect = Depends(Protect)):
+            await token.auth(roles["delete"])
+            try:
+                obj = await model.objects(db)
+                old_data = await obj.get(id=obj_id)
+                if not old_data:
+                    return JSONResponse(content={"message": f"<{obj_id}> record not found in {name}"}, status_code=400)
+                kwargs = {
+                    "model_data": {},
+                    "signal_data": self._signal_data(request, token, new_data={}, old_data=dict(old_data.__dict__) if old_data else {})
+                }
+                obj = await model.objects(db)
+                await obj.delete(obj_id=obj_id, **kwargs)
+            except Exception as e:
+                log.debug(e)
+                raise HTTPException(500, "failed updating session with id <{session_id}>")
+
+        delete.__doc__ = f" Delete a {single} by its id"
+        router.add_api_route(f'{prefix}/{single}_id', with_parameter_names(delete, obj_id=f'{single}_id'), methods=['DELETE'], tags=[name], status_code=HTTP_204_NO_CONTENT, summary=f"Delete {single} with ID", response_class=Response)
+
+        async def delete_multiple(request: Request, obj_ids: List[str] = QueryParam(), db: AsyncSession = Depends(get_async_db), token: Protect = Depends(Protect)):
+            await token.auth(roles["delete"])
+            try:
+                obj = await model.objects(db)
+                all_old_data = await obj.get_multiple(obj_ids=obj_ids)
+                if not all_old_data:
+                    return JSONResponse(content={"message": f"<{obj_ids}> record not found in {name}"}, status_code=400)
+                kwargs = {
+                    "model_data": {},
+                    "signal_data": self._signal_data(request, token, new_data={}, old_data=all_old_data)
+                }
+                await obj.delete_multiple(obj_ids=obj_ids, **kwargs)
+            except Exception as e:
+                log.debug(e)
+                raise HTTPException(500, f"failed deleting {name}_id <{obj_ids}>")
+
+        delete_multiple.__doc__ = f" Delete multiple {name} by list of ids"
+        router.add_api_route(f'{prefix}/delete-{name}', with_parameter_names(delete_multiple, obj_ids=f'{name}_id'), methods=['DELETE'], tags=[name], status_code=HTTP_204_NO_CONTENT, summary=f"Delete multiple {name} with IDs", response_class=Response, name=f'delete_multiple_{name}')
@@ -0,0 +1,130 @@
+import asyncio
+import inspect
+import os
+import random
+from typing import Any, Awaitable, Callable, Optional
+
+from core.logger import log
+from core.metrics import metrics
+
+TASK_WORKERS = int(os.environ.get('TASK_WORKERS', 4))
+TASK_QUEUE_SIZE = int(os.environ.get('TASK_QUEUE_SIZE', 1000))
+TASK_MAX_ATTEMPTS = int(os.environ.get('TASK_MAX_ATTEMPTS', 5))
+TASK_RETRY_BACKOFF = float(os.environ.get('TASK_RETRY_BACKOFF', 1))  # seconds before the first retry
+TASK_MAX_BACKOFF = float(os.environ.get('TASK_MAX_BACKOFF', 60))
+
+
+class TaskQueue:
+    """
+    In-process queue of async jobs executed by a bounded pool of workers.
+
+    A failing job is retried up to `max_attempts` times, with an exponential backoff (plus jitter)
+    between attempts; retries wait outside of the workers so they do not hold a worker slot. Jobs only
+    live in memory, callers needing delivery across restarts persist them first (see `core.outbox`).
+    """
+
+    def __init__(
+        self,
+        workers: int = TASK_WORKERS,
+        max_size: int = TASK_QUEUE_SIZE,
+        max_attempts: int = TASK_MAX_ATTEMPTS,
+        backoff: float = TASK_RETRY_BACKOFF,
+        max_backoff: float = TASK_MAX_BACKOFF
+    ) -> None:
+        self.workers = workers
+        self.max_size = max_size
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: list[asyncio.Task] = []
+        self._retries: set[asyncio.TimerHandle] = set()
+        metrics.gauge('tasks.queued', lambda: self._queue.qsize() if self._queue else 0)
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._workers)
+
+    async def start(self) -> None:
+        """
+        Start the workers, on the running event loop
+        """
+        if self.is_running:
+            return
+        self._queue = asyncio.Queue(self.max_size)
+        self._workers = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self, timeout: float = 10) -> None:
+        """
+        Wait up to `timeout` seconds for the queued jobs, then stop the workers. Pending retries are dropped.
+        """
+        if not self.is_running:
+            return
+        for handle in self._retries:
+            handle.cancel()
+        self._retries.clear()
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            log.warning(f"stopping the task queue with {self._queue.qsize()} queued jobs")
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> bool:
+        """
+        Queue `func(*args, **kwargs)`, return False if the queue is not running or full
+        """
+        return self._put((func, args, kwargs, 1))
+
+    def _put(self, job: tuple) -> bool:
+        if not self.is_running:
+            return False
+        try:
+            self._queue.put_nowait(job)
+            return True
+        except asyncio.QueueFull:
+            metrics.inc('tasks.rejected')
+            log.warning("task queue is full, job rejected")
+            return False
+
+    def _retry(self, job: tuple, delay: float) -> None:
+        def put() -> None:
+            self._retries.discard(handle)
+            self._put(job)
+        handle = asyncio.get_running_loop().call_later(delay, put)
+        self._retries.add(handle)
+
+    async def _work(self) -> None:
+        while True:
+            func, args, kwargs, attempt = await self._queue.get()
+            try:
+                await func(*args, **kwargs)
+                metrics.inc('tasks.succeeded')
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.debug(e)
+                if attempt >= self.max_attempts:
+                    metrics.inc('tasks.failed')
+                    log.error(f"job <{getattr(func, '__qualname__', func)}> failed after {attempt} attempts, check the debug above!")
+                else:
+                    metrics.inc('tasks.retried')
+                    delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1)) * random.uniform(0.5, 1)
+                    log.warning(f"job <{getattr(func, '__qualname__', func)}> failed, retrying in {delay:.1f}s")
+                    self._retry((func, args, kwargs, attempt + 1), delay)
+            finally:
+                self._queue.task_done()
+
+
+async def run_trigger(handler: Callable[..., Any], **kwargs) -> Any:
+    """
+    Run an action handler, blocking (sync) handlers run in a thread so they do not block the event loop
+    """
+    if inspect.iscoroutinefunction(handler):
+        return await handler(**kwargs)
+    return await asyncio.to_thread(handler, **kwargs)
+
+
+task_queue = TaskQueue()
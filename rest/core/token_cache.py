@@ -0,0 +1,121 @@
+import asyncio
+import base64
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+
+from core.logger import log
+
+
+class TokenCache:
+    """
+    In-process LRU cache of token verification results.
+
+    Entries are keyed by a sha256 digest of the bearer token (the raw token is never stored),
+    expire after `ttl` seconds or at the token's own `exp` claim - whichever comes first - and
+    the least recently used entry is evicted once `max_size` is reached. Concurrent lookups for
+    the same token share one in-flight verification instead of each calling upstream.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 60) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple[float, dict]]" = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(token: str) -> str:
+        """
+        Return the cache key of the given token
+        """
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    @staticmethod
+    def token_expiry(token: str) -> Optional[float]:
+        """
+        Read the `exp` claim of a JWT without verifying it, it is only used to bound the cache entry lifetime
+        """
+        try:
+            payload = token.split('.')[1]
+            payload += '=' * (-len(payload) % 4)
+            return float(json.loads(base64.urlsafe_b64decode(payload))['exp'])
+        except Exception:
+            return None
+
+    def get(self, token: str) -> Optional[dict]:
+        """
+        Return the cached verification result of the token, None if missing or expired
+        """
+        key = self.key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, token: str, value: dict) -> None:
+        """
+        Cache the verification result of the token until the cache ttl or the token expiry
+        """
+        expires_at = time.time() + self.ttl
+        token_exp = self.token_expiry(token)
+        if token_exp is not None:
+            expires_at = min(expires_at, token_exp)
+        if expires_at <= time.time():
+            return
+        key = self.key(token)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, token: str) -> None:
+        """
+        Drop the cached verification result of the token
+        """
+        self._entries.pop(self.key(token), None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def get_or_verify(self, token: str, verify: Callable[[str], Awaitable[dict]]) -> dict:
+        """
+        Return the cached verification result of the token or verify it with the given coroutine function.
+        Failed verifications are not cached, every waiter of a failed verification gets its exception.
+        """
+        cached = self.get(token)
+        if cached is not None:
+            return cached
+
+        key = self.key(token)
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await verify(token)
+            self.set(token, value)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            log.debug(e)
+            future.set_exception(e)
+            # mark the exception as retrieved when nobody else is waiting on it
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
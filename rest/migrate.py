@@ -0,0 +1,68 @@
+import argparse
+from dotenv import load_dotenv
+load_dotenv()
+
+from sqlalchemy import create_engine
+
+from core.logger import log
+from core import migrations
+from business import Base, db_sync_url, load_models
+
+# schema migrations of the database, see core/migrations.py:
+#   python migrate.py status             pending migrations and the locks their steps take
+#   python migrate.py upgrade [target]   apply the pending migrations (up to target) and report their locks
+#   python migrate.py baseline           record the migrations as applied, for databases created before them
+#   python migrate.py generate <name>    write a migration bringing the database to the models
+
+
+def status(runner: migrations.MigrationRunner) -> None:
+    with runner.engine.connect() as conn:
+        pending = runner.pending(conn)
+    for migration in pending:
+        print(f"{migration.name} ({'one transaction' if migration.transactional else 'statement by statement'})")
+        for step in migration.steps:
+            print(f"    {step.table or '-':<32} {step.lock or '-':<24} blocks {step.blocks:<40} {step.summary}")
+    if not pending:
+        print("the database is up to date")
+
+
+def generate(runner: migrations.MigrationRunner, name: str) -> None:
+    load_models()
+    import core.outbox_model  # noqa: F401, table of the outbox relay
+    with runner.engine.connect() as conn:
+        if runner.pending(conn):
+            log.warning("apply the pending migrations first, the generated migration would repeat them")
+            return
+        statements = migrations.autogenerate(Base.metadata, conn)
+    if not any(not statement.startswith('--') for statement in statements):
+        print("the database matches the models")
+        for statement in statements:
+            print(statement)
+        return
+    print(f"written {migrations.write_migration(name, statements)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="schema migrations of the database")
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('status')
+    upgrade = commands.add_parser('upgrade')
+    upgrade.add_argument('target', nargs='?')
+    commands.add_parser('baseline')
+    generate_parser = commands.add_parser('generate')
+    generate_parser.add_argument('name')
+    args = parser.parse_args()
+
+    runner = migrations.MigrationRunner(create_engine(db_sync_url))
+    if args.command == 'status':
+        status(runner)
+    elif args.command == 'generate':
+        generate(runner, args.name)
+    else:
+        reports = runner.upgrade(getattr(args, 'target', None), baseline=args.command == 'baseline')
+        if args.command == 'upgrade':
+            print(migrations.format_report(reports) if reports else "the database is up to date")
+
+
+if __name__ == "__main__":
+    main()
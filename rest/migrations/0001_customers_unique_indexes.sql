@@ -0,0 +1,9 @@
+-- Unique indexes enforcing CustomerModel.validate_unique_* in the database.
+-- Existing duplicates must be resolved before running this migration:
+--   SELECT brand_name, count(*) FROM public.customers WHERE brand_name IS NOT NULL GROUP BY 1 HAVING count(*) > 1;
+--   SELECT business_number, count(*) FROM public.customers WHERE business_number IS NOT NULL GROUP BY 1 HAVING count(*) > 1;
+-- The indexes are built concurrently, without blocking writes to customers.
+-- NULL values are not considered equal, customers without a brand name or business number are still allowed.
+
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_customers_brand_name ON public.customers (brand_name);
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_customers_business_number ON public.customers (business_number);
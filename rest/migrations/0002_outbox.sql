@@ -0,0 +1,16 @@
+-- Post-commit triggers waiting for delivery, see core/outbox.py and core/outbox_model.py.
+
+CREATE TABLE IF NOT EXISTS public.outbox (
+    id UUID PRIMARY KEY,
+    model TEXT NOT NULL,
+    hook TEXT NOT NULL,
+    payload JSONB NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    locked_until TIMESTAMP,
+    created_on TIMESTAMP DEFAULT now(),
+    processed_on TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_outbox_pending ON public.outbox (created_on) WHERE status = 'pending';
@@ -0,0 +1,64 @@
+-- Indexes declared on the business models with core.base_model.page_index: every foreign key a child
+-- lookup or relationship load filters on, request_status, and (created_on, id) for the pages of
+-- Manager.all. Each index ends with (created_on, id) so a filtered page is read in order from the index.
+-- brand_name and business_number are already indexed by 0001_customers_unique_indexes.sql.
+-- Customers and folders list their file_assets and folders without the soft deleted ones: those lookups are
+-- served by partial indexes with the predicate of the relationships, deleted IS NOT TRUE.
+--
+-- The indexes are built online, without blocking writes. CREATE INDEX CONCURRENTLY can not run in a
+-- transaction block, `python migrate.py upgrade` runs each statement on its own and drops the INVALID
+-- index a failed concurrent build leaves before building it again.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_ads_created_on_id ON public.ads (created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_ads_strategy_plan ON public.ads (strategy_plan, created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_appointments_created_on_id ON public.appointments (created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_appointments_customer ON public.appointments (customer, created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_brief_audiences_brief ON public.brief_audiences (brief, created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_brief_audiences_created_on_id ON public.brief_audiences (created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_brief_businesses_brief ON public.brief_businesses (brief, created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_brief_businesses_created_on_id ON public.brief_businesses (created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_brief_competitors_brief ON public.brief_competitors (brief, created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_brief_competitors_created_on_id ON public.brief_competitors (created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_brief_extras_brief ON public.brief_extras (brief, created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_brief_extras_created_on_id ON public.brief_extras (created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_brief_marketings_brief ON public.brief_marketings (brief, created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_brief_marketings_created_on_id ON public.brief_marketings (created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_brief_objectives_brief ON public.brief_objectives (brief, created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_brief_objectives_created_on_id ON public.brief_objectives (created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_brief_personas_brief ON public.brief_personas (brief, created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_brief_personas_created_on_id ON public.brief_personas (created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_brief_platforms_brief ON public.brief_platforms (brief, created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_brief_platforms_created_on_id ON public.brief_platforms (created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_brief_products_brief ON public.brief_products (brief, created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_brief_products_created_on_id ON public.brief_products (created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_brief_swots_brief ON public.brief_swots (brief, created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_brief_swots_created_on_id ON public.brief_swots (created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_briefs_created_on_id ON public.briefs (created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_briefs_customer ON public.briefs (customer, created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_content_comments_created_on_id ON public.content_comments (created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_content_comments_strategy_content ON public.content_comments (strategy_content, created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_customers_created_on_id ON public.customers (created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_customers_user ON public.customers ("user", created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_deep_analytics_brief_platform ON public.deep_analytics (brief_platform, created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_deep_analytics_created_on_id ON public.deep_analytics (created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_designs_created_on_id ON public.designs (created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_designs_customer ON public.designs (customer, created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_designs_strategy_content ON public.designs (strategy_content, created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_file_assets_created_on_id ON public.file_assets (created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_file_assets_customer ON public.file_assets (customer, created_on, id) WHERE deleted IS NOT TRUE;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_file_assets_folder ON public.file_assets (folder, created_on, id) WHERE deleted IS NOT TRUE;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_folders_created_on_id ON public.folders (created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_folders_customer ON public.folders (customer, created_on, id) WHERE deleted IS NOT TRUE;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_strategies_created_on_id ON public.strategies (created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_strategies_customer ON public.strategies (customer, created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_strategy_audiences_created_on_id ON public.strategy_audiences (created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_strategy_audiences_strategy ON public.strategy_audiences (strategy, created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_strategy_contents_created_on_id ON public.strategy_contents (created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_strategy_contents_request_status ON public.strategy_contents (request_status, created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_strategy_contents_strategy_plan ON public.strategy_contents (strategy_plan, created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_strategy_objectives_created_on_id ON public.strategy_objectives (created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_strategy_objectives_strategy ON public.strategy_objectives (strategy, created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_strategy_personas_created_on_id ON public.strategy_personas (created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_strategy_personas_strategy ON public.strategy_personas (strategy, created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_strategy_plans_created_on_id ON public.strategy_plans (created_on, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_strategy_plans_strategy ON public.strategy_plans (strategy, created_on, id);
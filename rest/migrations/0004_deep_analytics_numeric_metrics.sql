@@ -0,0 +1,91 @@
+-- Numeric columns for the deep analytics metrics stored as text, step 1 of 2: the columns are added next to the
+-- text ones as <metric>_numeric and filled from them. Values are parsed as the deep analytics schemas parse
+-- them (1200, 1,200, 1.2k, 3M, 4.5%), values that are not numbers are left NULL; the text columns are kept.
+-- Adding the columns only changes the catalog and each backfill statement commits on its own, the table is
+-- never locked against reads or writes for long.
+-- migrate: no-transaction
+
+ALTER TABLE public.deep_analytics ADD COLUMN IF NOT EXISTS website_visits_numeric BIGINT;
+ALTER TABLE public.deep_analytics ADD COLUMN IF NOT EXISTS facebook_engagement_rate_numeric NUMERIC;
+ALTER TABLE public.deep_analytics ADD COLUMN IF NOT EXISTS facebook_followers_numeric BIGINT;
+ALTER TABLE public.deep_analytics ADD COLUMN IF NOT EXISTS facebook_likes_numeric BIGINT;
+ALTER TABLE public.deep_analytics ADD COLUMN IF NOT EXISTS facebook_comments_numeric BIGINT;
+ALTER TABLE public.deep_analytics ADD COLUMN IF NOT EXISTS facebook_share_numeric BIGINT;
+ALTER TABLE public.deep_analytics ADD COLUMN IF NOT EXISTS facebook_monthly_posts_numeric BIGINT;
+ALTER TABLE public.deep_analytics ADD COLUMN IF NOT EXISTS facebook_ads_revenue_numeric NUMERIC;
+ALTER TABLE public.deep_analytics ADD COLUMN IF NOT EXISTS instagram_followes_numeric BIGINT;
+ALTER TABLE public.deep_analytics ADD COLUMN IF NOT EXISTS twitter_followes_numeric BIGINT;
+ALTER TABLE public.deep_analytics ADD COLUMN IF NOT EXISTS tiktok_followes_numeric BIGINT;
+ALTER TABLE public.deep_analytics ADD COLUMN IF NOT EXISTS youtube_followes_numeric BIGINT;
+
+UPDATE public.deep_analytics AS d SET website_visits_numeric = parsed.value FROM (
+    SELECT id, trunc(rtrim(v, 'kmb')::NUMERIC * CASE right(v, 1) WHEN 'k' THEN 1000 WHEN 'm' THEN 1000000 WHEN 'b' THEN 1000000000 ELSE 1 END)::BIGINT AS value
+    FROM (SELECT id, lower(regexp_replace(website_visits, '[\s,%+]', '', 'g')) AS v FROM public.deep_analytics WHERE website_visits_numeric IS NULL) AS metric
+    WHERE v ~ '^-?[0-9]+(\.[0-9]+)?[kmb]?$'
+) AS parsed WHERE d.id = parsed.id;
+
+UPDATE public.deep_analytics AS d SET facebook_engagement_rate_numeric = parsed.value FROM (
+    SELECT id, rtrim(v, 'kmb')::NUMERIC * CASE right(v, 1) WHEN 'k' THEN 1000 WHEN 'm' THEN 1000000 WHEN 'b' THEN 1000000000 ELSE 1 END AS value
+    FROM (SELECT id, lower(regexp_replace(facebook_engagement_rate, '[\s,%+]', '', 'g')) AS v FROM public.deep_analytics WHERE facebook_engagement_rate_numeric IS NULL) AS metric
+    WHERE v ~ '^-?[0-9]+(\.[0-9]+)?[kmb]?$'
+) AS parsed WHERE d.id = parsed.id;
+
+UPDATE public.deep_analytics AS d SET facebook_followers_numeric = parsed.value FROM (
+    SELECT id, trunc(rtrim(v, 'kmb')::NUMERIC * CASE right(v, 1) WHEN 'k' THEN 1000 WHEN 'm' THEN 1000000 WHEN 'b' THEN 1000000000 ELSE 1 END)::BIGINT AS value
+    FROM (SELECT id, lower(regexp_replace(facebook_followers, '[\s,%+]', '', 'g')) AS v FROM public.deep_analytics WHERE facebook_followers_numeric IS NULL) AS metric
+    WHERE v ~ '^-?[0-9]+(\.[0-9]+)?[kmb]?$'
+) AS parsed WHERE d.id = parsed.id;
+
+UPDATE public.deep_analytics AS d SET facebook_likes_numeric = parsed.value FROM (
+    SELECT id, trunc(rtrim(v, 'kmb')::NUMERIC * CASE right(v, 1) WHEN 'k' THEN 1000 WHEN 'm' THEN 1000000 WHEN 'b' THEN 1000000000 ELSE 1 END)::BIGINT AS value
+    FROM (SELECT id, lower(regexp_replace(facebook_likes, '[\s,%+]', '', 'g')) AS v FROM public.deep_analytics WHERE facebook_likes_numeric IS NULL) AS metric
+    WHERE v ~ '^-?[0-9]+(\.[0-9]+)?[kmb]?$'
+) AS parsed WHERE d.id = parsed.id;
+
+UPDATE public.deep_analytics AS d SET facebook_comments_numeric = parsed.value FROM (
+    SELECT id, trunc(rtrim(v, 'kmb')::NUMERIC * CASE right(v, 1) WHEN 'k' THEN 1000 WHEN 'm' THEN 1000000 WHEN 'b' THEN 1000000000 ELSE 1 END)::BIGINT AS value
+    FROM (SELECT id, lower(regexp_replace(facebook_comments, '[\s,%+]', '', 'g')) AS v FROM public.deep_analytics WHERE facebook_comments_numeric IS NULL) AS metric
+    WHERE v ~ '^-?[0-9]+(\.[0-9]+)?[kmb]?$'
+) AS parsed WHERE d.id = parsed.id;
+
+UPDATE public.deep_analytics AS d SET facebook_share_numeric = parsed.value FROM (
+    SELECT id, trunc(rtrim(v, 'kmb')::NUMERIC * CASE right(v, 1) WHEN 'k' THEN 1000 WHEN 'm' THEN 1000000 WHEN 'b' THEN 1000000000 ELSE 1 END)::BIGINT AS value
+    FROM (SELECT id, lower(regexp_replace(facebook_share, '[\s,%+]', '', 'g')) AS v FROM public.deep_analytics WHERE facebook_share_numeric IS NULL) AS metric
+    WHERE v ~ '^-?[0-9]+(\.[0-9]+)?[kmb]?$'
+) AS parsed WHERE d.id = parsed.id;
+
+UPDATE public.deep_analytics AS d SET facebook_monthly_posts_numeric = parsed.value FROM (
+    SELECT id, trunc(rtrim(v, 'kmb')::NUMERIC * CASE right(v, 1) WHEN 'k' THEN 1000 WHEN 'm' THEN 1000000 WHEN 'b' THEN 1000000000 ELSE 1 END)::BIGINT AS value
+    FROM (SELECT id, lower(regexp_replace(facebook_monthly_posts, '[\s,%+]', '', 'g')) AS v FROM public.deep_analytics WHERE facebook_monthly_posts_numeric IS NULL) AS metric
+    WHERE v ~ '^-?[0-9]+(\.[0-9]+)?[kmb]?$'
+) AS parsed WHERE d.id = parsed.id;
+
+UPDATE public.deep_analytics AS d SET facebook_ads_revenue_numeric = parsed.value FROM (
+    SELECT id, rtrim(v, 'kmb')::NUMERIC * CASE right(v, 1) WHEN 'k' THEN 1000 WHEN 'm' THEN 1000000 WHEN 'b' THEN 1000000000 ELSE 1 END AS value
+    FROM (SELECT id, lower(regexp_replace(facebook_ads_revenue, '[\s,%+]', '', 'g')) AS v FROM public.deep_analytics WHERE facebook_ads_revenue_numeric IS NULL) AS metric
+    WHERE v ~ '^-?[0-9]+(\.[0-9]+)?[kmb]?$'
+) AS parsed WHERE d.id = parsed.id;
+
+UPDATE public.deep_analytics AS d SET instagram_followes_numeric = parsed.value FROM (
+    SELECT id, trunc(rtrim(v, 'kmb')::NUMERIC * CASE right(v, 1) WHEN 'k' THEN 1000 WHEN 'm' THEN 1000000 WHEN 'b' THEN 1000000000 ELSE 1 END)::BIGINT AS value
+    FROM (SELECT id, lower(regexp_replace(instagram_followes, '[\s,%+]', '', 'g')) AS v FROM public.deep_analytics WHERE instagram_followes_numeric IS NULL) AS metric
+    WHERE v ~ '^-?[0-9]+(\.[0-9]+)?[kmb]?$'
+) AS parsed WHERE d.id = parsed.id;
+
+UPDATE public.deep_analytics AS d SET twitter_followes_numeric = parsed.value FROM (
+    SELECT id, trunc(rtrim(v, 'kmb')::NUMERIC * CASE right(v, 1) WHEN 'k' THEN 1000 WHEN 'm' THEN 1000000 WHEN 'b' THEN 1000000000 ELSE 1 END)::BIGINT AS value
+    FROM (SELECT id, lower(regexp_replace(twitter_followes, '[\s,%+]', '', 'g')) AS v FROM public.deep_analytics WHERE twitter_followes_numeric IS NULL) AS metric
+    WHERE v ~ '^-?[0-9]+(\.[0-9]+)?[kmb]?$'
+) AS parsed WHERE d.id = parsed.id;
+
+UPDATE public.deep_analytics AS d SET tiktok_followes_numeric = parsed.value FROM (
+    SELECT id, trunc(rtrim(v, 'kmb')::NUMERIC * CASE right(v, 1) WHEN 'k' THEN 1000 WHEN 'm' THEN 1000000 WHEN 'b' THEN 1000000000 ELSE 1 END)::BIGINT AS value
+    FROM (SELECT id, lower(regexp_replace(tiktok_followes, '[\s,%+]', '', 'g')) AS v FROM public.deep_analytics WHERE tiktok_followes_numeric IS NULL) AS metric
+    WHERE v ~ '^-?[0-9]+(\.[0-9]+)?[kmb]?$'
+) AS parsed WHERE d.id = parsed.id;
+
+UPDATE public.deep_analytics AS d SET youtube_followes_numeric = parsed.value FROM (
+    SELECT id, trunc(rtrim(v, 'kmb')::NUMERIC * CASE right(v, 1) WHEN 'k' THEN 1000 WHEN 'm' THEN 1000000 WHEN 'b' THEN 1000000000 ELSE 1 END)::BIGINT AS value
+    FROM (SELECT id, lower(regexp_replace(youtube_followes, '[\s,%+]', '', 'g')) AS v FROM public.deep_analytics WHERE youtube_followes_numeric IS NULL) AS metric
+    WHERE v ~ '^-?[0-9]+(\.[0-9]+)?[kmb]?$'
+) AS parsed WHERE d.id = parsed.id;
@@ -0,0 +1,93 @@
+-- Numeric columns for the deep analytics metrics, step 2 of 2: in one transaction the text columns are renamed
+-- <metric>_text and the numeric ones take their names, then every row whose number does not match its text is
+-- recomputed: the rows written since step 1, and the rows step 1 filled that were updated since. The renames
+-- come first so no write of the previous version can land between the catch-up and the swap: on PostgreSQL
+-- they lock the table until the catch-up commits, elsewhere the previous version can not write the renamed
+-- columns anymore. Deploy the API expecting numeric metrics right after. The <metric>_text columns can be
+-- dropped once the values left NULL are checked:
+--   SELECT id, website_visits_text FROM public.deep_analytics WHERE website_visits IS NULL AND website_visits_text IS NOT NULL;
+
+ALTER TABLE public.deep_analytics RENAME COLUMN website_visits TO website_visits_text;
+ALTER TABLE public.deep_analytics RENAME COLUMN website_visits_numeric TO website_visits;
+ALTER TABLE public.deep_analytics RENAME COLUMN facebook_engagement_rate TO facebook_engagement_rate_text;
+ALTER TABLE public.deep_analytics RENAME COLUMN facebook_engagement_rate_numeric TO facebook_engagement_rate;
+ALTER TABLE public.deep_analytics RENAME COLUMN facebook_followers TO facebook_followers_text;
+ALTER TABLE public.deep_analytics RENAME COLUMN facebook_followers_numeric TO facebook_followers;
+ALTER TABLE public.deep_analytics RENAME COLUMN facebook_likes TO facebook_likes_text;
+ALTER TABLE public.deep_analytics RENAME COLUMN facebook_likes_numeric TO facebook_likes;
+ALTER TABLE public.deep_analytics RENAME COLUMN facebook_comments TO facebook_comments_text;
+ALTER TABLE public.deep_analytics RENAME COLUMN facebook_comments_numeric TO facebook_comments;
+ALTER TABLE public.deep_analytics RENAME COLUMN facebook_share TO facebook_share_text;
+ALTER TABLE public.deep_analytics RENAME COLUMN facebook_share_numeric TO facebook_share;
+ALTER TABLE public.deep_analytics RENAME COLUMN facebook_monthly_posts TO facebook_monthly_posts_text;
+ALTER TABLE public.deep_analytics RENAME COLUMN facebook_monthly_posts_numeric TO facebook_monthly_posts;
+ALTER TABLE public.deep_analytics RENAME COLUMN facebook_ads_revenue TO facebook_ads_revenue_text;
+ALTER TABLE public.deep_analytics RENAME COLUMN facebook_ads_revenue_numeric TO facebook_ads_revenue;
+ALTER TABLE public.deep_analytics RENAME COLUMN instagram_followes TO instagram_followes_text;
+ALTER TABLE public.deep_analytics RENAME COLUMN instagram_followes_numeric TO instagram_followes;
+ALTER TABLE public.deep_analytics RENAME COLUMN twitter_followes TO twitter_followes_text;
+ALTER TABLE public.deep_analytics RENAME COLUMN twitter_followes_numeric TO twitter_followes;
+ALTER TABLE public.deep_analytics RENAME COLUMN tiktok_followes TO tiktok_followes_text;
+ALTER TABLE public.deep_analytics RENAME COLUMN tiktok_followes_numeric TO tiktok_followes;
+ALTER TABLE public.deep_analytics RENAME COLUMN youtube_followes TO youtube_followes_text;
+ALTER TABLE public.deep_analytics RENAME COLUMN youtube_followes_numeric TO youtube_followes;
+
+UPDATE public.deep_analytics AS d SET website_visits = parsed.value FROM (
+    SELECT id, CASE WHEN v ~ '^-?[0-9]+(\.[0-9]+)?[kmb]?$' THEN trunc(rtrim(v, 'kmb')::NUMERIC * CASE right(v, 1) WHEN 'k' THEN 1000 WHEN 'm' THEN 1000000 WHEN 'b' THEN 1000000000 ELSE 1 END)::BIGINT END AS value
+    FROM (SELECT id, lower(regexp_replace(website_visits_text, '[\s,%+]', '', 'g')) AS v FROM public.deep_analytics) AS metric
+) AS parsed WHERE d.id = parsed.id AND d.website_visits IS DISTINCT FROM parsed.value;
+
+UPDATE public.deep_analytics AS d SET facebook_engagement_rate = parsed.value FROM (
+    SELECT id, CASE WHEN v ~ '^-?[0-9]+(\.[0-9]+)?[kmb]?$' THEN rtrim(v, 'kmb')::NUMERIC * CASE right(v, 1) WHEN 'k' THEN 1000 WHEN 'm' THEN 1000000 WHEN 'b' THEN 1000000000 ELSE 1 END END AS value
+    FROM (SELECT id, lower(regexp_replace(facebook_engagement_rate_text, '[\s,%+]', '', 'g')) AS v FROM public.deep_analytics) AS metric
+) AS parsed WHERE d.id = parsed.id AND d.facebook_engagement_rate IS DISTINCT FROM parsed.value;
+
+UPDATE public.deep_analytics AS d SET facebook_followers = parsed.value FROM (
+    SELECT id, CASE WHEN v ~ '^-?[0-9]+(\.[0-9]+)?[kmb]?$' THEN trunc(rtrim(v, 'kmb')::NUMERIC * CASE right(v, 1) WHEN 'k' THEN 1000 WHEN 'm' THEN 1000000 WHEN 'b' THEN 1000000000 ELSE 1 END)::BIGINT END AS value
+    FROM (SELECT id, lower(regexp_replace(facebook_followers_text, '[\s,%+]', '', 'g')) AS v FROM public.deep_analytics) AS metric
+) AS parsed WHERE d.id = parsed.id AND d.facebook_followers IS DISTINCT FROM parsed.value;
+
+UPDATE public.deep_analytics AS d SET facebook_likes = parsed.value FROM (
+    SELECT id, CASE WHEN v ~ '^-?[0-9]+(\.[0-9]+)?[kmb]?$' THEN trunc(rtrim(v, 'kmb')::NUMERIC * CASE right(v, 1) WHEN 'k' THEN 1000 WHEN 'm' THEN 1000000 WHEN 'b' THEN 1000000000 ELSE 1 END)::BIGINT END AS value
+    FROM (SELECT id, lower(regexp_replace(facebook_likes_text, '[\s,%+]', '', 'g')) AS v FROM public.deep_analytics) AS metric
+) AS parsed WHERE d.id = parsed.id AND d.facebook_likes IS DISTINCT FROM parsed.value;
+
+UPDATE public.deep_analytics AS d SET facebook_comments = parsed.value FROM (
+    SELECT id, CASE WHEN v ~ '^-?[0-9]+(\.[0-9]+)?[kmb]?$' THEN trunc(rtrim(v, 'kmb')::NUMERIC * CASE right(v, 1) WHEN 'k' THEN 1000 WHEN 'm' THEN 1000000 WHEN 'b' THEN 1000000000 ELSE 1 END)::BIGINT END AS value
+    FROM (SELECT id, lower(regexp_replace(facebook_comments_text, '[\s,%+]', '', 'g')) AS v FROM public.deep_analytics) AS metric
+) AS parsed WHERE d.id = parsed.id AND d.facebook_comments IS DISTINCT FROM parsed.value;
+
+UPDATE public.deep_analytics AS d SET facebook_share = parsed.value FROM (
+    SELECT id, CASE WHEN v ~ '^-?[0-9]+(\.[0-9]+)?[kmb]?$' THEN trunc(rtrim(v, 'kmb')::NUMERIC * CASE right(v, 1) WHEN 'k' THEN 1000 WHEN 'm' THEN 1000000 WHEN 'b' THEN 1000000000 ELSE 1 END)::BIGINT END AS value
+    FROM (SELECT id, lower(regexp_replace(facebook_share_text, '[\s,%+]', '', 'g')) AS v FROM public.deep_analytics) AS metric
+) AS parsed WHERE d.id = parsed.id AND d.facebook_share IS DISTINCT FROM parsed.value;
+
+UPDATE public.deep_analytics AS d SET facebook_monthly_posts = parsed.value FROM (
+    SELECT id, CASE WHEN v ~ '^-?[0-9]+(\.[0-9]+)?[kmb]?$' THEN trunc(rtrim(v, 'kmb')::NUMERIC * CASE right(v, 1) WHEN 'k' THEN 1000 WHEN 'm' THEN 1000000 WHEN 'b' THEN 1000000000 ELSE 1 END)::BIGINT END AS value
+    FROM (SELECT id, lower(regexp_replace(facebook_monthly_posts_text, '[\s,%+]', '', 'g')) AS v FROM public.deep_analytics) AS metric
+) AS parsed WHERE d.id = parsed.id AND d.facebook_monthly_posts IS DISTINCT FROM parsed.value;
+
+UPDATE public.deep_analytics AS d SET facebook_ads_revenue = parsed.value FROM (
+    SELECT id, CASE WHEN v ~ '^-?[0-9]+(\.[0-9]+)?[kmb]?$' THEN rtrim(v, 'kmb')::NUMERIC * CASE right(v, 1) WHEN 'k' THEN 1000 WHEN 'm' THEN 1000000 WHEN 'b' THEN 1000000000 ELSE 1 END END AS value
+    FROM (SELECT id, lower(regexp_replace(facebook_ads_revenue_text, '[\s,%+]', '', 'g')) AS v FROM public.deep_analytics) AS metric
+) AS parsed WHERE d.id = parsed.id AND d.facebook_ads_revenue IS DISTINCT FROM parsed.value;
+
+UPDATE public.deep_analytics AS d SET instagram_followes = parsed.value FROM (
+    SELECT id, CASE WHEN v ~ '^-?[0-9]+(\.[0-9]+)?[kmb]?$' THEN trunc(rtrim(v, 'kmb')::NUMERIC * CASE right(v, 1) WHEN 'k' THEN 1000 WHEN 'm' THEN 1000000 WHEN 'b' THEN 1000000000 ELSE 1 END)::BIGINT END AS value
+    FROM (SELECT id, lower(regexp_replace(instagram_followes_text, '[\s,%+]', '', 'g')) AS v FROM public.deep_analytics) AS metric
+) AS parsed WHERE d.id = parsed.id AND d.instagram_followes IS DISTINCT FROM parsed.value;
+
+UPDATE public.deep_analytics AS d SET twitter_followes = parsed.value FROM (
+    SELECT id, CASE WHEN v ~ '^-?[0-9]+(\.[0-9]+)?[kmb]?$' THEN trunc(rtrim(v, 'kmb')::NUMERIC * CASE right(v, 1) WHEN 'k' THEN 1000 WHEN 'm' THEN 1000000 WHEN 'b' THEN 1000000000 ELSE 1 END)::BIGINT END AS value
+    FROM (SELECT id, lower(regexp_replace(twitter_followes_text, '[\s,%+]', '', 'g')) AS v FROM public.deep_analytics) AS metric
+) AS parsed WHERE d.id = parsed.id AND d.twitter_followes IS DISTINCT FROM parsed.value;
+
+UPDATE public.deep_analytics AS d SET tiktok_followes = parsed.value FROM (
+    SELECT id, CASE WHEN v ~ '^-?[0-9]+(\.[0-9]+)?[kmb]?$' THEN trunc(rtrim(v, 'kmb')::NUMERIC * CASE right(v, 1) WHEN 'k' THEN 1000 WHEN 'm' THEN 1000000 WHEN 'b' THEN 1000000000 ELSE 1 END)::BIGINT END AS value
+    FROM (SELECT id, lower(regexp_replace(tiktok_followes_text, '[\s,%+]', '', 'g')) AS v FROM public.deep_analytics) AS metric
+) AS parsed WHERE d.id = parsed.id AND d.tiktok_followes IS DISTINCT FROM parsed.value;
+
+UPDATE public.deep_analytics AS d SET youtube_followes = parsed.value FROM (
+    SELECT id, CASE WHEN v ~ '^-?[0-9]+(\.[0-9]+)?[kmb]?$' THEN trunc(rtrim(v, 'kmb')::NUMERIC * CASE right(v, 1) WHEN 'k' THEN 1000 WHEN 'm' THEN 1000000 WHEN 'b' THEN 1000000000 ELSE 1 END)::BIGINT END AS value
+    FROM (SELECT id, lower(regexp_replace(youtube_followes_text, '[\s,%+]', '', 'g')) AS v FROM public.deep_analytics) AS metric
+) AS parsed WHERE d.id = parsed.id AND d.youtube_followes IS DISTINCT FROM parsed.value;
@@ -0,0 +1,60 @@
+-- Rollups of the numeric deep analytics metrics by brief and platform type, see business/deep_analytics_rollups_model.py.
+-- They are recomputed by the API in the transactions writing deep analytics, this fills them for the existing ones.
+-- gen_random_uuid() is built in from PostgreSQL 13 and in CockroachDB.
+
+CREATE TABLE IF NOT EXISTS public.deep_analytics_rollups (
+    id UUID PRIMARY KEY,
+    created_by UUID,
+    updated_by UUID,
+    created_on TIMESTAMP DEFAULT now(),
+    updated_on TIMESTAMP DEFAULT now(),
+    brief UUID NOT NULL REFERENCES public.briefs (id),
+    platform_type platformtypeenum NOT NULL,
+    metric TEXT NOT NULL,
+    samples BIGINT NOT NULL,
+    total NUMERIC,
+    minimum NUMERIC,
+    maximum NUMERIC
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS ix_deep_analytics_rollups_brief_platform_type_metric ON public.deep_analytics_rollups (brief, platform_type, metric);
+
+INSERT INTO public.deep_analytics_rollups (id, brief, platform_type, metric, samples, total, minimum, maximum)
+SELECT gen_random_uuid(), rollup.* FROM (
+    SELECT bp.brief, d.platform_type, 'website_visits', count(d.website_visits), sum(d.website_visits)::NUMERIC, min(d.website_visits)::NUMERIC, max(d.website_visits)::NUMERIC
+    FROM public.deep_analytics AS d JOIN public.brief_platforms AS bp ON bp.id = d.brief_platform GROUP BY bp.brief, d.platform_type
+    UNION ALL
+    SELECT bp.brief, d.platform_type, 'facebook_engagement_rate', count(d.facebook_engagement_rate), sum(d.facebook_engagement_rate)::NUMERIC, min(d.facebook_engagement_rate)::NUMERIC, max(d.facebook_engagement_rate)::NUMERIC
+    FROM public.deep_analytics AS d JOIN public.brief_platforms AS bp ON bp.id = d.brief_platform GROUP BY bp.brief, d.platform_type
+    UNION ALL
+    SELECT bp.brief, d.platform_type, 'facebook_followers', count(d.facebook_followers), sum(d.facebook_followers)::NUMERIC, min(d.facebook_followers)::NUMERIC, max(d.facebook_followers)::NUMERIC
+    FROM public.deep_analytics AS d JOIN public.brief_platforms AS bp ON bp.id = d.brief_platform GROUP BY bp.brief, d.platform_type
+    UNION ALL
+    SELECT bp.brief, d.platform_type, 'facebook_likes', count(d.facebook_likes), sum(d.facebook_likes)::NUMERIC, min(d.facebook_likes)::NUMERIC, max(d.facebook_likes)::NUMERIC
+    FROM public.deep_analytics AS d JOIN public.brief_platforms AS bp ON bp.id = d.brief_platform GROUP BY bp.brief, d.platform_type
+    UNION ALL
+    SELECT bp.brief, d.platform_type, 'facebook_comments', count(d.facebook_comments), sum(d.facebook_comments)::NUMERIC, min(d.facebook_comments)::NUMERIC, max(d.facebook_comments)::NUMERIC
+    FROM public.deep_analytics AS d JOIN public.brief_platforms AS bp ON bp.id = d.brief_platform GROUP BY bp.brief, d.platform_type
+    UNION ALL
+    SELECT bp.brief, d.platform_type, 'facebook_share', count(d.facebook_share), sum(d.facebook_share)::NUMERIC, min(d.facebook_share)::NUMERIC, max(d.facebook_share)::NUMERIC
+    FROM public.deep_analytics AS d JOIN public.brief_platforms AS bp ON bp.id = d.brief_platform GROUP BY bp.brief, d.platform_type
+    UNION ALL
+    SELECT bp.brief, d.platform_type, 'facebook_monthly_posts', count(d.facebook_monthly_posts), sum(d.facebook_monthly_posts)::NUMERIC, min(d.facebook_monthly_posts)::NUMERIC, max(d.facebook_monthly_posts)::NUMERIC
+    FROM public.deep_analytics AS d JOIN public.brief_platforms AS bp ON bp.id = d.brief_platform GROUP BY bp.brief, d.platform_type
+    UNION ALL
+    SELECT bp.brief, d.platform_type, 'facebook_ads_revenue', count(d.facebook_ads_revenue), sum(d.facebook_ads_revenue)::NUMERIC, min(d.facebook_ads_revenue)::NUMERIC, max(d.facebook_ads_revenue)::NUMERIC
+    FROM public.deep_analytics AS d JOIN public.brief_platforms AS bp ON bp.id = d.brief_platform GROUP BY bp.brief, d.platform_type
+    UNION ALL
+    SELECT bp.brief, d.platform_type, 'instagram_followes', count(d.instagram_followes), sum(d.instagram_followes)::NUMERIC, min(d.instagram_followes)::NUMERIC, max(d.instagram_followes)::NUMERIC
+    FROM public.deep_analytics AS d JOIN public.brief_platforms AS bp ON bp.id = d.brief_platform GROUP BY bp.brief, d.platform_type
+    UNION ALL
+    SELECT bp.brief, d.platform_type, 'twitter_followes', count(d.twitter_followes), sum(d.twitter_followes)::NUMERIC, min(d.twitter_followes)::NUMERIC, max(d.twitter_followes)::NUMERIC
+    FROM public.deep_analytics AS d JOIN public.brief_platforms AS bp ON bp.id = d.brief_platform GROUP BY bp.brief, d.platform_type
+    UNION ALL
+    SELECT bp.brief, d.platform_type, 'tiktok_followes', count(d.tiktok_followes), sum(d.tiktok_followes)::NUMERIC, min(d.tiktok_followes)::NUMERIC, max(d.tiktok_followes)::NUMERIC
+    FROM public.deep_analytics AS d JOIN public.brief_platforms AS bp ON bp.id = d.brief_platform GROUP BY bp.brief, d.platform_type
+    UNION ALL
+    SELECT bp.brief, d.platform_type, 'youtube_followes', count(d.youtube_followes), sum(d.youtube_followes)::NUMERIC, min(d.youtube_followes)::NUMERIC, max(d.youtube_followes)::NUMERIC
+    FROM public.deep_analytics AS d JOIN public.brief_platforms AS bp ON bp.id = d.brief_platform GROUP BY bp.brief, d.platform_type
+) AS rollup
+ON CONFLICT (brief, platform_type, metric) DO NOTHING;
@@ -0,0 +1,38 @@
+-- History of the deep analytics metrics of each brief platform, see business/deep_analytics_snapshots_model.py.
+-- Every deep analytics write updates the hour, day and week buckets holding the current time, the outbox relay
+-- (or the API workers when OUTBOX_DELIVERY=queue) deletes the buckets past their retention. This seeds the buckets holding the last update of the existing deep
+-- analytics; when a brief platform has several, one of them is kept. gen_random_uuid() is built in from
+-- PostgreSQL 13 and in CockroachDB.
+
+CREATE TABLE IF NOT EXISTS public.deep_analytics_snapshots (
+    id UUID PRIMARY KEY,
+    created_by UUID,
+    updated_by UUID,
+    created_on TIMESTAMP DEFAULT now(),
+    updated_on TIMESTAMP DEFAULT now(),
+    brief_platform UUID NOT NULL REFERENCES public.brief_platforms (id) ON DELETE CASCADE,
+    resolution TEXT NOT NULL,
+    captured_at TIMESTAMP NOT NULL,
+    samples INTEGER NOT NULL,
+    website_visits BIGINT,
+    facebook_engagement_rate NUMERIC,
+    facebook_followers BIGINT,
+    facebook_likes BIGINT,
+    facebook_comments BIGINT,
+    facebook_share BIGINT,
+    facebook_monthly_posts BIGINT,
+    facebook_ads_revenue NUMERIC,
+    instagram_followes BIGINT,
+    twitter_followes BIGINT,
+    tiktok_followes BIGINT,
+    youtube_followes BIGINT
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS ix_deep_analytics_snapshots_series ON public.deep_analytics_snapshots (brief_platform, resolution, captured_at);
+CREATE INDEX IF NOT EXISTS ix_deep_analytics_snapshots_retention ON public.deep_analytics_snapshots (resolution, captured_at);
+
+INSERT INTO public.deep_analytics_snapshots (id, brief_platform, resolution, captured_at, samples, website_visits, facebook_engagement_rate, facebook_followers, facebook_likes, facebook_comments, facebook_share, facebook_monthly_posts, facebook_ads_revenue, instagram_followes, twitter_followes, tiktok_followes, youtube_followes)
+SELECT gen_random_uuid(), d.brief_platform, r.resolution, date_trunc(r.resolution, d.updated_on), 1, d.website_visits, d.facebook_engagement_rate, d.facebook_followers, d.facebook_likes, d.facebook_comments, d.facebook_share, d.facebook_monthly_posts, d.facebook_ads_revenue, d.instagram_followes, d.twitter_followes, d.tiktok_followes, d.youtube_followes
+FROM public.deep_analytics AS d CROSS JOIN (VALUES ('hour'), ('day'), ('week')) AS r (resolution)
+WHERE d.brief_platform IS NOT NULL AND d.updated_on IS NOT NULL
+ON CONFLICT (brief_platform, resolution, captured_at) DO NOTHING;
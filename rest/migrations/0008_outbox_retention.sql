@@ -0,0 +1,9 @@
+-- Outbox records no longer hold the JWT of the caller, triggers run with the service credential of the API
+-- (ZEAUTH_SERVICE_TOKEN), and processed records are purged after OUTBOX_RETENTION_DAYS, see core/outbox.py.
+-- The tokens stored by earlier versions are removed and the purge gets an index of the processed records.
+-- migrate: no-transaction
+
+UPDATE public.outbox SET payload = jsonb_set(payload, '{signal_data}', (payload -> 'signal_data') - 'jwt')
+ WHERE payload -> 'signal_data' ? 'jwt';
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_outbox_processed ON public.outbox (processed_on) WHERE status <> 'pending';
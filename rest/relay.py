@@ -0,0 +1,79 @@
+import asyncio
+import os
+import time
+from dotenv import load_dotenv
+load_dotenv()
+
+from core.logger import log
+from core.metrics import metrics
+from core.tasks import TASK_RETRY_BACKOFF, TASK_MAX_BACKOFF
+from core.http import http_clients
+from core.tasks import task_queue
+from core import outbox
+from business import db_async_session, load_models
+from business.deep_analytics_snapshots_model import prune_forever, SNAPSHOT_PRUNE_INTERVAL
+
+# outbox relay: delivers the post-commit triggers written by the API workers, run with OUTBOX_DELIVERY=relay
+# on the API so it does not deliver them itself. Several relays can run side by side.
+RELAY_BATCH_SIZE = int(os.environ.get('RELAY_BATCH_SIZE', 100))
+RELAY_CONCURRENCY = int(os.environ.get('RELAY_CONCURRENCY', 10))
+RELAY_POLL_INTERVAL = float(os.environ.get('RELAY_POLL_INTERVAL', 1))  # seconds to wait when the outbox is drained
+RELAY_REPORT_INTERVAL = float(os.environ.get('RELAY_REPORT_INTERVAL', 60))
+
+
+async def relay_once(limiter: asyncio.Semaphore) -> int:
+    """
+    Deliver one batch of pending outbox records, return the number of records in the batch
+    """
+    async with db_async_session() as session:
+        records = await outbox.claim_batch(session, RELAY_BATCH_SIZE)
+
+    async def deliver(record) -> None:
+        retry_delay = min(TASK_MAX_BACKOFF, TASK_RETRY_BACKOFF * 2 ** (record.attempts - 1))
+        async with limiter, db_async_session() as session:
+            try:
+                await outbox.process(session, record, retry_delay=retry_delay)
+            except Exception as e:
+                log.debug(e)
+                log.warning(f"outbox record <{record.id}> failed on attempt {record.attempts}, check the debug above!")
+
+    await asyncio.gather(*(deliver(record) for record in records))
+    return len(records)
+
+
+async def main() -> None:
+    load_models()
+    await http_clients.start()
+    # background jobs of the triggers, e.g. invalidating shared cache entries
+    await task_queue.start()
+    # retention cleanup runs beside the relay, so a long prune does not delay trigger deliveries
+    pruner = asyncio.create_task(prune_forever()) if SNAPSHOT_PRUNE_INTERVAL else None
+    try:
+        await relay_forever()
+    finally:
+        if pruner is not None:
+            pruner.cancel()
+        await task_queue.stop()
+        await http_clients.close()
+
+
+async def relay_forever() -> None:
+    limiter = asyncio.Semaphore(RELAY_CONCURRENCY)
+    next_report = 0
+    while True:
+        try:
+            relayed = await relay_once(limiter)
+            if time.monotonic() >= next_report:
+                await outbox.measure()
+                log.info(f"outbox relay metrics: {metrics.snapshot()}")
+                next_report = time.monotonic() + RELAY_REPORT_INTERVAL
+        except Exception as e:
+            log.debug(e)
+            log.error("Can not relay the outbox, check the debug above!")
+            relayed = 0
+        if relayed < RELAY_BATCH_SIZE:
+            await asyncio.sleep(RELAY_POLL_INTERVAL)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
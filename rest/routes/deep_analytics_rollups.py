@@ -0,0 +1,45 @@
+import uuid
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.status import HTTP_200_OK
+
+from business.deep_analytics_rollups_model import Deep_Analytics_RollupModel
+from business.deep_analytics_rollups_schema import ReadDeep_Analytics_Rollup, PlatformTypeEnum
+from core.depends import get_async_db, Protect
+from core.logger import log
+from core.router import crud_roles
+
+router = APIRouter()
+# rollups are derived from deep analytics, whoever reads these reads their rollups
+roles = crud_roles('deep_analytics')
+
+
+@router.get('/', tags=['deep_analytics'], status_code=HTTP_200_OK, summary="List the rollups of a brief", response_model=List[ReadDeep_Analytics_Rollup])
+async def list_rollups(
+    brief: uuid.UUID,
+    platform_type: Optional[PlatformTypeEnum] = None,
+    metric: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    token: Protect = Depends(Protect)
+):
+    """
+    Aggregates of the numeric metrics of the deep analytics of a brief by platform type: number of
+    analyses with a value, total, minimum, maximum and average. They are kept up to date by every
+    deep analytics write, dashboards read them instead of the deep analytics.
+    """
+    await token.auth(roles["read"])
+    try:
+        obj = await Deep_Analytics_RollupModel.objects(db)
+        statement = select(Deep_Analytics_RollupModel).filter_by(brief=brief)
+        if platform_type is not None:
+            statement = statement.filter_by(platform_type=platform_type)
+        if metric is not None:
+            statement = statement.filter_by(metric=metric)
+        statement = statement.order_by(Deep_Analytics_RollupModel.platform_type, Deep_Analytics_RollupModel.metric)
+        return (await obj.db.execute(statement)).scalars().all()
+    except Exception as e:
+        log.debug(e)
+        raise HTTPException(500, "could not fetch the rollups of the brief")
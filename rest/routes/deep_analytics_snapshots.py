@@ -0,0 +1,70 @@
+import datetime
+import uuid
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.status import HTTP_200_OK
+
+from business.deep_analytics_snapshots_model import Deep_Analytics_SnapshotModel, BUCKET_SIZES, SNAPSHOT_MAX_POINTS, bucket_start, choose_resolution
+from business.deep_analytics_snapshots_schema import ReadDeep_Analytics_Snapshots, ResolutionEnum
+from core.depends import get_async_db, Protect
+from core.logger import log
+from core.router import crud_roles
+
+router = APIRouter()
+# snapshots are the history of deep analytics, whoever reads these reads their snapshots
+roles = crud_roles('deep_analytics')
+# range returned when no start is given
+DEFAULT_RANGE = datetime.timedelta(days=30)
+
+
+def naive_utc(moment: Optional[datetime.datetime]) -> Optional[datetime.datetime]:
+    # snapshots are captured at the database time, without time zone
+    if moment is None or moment.tzinfo is None:
+        return moment
+    return moment.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+
+
+@router.get('/', tags=['deep_analytics'], status_code=HTTP_200_OK, summary="Get the metrics history of a brief platform", response_model=ReadDeep_Analytics_Snapshots)
+async def list_snapshots(
+    brief_platform: uuid.UUID,
+    start: Optional[datetime.datetime] = None,
+    end: Optional[datetime.datetime] = None,
+    resolution: Optional[ResolutionEnum] = None,
+    db: AsyncSession = Depends(get_async_db),
+    token: Protect = Depends(Protect)
+):
+    """
+    Snapshots of the deep analytics metrics of a brief platform between `start` (default 30 days before `end`)
+    and `end` (default now). Each snapshot holds the metrics at the end of its hour, day or week; without
+    `resolution` the finest one still kept for `start` with at most SNAPSHOT_MAX_POINTS snapshots is read.
+    """
+    await token.auth(roles["read"])
+    try:
+        obj = await Deep_Analytics_SnapshotModel.objects(db)
+        now = (await obj.db.execute(select(func.localtimestamp()))).scalar()
+        end = naive_utc(end) or now
+        start = naive_utc(start) or end - DEFAULT_RANGE
+        if start >= end:
+            raise HTTPException(status_code=422, detail={"field_name": "start", "message": "<start> should be before <end>"})
+        resolution = resolution.value if resolution else choose_resolution(start, end, now)
+        if (end - start) / BUCKET_SIZES[resolution] > SNAPSHOT_MAX_POINTS:
+            raise HTTPException(status_code=422, detail={
+                "field_name": "resolution",
+                "message": f"the range holds more than {SNAPSHOT_MAX_POINTS} {resolution} snapshots, use a coarser resolution"
+            })
+        statement = select(Deep_Analytics_SnapshotModel).where(
+            Deep_Analytics_SnapshotModel.brief_platform == brief_platform,
+            Deep_Analytics_SnapshotModel.resolution == resolution,
+            Deep_Analytics_SnapshotModel.captured_at >= bucket_start(start, resolution),
+            Deep_Analytics_SnapshotModel.captured_at <= end
+        ).order_by(Deep_Analytics_SnapshotModel.captured_at)
+        data = (await obj.db.execute(statement)).scalars().all()
+        return {"brief_platform": brief_platform, "resolution": resolution, "start": start, "end": end, "data": data}
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        log.debug(e)
+        raise HTTPException(500, "could not fetch the snapshots of the brief platform")
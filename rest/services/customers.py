@@ -0,0 +1,53 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from business.briefs_model import BriefModel
+from business.briefs_schema import CreateBrief
+from business.customers_model import CustomerModel
+from business.strategies_model import StrategyModel
+from business.strategies_schema import CreateStrategy
+
+
+async def create_workspaces(db: AsyncSession, customer_ids: list) -> None:
+    """
+    Add the default strategy and brief of the given customers to the current transaction
+    """
+    if not customer_ids:
+        return
+    strategies = await StrategyModel.objects(db)
+    await strategies.create_multiple([CreateStrategy(customer=customer_id).dict() for customer_id in customer_ids], commit=False)
+    briefs = await BriefModel.objects(db)
+    await briefs.create_multiple([CreateBrief(customer=customer_id).dict() for customer_id in customer_ids], commit=False)
+
+
+async def create_customer(db: AsyncSession, schema, **kwargs) -> CustomerModel:
+    """
+    Create a customer with its strategy and its brief in one transaction,
+    `kwargs` are passed to `Manager.create` and the customer is loaded for the `schema` response
+    """
+    customers = await CustomerModel.objects(db)
+    customer = await customers.load(schema).create(commit=False, **kwargs)
+    await create_workspaces(db, [customer.id])
+    await customers.commit(customer)
+    return customer
+
+
+async def create_customers(db: AsyncSession, schema, items: list, signal_data: dict) -> list:
+    """
+    Create several customers, each with its strategy and its brief, in one transaction
+    """
+    customers = await CustomerModel.objects(db)
+    created = await customers.load(schema).create_multiple(items, signal_data=signal_data, commit=False)
+    await create_workspaces(db, [customer.id for customer in created])
+    await customers.commit(*created)
+    return created
+
+
+async def upsert_customers(db: AsyncSession, schema, items: list, signal_data: dict) -> list:
+    """
+    Insert or update several customers in one transaction, inserted customers get their strategy and their brief
+    """
+    customers = await CustomerModel.objects(db)
+    upserted = await customers.load(schema).upsert_multiple(items, signal_data=signal_data, commit=False)
+    await create_workspaces(db, list(customers.inserted_ids))
+    await customers.commit(*upserted)
+    return upserted
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# the modules read their settings at import time
+os.environ.setdefault('ZEAUTH_URI', 'http://zeauth.test')
+os.environ.setdefault('ZEAUTH_SERVICE_TOKEN', 'service-token')
+os.environ.setdefault('LOG_LEVEL', 'ERROR')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,80 @@
+import asyncio
+import os
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from core.query import JSONQ  # noqa: F401, imports the models in their dependency order
+from business import Base, load_models
+
+# a PostgreSQL database the tests may drop and create the tables of, e.g. postgresql://postgres@localhost/test
+TEST_DATABASE_URL = os.environ.get('TEST_DATABASE_URL')
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL is not set")
+# the deep analytics tables and the business tables they refer to
+TABLES = ('customers', 'briefs', 'brief_platforms', 'deep_analytics', 'deep_analytics_rollups', 'deep_analytics_snapshots')
+
+
+@pytest.fixture
+def database():
+    load_models()
+    schema = os.environ.get('DEFAULT_SCHEMA', 'public')
+    tables = [Base.metadata.tables[f'{schema}.{name}'] for name in TABLES]
+    engine = create_engine(TEST_DATABASE_URL)
+    Base.metadata.drop_all(engine, tables=tables)
+    with engine.begin() as conn:
+        # users and files belong to ZeAuth and the files service, only their keys are referred to
+        for table in ('users', 'files'):
+            conn.exec_driver_sql(f"CREATE TABLE IF NOT EXISTS {schema}.{table} (id UUID PRIMARY KEY)")
+    Base.metadata.create_all(engine, tables=tables)
+    engine.dispose()
+    return TEST_DATABASE_URL.replace('postgresql://', 'postgresql+asyncpg://', 1)
+
+
+def test_concurrent_writers_of_a_brief_refresh_its_rollups_in_turn(database):
+    from business.briefs_model import BriefModel
+    from business.brief_platforms_model import Brief_PlatformModel
+    from business.deep_analytics_model import Deep_AnalysisModel, refresh_rollups
+    from business.deep_analytics_rollups_model import Deep_Analytics_RollupModel
+
+    brief, brief_platform = uuid.uuid4(), uuid.uuid4()
+
+    async def run():
+        engine = create_async_engine(database)
+        async with AsyncSession(engine) as session:
+            session.add(BriefModel(id=brief))
+            await session.flush()
+            session.add(Brief_PlatformModel(id=brief_platform, brief=brief))
+            await session.commit()
+
+        first_refreshed, release_first = asyncio.Event(), asyncio.Event()
+
+        async def write(visits: int, hold: bool) -> None:
+            async with AsyncSession(engine) as session:
+                session.add(Deep_AnalysisModel(id=uuid.uuid4(), brief_platform=brief_platform, platform_type='website', website_visits=visits))
+                await session.flush()
+                await refresh_rollups(session, {brief})
+                if hold:
+                    first_refreshed.set()
+                    await release_first.wait()
+                await session.commit()
+
+        first = asyncio.create_task(write(10, hold=True))
+        await first_refreshed.wait()
+        second = asyncio.create_task(write(20, hold=False))
+        await asyncio.sleep(0.5)
+        # the second writer waits for the lock of the brief held by the first one
+        assert not second.done()
+        release_first.set()
+        await asyncio.gather(first, second)
+
+        async with AsyncSession(engine) as session:
+            rollup = (await session.execute(
+                select(Deep_Analytics_RollupModel).filter_by(brief=brief, metric='website_visits')
+            )).scalar_one()
+        await engine.dispose()
+        return rollup
+
+    rollup = asyncio.run(run())
+    assert (rollup.samples, rollup.total) == (2, 30)
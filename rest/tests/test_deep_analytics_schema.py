@@ -0,0 +1,29 @@
+import uuid
+
+import pytest
+from pydantic import ValidationError
+
+import core.query
+from business.deep_analytics_schema import CreateDeep_Analysis, UpdateDeep_Analysis
+
+
+def analysis(**metrics):
+    return CreateDeep_Analysis(platform_type='facebook', brief_platform=uuid.uuid4(), **metrics)
+
+
+def test_metrics_are_parsed_as_people_write_them():
+    parsed = analysis(website_visits='1,200', facebook_followers='1.2k', facebook_likes=3.0,
+                      facebook_engagement_rate='4.5%', facebook_ads_revenue='1,200.5')
+    assert parsed.website_visits == 1200
+    assert parsed.facebook_followers == 1200
+    assert parsed.facebook_likes == 3
+    assert parsed.facebook_engagement_rate == 4.5
+    assert parsed.facebook_ads_revenue == 1200.5
+
+
+@pytest.mark.parametrize('value', ['1.5', '1,200.5', '1.2345k', 1.5])
+def test_fractions_of_integer_metrics_are_rejected(value):
+    with pytest.raises(ValidationError):
+        analysis(website_visits=value)
+    with pytest.raises(ValidationError):
+        UpdateDeep_Analysis(facebook_followers=value)
@@ -0,0 +1,46 @@
+import asyncio
+
+import httpx
+import pytest
+
+from core.http import CircuitOpenError, ServiceClient
+
+
+def service(handler) -> ServiceClient:
+    client = ServiceClient('test', failure_threshold=1, reset_timeout=0)
+    client._client_args = lambda: {"transport": httpx.MockTransport(handler)}
+    return client
+
+
+async def slow(request):
+    await asyncio.sleep(10)
+
+
+def test_failure_opens_the_circuit():
+    client = service(lambda request: httpx.Response(503))
+    client.breaker.reset_timeout = 60
+
+    async def run():
+        await client.get('http://upstream/')
+        with pytest.raises(CircuitOpenError):
+            await client.get('http://upstream/')
+
+    asyncio.run(run())
+    assert client.breaker.state == 'open'
+
+
+def test_cancelled_trial_releases_the_circuit():
+    client = service(slow)
+    client.breaker.record_failure()
+    assert client.breaker.state == 'half-open'
+
+    async def run():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(client.get('http://upstream/'), 0.01)
+        # the trial failed, the next one is let through once the reset timeout passed
+        client._client_args = lambda: {"transport": httpx.MockTransport(lambda request: httpx.Response(200))}
+        await client.close()
+        return await client.get('http://upstream/')
+
+    assert asyncio.run(run()).status_code == 200
+    assert client.breaker.state == 'closed'
@@ -0,0 +1,93 @@
+import asyncio
+import datetime
+import json
+
+import httpx
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+
+from core import depends
+from core.http import zeauth_client
+from core.jwks import JWKSCache
+
+
+def keypair(kid: str):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    return private_key, {**jwk, "kid": kid, "use": "sig", "alg": "RS256"}
+
+
+def sign(private_key, kid: str, expires_in: float = 300, **claims) -> str:
+    exp = datetime.datetime.now(tz=datetime.timezone.utc) + datetime.timedelta(seconds=expires_in)
+    payload = {"sub": "9f6cf2b6-1c0e-4a8e-b6a4-4c2a2e1d4b11", "roles": ["customers-read"], "exp": exp, **claims}
+    return jwt.encode(payload, private_key, algorithm='RS256', headers={"kid": kid})
+
+
+class ZeAuth:
+    """
+    Stub of ZeAuth serving a JWK set and rejecting every token sent to /verify
+    """
+    def __init__(self, *jwks: dict) -> None:
+        self.keys = list(jwks)
+        self.calls = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls.append(request.url.path)
+        if request.url.path.endswith('/.well-known/jwks.json'):
+            return httpx.Response(200, json={"keys": self.keys})
+        return httpx.Response(401, json={"detail": "invalid token"})
+
+
+@pytest.fixture
+def zeauth(monkeypatch):
+    private_key, jwk = keypair('key-1')
+    stub = ZeAuth(jwk)
+    stub.private_key = private_key
+    monkeypatch.setattr(zeauth_client, '_client', None)
+    monkeypatch.setattr(zeauth_client, '_client_args', lambda: {"transport": httpx.MockTransport(stub)})
+    monkeypatch.setattr(depends, 'jwks_cache', JWKSCache(fetch=depends.fetch_jwks, min_refresh_interval=0))
+    return stub
+
+
+def verify(token: str) -> dict:
+    return asyncio.run(depends.verify_token_locally(token))
+
+
+def test_valid_token(zeauth):
+    user = verify(sign(zeauth.private_key, 'key-1'))
+    assert user["id"] == "9f6cf2b6-1c0e-4a8e-b6a4-4c2a2e1d4b11"
+    assert user["roles"] == ["customers-read"]
+    assert zeauth.calls == ['/.well-known/jwks.json']
+
+
+def test_expired_token(zeauth):
+    with pytest.raises(HTTPException) as error:
+        verify(sign(zeauth.private_key, 'key-1', expires_in=-60))
+    assert error.value.status_code == 403
+
+
+def test_token_signed_with_another_key(zeauth):
+    other_key, _ = keypair('key-1')
+    with pytest.raises(HTTPException) as error:
+        verify(sign(other_key, 'key-1'))
+    assert error.value.status_code == 403
+
+
+def test_unknown_kid_is_verified_remotely(zeauth):
+    other_key, _ = keypair('key-2')
+    with pytest.raises(HTTPException) as error:
+        verify(sign(other_key, 'key-2'))
+    assert error.value.status_code == 403
+    # the key set is fetched again for the unknown kid before falling back to ZeAuth
+    assert zeauth.calls[-2:] == ['/.well-known/jwks.json', '/verify']
+
+
+def test_key_rotation_refreshes_the_keys(zeauth):
+    assert verify(sign(zeauth.private_key, 'key-1'))
+    rotated_key, rotated_jwk = keypair('key-2')
+    zeauth.keys = [rotated_jwk]
+    user = verify(sign(rotated_key, 'key-2'))
+    assert user["id"] == "9f6cf2b6-1c0e-4a8e-b6a4-4c2a2e1d4b11"
+    assert zeauth.calls == ['/.well-known/jwks.json', '/.well-known/jwks.json']
@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine
+from sqlalchemy.orm import Session
+
+from core.query import JSONQ, QuerySchema, COUNT_NONE, query_plan_cache
+from business import Base
+
+
+class QueryRecord(Base):
+    __tablename__ = 'query_test_records'
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine, tables=[QueryRecord.__table__])
+    query_plan_cache.clear()
+    with Session(engine) as session:
+        session.add_all([QueryRecord(id=i, name=f"n{i % 3}") for i in range(10)])
+        session.commit()
+        yield session
+
+
+def query(session, **body):
+    result = JSONQ(session, QueryRecord).query(QuerySchema(**body), None)
+    return [record.id for record in result['data']], result['count']
+
+
+def test_page_with_count(session):
+    assert query(session, limit=3, skip=0, filter={"name": "n1"}) == ([1, 4, 7], 3)
+    # same shape, served by the cached plan with other values
+    assert query(session, limit=2, skip=1, filter={"name": "n2"}) == ([5, 8], 3)
+
+
+def test_page_past_the_last_row(session):
+    assert query(session, limit=3, skip=50) == ([], 10)
+    assert query(session, limit=3, skip=50, filter={"name": "n1"}) == ([], 3)
+    # the count plan is cached now, a later page of the shape still gets its rows
+    assert query(session, limit=3, skip=3, filter={"name": "n0"}) == ([9], 4)
+
+
+def test_page_without_count(session):
+    assert query(session, limit=3, skip=50, count=COUNT_NONE) == ([], None)